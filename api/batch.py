@@ -0,0 +1,75 @@
+"""
+Bulk single calculations for whole rosters.
+
+``run_batch`` takes ``(type, params)`` pairs — the bodies one would POST to
+``/api/compute/fulltime``, ``/parttime`` or ``/student`` — and returns the
+same response dicts in input order. Each item is validated and computed on
+its own, so a bad row (unknown kommune, missing field) yields an
+``{"error": ...}`` entry instead of failing the batch.
+
+Batches are split into chunks of ``BATCH_CHUNK_SIZE`` items and spread
+over the shared compute pool (``api.executor``). Workers receive plain
+dicts and import the routers themselves, so chunks pickle cheaply.
+"""
+
+from __future__ import annotations
+
+import os
+from typing import Any
+
+from pydantic import ValidationError
+
+from .executor import map_cpu_bound
+from .models import FullTimeRequest, PartTimeRequest, StudentRequest
+
+BATCH_MAX_ITEMS = int(os.getenv("BATCH_MAX_ITEMS", "50000"))
+BATCH_CHUNK_SIZE = int(os.getenv("BATCH_CHUNK_SIZE", "1000"))
+
+ITEM_MODELS = {
+    "fulltime": FullTimeRequest,
+    "parttime": PartTimeRequest,
+    "student": StudentRequest,
+}
+
+
+def format_validation_error(exc: ValidationError) -> str:
+    """One-line ``field: message; ...`` summary of a pydantic error."""
+    return "; ".join(
+        f"{'.'.join(str(part) for part in err['loc']) or 'params'}: {err['msg']}"
+        for err in exc.errors()
+    )
+
+
+def compute_chunk(items: list[tuple[str, dict[str, Any]]]) -> list[dict]:
+    """Compute one chunk in the current process (also the worker entry point)."""
+    from .routers.compute import compute_fulltime, compute_parttime, compute_student
+
+    handlers = {
+        "fulltime": compute_fulltime,
+        "parttime": compute_parttime,
+        "student": compute_student,
+    }
+    results = []
+    for kind, params in items:
+        if kind not in ITEM_MODELS:
+            results.append({"error": f"Unknown type: {kind} (expected one of {', '.join(ITEM_MODELS)})"})
+            continue
+        try:
+            req = ITEM_MODELS[kind].model_validate(params)
+        except ValidationError as exc:
+            results.append({"error": format_validation_error(exc)})
+            continue
+        results.append(handlers[kind](req))
+    return results
+
+
+async def run_batch(
+    items: list[tuple[str, dict[str, Any]]],
+    chunk_size: int = BATCH_CHUNK_SIZE,
+) -> list[dict]:
+    """Results for *items* in input order, chunks computed on the pool."""
+    chunks = [items[i:i + chunk_size] for i in range(0, len(items), chunk_size)]
+    results: list[dict] = []
+    for chunk_results in await map_cpu_bound(compute_chunk, chunks):
+        results.extend(chunk_results)
+    return results
@@ -0,0 +1,120 @@
+"""
+Opt-in memoization of the scalar engine calls.
+
+Most traffic repeats a handful of inputs (default pension 4/8, ATP 94.65,
+København, round salaries), and the comparison and projection endpoints
+re-evaluate unchanged scenarios. ``cached_compute_tax`` and
+``cached_compute_student_income`` wrap the engine in a bounded LRU keyed on
+the *canonical* engine inputs — i.e. after the routers' percent → fraction
+and monthly → annual conversions, with defaults filled in and floats
+rounded — so equivalent requests share one entry.
+
+Disabled by default. Set ``ENGINE_CACHE_SIZE`` (entries per function) to
+enable it, or call ``configure_engine_cache()``. Cached results are shared
+objects: treat them as read-only (routers copy them via ``as_dict()``).
+Every process (including each compute worker) holds its own caches and
+counters.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from collections import OrderedDict
+from inspect import Parameter, signature
+
+from .tax_engine import compute_tax, compute_student_income
+
+# Floats are rounded to this many decimals for the key (and the engine is
+# evaluated on the rounded values, so one key always yields one result).
+_FLOAT_DIGITS = 9
+
+
+def _canonical(value):
+    if isinstance(value, float) or (isinstance(value, int) and not isinstance(value, bool)):
+        return round(float(value), _FLOAT_DIGITS) + 0.0    # + 0.0 folds -0.0
+    return value
+
+
+class EngineCache:
+    """Bounded, thread-safe LRU around one engine function.
+
+    Call it with keyword arguments exactly like the wrapped function.
+    With ``maxsize == 0`` calls pass straight through and are not counted.
+    """
+
+    def __init__(self, fn, maxsize: int = 0):
+        params = signature(fn).parameters
+        self._fn = fn
+        self._names = tuple(name for name in params if not name.startswith("_"))
+        self._defaults = {
+            name: p.default for name, p in params.items()
+            if p.default is not Parameter.empty and not name.startswith("_")
+        }
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+
+    def __call__(self, **kwargs):
+        if self.maxsize <= 0:
+            return self._fn(**kwargs)
+        merged = {**self._defaults, **kwargs}
+        try:
+            key = tuple(_canonical(merged[name]) for name in self._names)
+        except KeyError:
+            return self._fn(**kwargs)     # let the engine raise the TypeError
+
+        with self._lock:
+            result = self._entries.get(key)
+            if result is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return result
+            self.misses += 1
+
+        result = self._fn(**dict(zip(self._names, key)))
+        with self._lock:
+            self._entries[key] = result
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return result
+
+    def resize(self, maxsize: int) -> None:
+        """Change the bound (0 disables) and drop all entries and counters."""
+        with self._lock:
+            self.maxsize = maxsize
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.maxsize > 0,
+                "maxsize": self.maxsize,
+                "size": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+_DEFAULT_SIZE = int(os.getenv("ENGINE_CACHE_SIZE", "0"))
+
+cached_compute_tax = EngineCache(compute_tax, _DEFAULT_SIZE)
+cached_compute_student_income = EngineCache(compute_student_income, _DEFAULT_SIZE)
+
+
+def configure_engine_cache(maxsize: int) -> None:
+    """Resize (and clear) both engine caches; 0 disables memoization."""
+    cached_compute_tax.resize(maxsize)
+    cached_compute_student_income.resize(maxsize)
+
+
+def engine_cache_stats() -> dict:
+    return {
+        "compute_tax": cached_compute_tax.stats(),
+        "compute_student_income": cached_compute_student_income.stats(),
+    }
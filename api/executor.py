@@ -0,0 +1,106 @@
+"""
+Process-pool execution for the CPU-heavy endpoints.
+
+Sync route handlers run on Starlette's thread pool, where a long curve or
+grid holds the GIL and stalls cheap requests such as ``/api/meta``. The
+heavy routes (curves, grid, projection, batch, payroll) instead hand their
+pure compute function to a shared ``ProcessPoolExecutor`` and await it, so
+one uvicorn process uses every core and its event loop stays responsive.
+Single calculations stay inline — they are cheaper than the round trip.
+
+Configured by environment:
+
+``COMPUTE_WORKERS``        worker processes (default: CPU count); ``0``
+                           runs everything on the thread pool as before.
+``COMPUTE_START_METHOD``   multiprocessing start method (default
+                           ``spawn``; forking a threaded server is unsafe).
+
+Functions sent to the pool must be module-level and their arguments and
+results picklable (pydantic models, lists and dicts are).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import atexit
+import multiprocessing
+import os
+import threading
+from collections.abc import Callable, Iterable
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any
+
+from starlette.concurrency import run_in_threadpool
+
+COMPUTE_WORKERS = int(os.getenv("COMPUTE_WORKERS", str(os.cpu_count() or 1)))
+COMPUTE_START_METHOD = os.getenv("COMPUTE_START_METHOD", "spawn")
+
+_workers = COMPUTE_WORKERS
+_pool: ProcessPoolExecutor | None = None
+_pool_lock = threading.Lock()
+
+
+def _warm_worker() -> None:
+    # Import the routers once per worker instead of on its first task
+    from .routers import compute  # noqa: F401
+
+
+def configure_compute_pool(workers: int) -> None:
+    """Resize the pool (0 disables it); the old pool is shut down."""
+    global _workers
+    with _pool_lock:
+        _workers = workers
+        _shutdown_locked()
+
+
+def _shutdown_locked() -> None:
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+def compute_workers() -> int:
+    return _workers
+
+
+def get_pool() -> ProcessPoolExecutor | None:
+    """The shared pool, started on first use; ``None`` when disabled."""
+    global _pool
+    with _pool_lock:
+        if _workers <= 0:
+            return None
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=_workers,
+                mp_context=multiprocessing.get_context(COMPUTE_START_METHOD),
+                initializer=_warm_worker,
+            )
+        return _pool
+
+
+@atexit.register
+def _shutdown_pool() -> None:
+    with _pool_lock:
+        _shutdown_locked()
+
+
+async def run_cpu_bound(fn: Callable[..., Any], *args: Any) -> Any:
+    """Await ``fn(*args)`` on the process pool (or the thread pool if disabled)."""
+    pool = get_pool()
+    if pool is None:
+        return await run_in_threadpool(fn, *args)
+    return await asyncio.get_running_loop().run_in_executor(pool, fn, *args)
+
+
+async def map_cpu_bound(fn: Callable[[Any], Any], items: Iterable[Any]) -> list:
+    """``[fn(item) for item in items]`` with the items spread over the pool."""
+    return list(await asyncio.gather(*(run_cpu_bound(fn, item) for item in items)))
+
+
+def pool_stats() -> dict:
+    return {
+        "workers": _workers,
+        "start_method": COMPUTE_START_METHOD,
+        "started": _pool is not None,
+    }
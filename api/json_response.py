@@ -0,0 +1,24 @@
+"""
+Fast JSON encoding for the compute routes.
+
+Payloads are encoded with ``orjson``, which is several times faster than the
+stdlib on large float arrays and serialises numpy values directly. Routes
+that build big payloads return ``FastJSONResponse`` directly, which also
+skips FastAPI's ``jsonable_encoder`` pass over the result.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+
+
+def dumps(content: Any) -> bytes:
+    return orjson.dumps(content, option=orjson.OPT_SERIALIZE_NUMPY)
+
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -7,6 +7,7 @@ All business logic lives in `tax_engine`; constants in `data`.
 """
 
 import os
+from contextlib import asynccontextmanager
 from pathlib import Path
 
 from fastapi import FastAPI, Request
@@ -29,10 +30,19 @@ _ALLOWED_ORIGINS = [
     if o.strip()
 ]
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Default charts are served from memory from the first request on
+    if os.getenv("PRECOMPUTE_DEFAULT_CURVES", "1") != "0":
+        compute.precompute_default_curves()
+    yield
+
+
 app = FastAPI(
     title="lønklar.dk API",
     version="1.0.0",
     redirect_slashes=False,
+    lifespan=lifespan,
 )
 
 # Rate-limiter state
@@ -2,9 +2,9 @@
 Pydantic request / response models for the DK Income Calculator API.
 """
 
-from typing import Literal
+from typing import Any, Literal
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field, field_validator, model_validator
 
 
 PensionType = Literal["standard", "section53a"]
@@ -18,6 +18,7 @@ EmploymentType = Literal["fulltime", "parttime"]
 class FullTimeRequest(BaseModel):
     gross_annual: float = Field(..., description="Gross annual salary in DKK")
     kommune: str = Field("København", description="Municipality name")
+    tax_year: int | None = Field(None, description="Tax year of the ruleset (null = current)")
     pension_pct: float = Field(4.0, description="Employee pension % (0-15)")
     employer_pension_pct: float = Field(8.0, description="Employer pension % (0-20)")
     pension_type: PensionType = Field("standard", description="standard | section53a")
@@ -35,6 +36,7 @@ class PartTimeRequest(BaseModel):
     hourly_rate: float = Field(..., description="Hourly rate in DKK")
     hours_month: float = Field(..., description="Hours worked per month")
     kommune: str = Field("København", description="Municipality name")
+    tax_year: int | None = Field(None, description="Tax year of the ruleset (null = current)")
     pension_pct: float = Field(0.0, description="Employee pension % (0-15)")
     employer_pension_pct: float = Field(0.0, description="Employer pension % (0-20)")
     pension_type: PensionType = Field("standard", description="standard | section53a")
@@ -54,6 +56,7 @@ class EmployeeScenarioRequest(BaseModel):
     hourly_rate: float | None = Field(None, description="Hourly rate in DKK for parttime")
     hours_month: float | None = Field(None, description="Monthly hours for parttime")
     kommune: str = Field("København", description="Municipality name")
+    tax_year: int | None = Field(None, description="Tax year of the ruleset (null = current)")
     pension_pct: float = Field(4.0, description="Employee pension %")
     employer_pension_pct: float = Field(8.0, description="Employer pension %")
     pension_type: PensionType = Field("standard", description="standard | section53a")
@@ -67,10 +70,30 @@ class EmployeeScenarioRequest(BaseModel):
     union_fees_annual: float = Field(0.0, description="Annual trade union + a-kasse fees")
 
 
+class KommuneSweepRequest(BaseModel):
+    gross_annual: float = Field(..., description="Gross annual salary in DKK")
+    is_hourly: bool = Field(False, description="Hourly (12.5% feriepenge) instead of salaried")
+    is_church: bool = Field(True, description="Rank by the with-church (true) or without-church result")
+    tax_year: int | None = Field(None, description="Tax year of the ruleset (null = current)")
+    pension_pct: float = Field(4.0, description="Employee pension %")
+    employer_pension_pct: float = Field(8.0, description="Employer pension %")
+    pension_type: PensionType = Field("standard", description="standard | section53a")
+    other_pay_monthly: float = Field(0.0, description="Extra monthly pay")
+    taxable_benefits_monthly: float = Field(0.0, description="Monthly taxable benefits")
+    pretax_deductions_monthly: float = Field(0.0, description="Monthly pre-tax deductions")
+    aftertax_deductions_monthly: float = Field(0.0, description="Monthly after-tax deductions")
+    atp_monthly: float = Field(94.65, description="Monthly ATP contribution")
+    transport_km: float = Field(0.0, description="Round-trip daily commute in km")
+    union_fees_annual: float = Field(0.0, description="Annual trade union + a-kasse fees")
+
+
 class ProjectionSettings(BaseModel):
     years: int = Field(5, ge=1, le=50)
     annual_return_pct: float = Field(4.0, ge=-100, le=100)
     salary_growth_pct: float = Field(2.0, ge=-100, le=100)
+    threshold_indexation_pct: float = Field(
+        0.0, ge=-100, le=100,
+        description="Yearly indexation of tax thresholds and caps (0 = keep this year's)")
 
 
 class ProjectionRequest(BaseModel):
@@ -78,6 +101,21 @@ class ProjectionRequest(BaseModel):
     settings: ProjectionSettings = Field(default_factory=ProjectionSettings)
 
 
+class MonteCarloSettings(BaseModel):
+    paths: int = Field(10_000, ge=1, le=20_000, description="Number of simulated paths")
+    return_volatility_pct: float = Field(
+        10.0, ge=0, le=100, description="Std. dev. of the yearly pension return (percentage points)")
+    salary_growth_volatility_pct: float = Field(
+        1.5, ge=0, le=100, description="Std. dev. of yearly salary growth (percentage points)")
+    seed: int = Field(0, ge=0, description="RNG seed; the same seed gives the same bands")
+
+
+class MonteCarloProjectionRequest(BaseModel):
+    scenario: EmployeeScenarioRequest
+    settings: ProjectionSettings = Field(default_factory=ProjectionSettings)
+    monte_carlo: MonteCarloSettings = Field(default_factory=MonteCarloSettings)
+
+
 class ComparisonRequest(BaseModel):
     scenario_a: EmployeeScenarioRequest
     scenario_b: EmployeeScenarioRequest
@@ -86,10 +124,55 @@ class ComparisonRequest(BaseModel):
     projection_b: ProjectionSettings | None = None
 
 
+class MultiComparisonRequest(BaseModel):
+    scenarios: list[EmployeeScenarioRequest] = Field(..., min_length=1, max_length=50)
+    baseline: int = Field(0, ge=0, description="Index of the scenario deltas are taken against")
+    projection: ProjectionSettings | None = None
+    projections: list[ProjectionSettings | None] | None = Field(
+        None, description="Per-scenario projection settings (null entries use projection)")
+
+
+class OptimizerSettings(BaseModel):
+    objective: Literal["net_plus_pension", "total_pension"] = Field(
+        "net_plus_pension",
+        description="net_plus_pension (net pay + all pension + exchanged benefits) | total_pension")
+    min_net_monthly: float = Field(0.0, ge=0, description="Lowest acceptable monthly net income")
+    min_pension_pct: float = Field(0.0, ge=0, le=100, description="Lowest employee pension % to consider")
+    max_pension_pct: float = Field(20.0, ge=0, le=100, description="Highest employee pension % to consider")
+    pension_types: list[PensionType] = Field(
+        ["standard", "section53a"], min_length=1, description="Pension types to consider")
+    max_benefit_monthly: float = Field(
+        0.0, ge=0, description="Most salary per month that may be exchanged for pre-tax benefits")
+
+
+class OptimizeRequest(BaseModel):
+    scenario: EmployeeScenarioRequest
+    settings: OptimizerSettings = Field(default_factory=OptimizerSettings)
+
+
+class PayslipRequest(BaseModel):
+    scenario: EmployeeScenarioRequest
+    ferie_payout: Literal["may", "may_august", "monthly"] = Field(
+        "may", description="When ferietillæg/feriepenge are paid: may | may_august | monthly")
+
+
+class BatchItem(BaseModel):
+    type: str = Field(..., description="fulltime | parttime | student (unknown types error per item)")
+    params: dict[str, Any] = Field(
+        default_factory=dict,
+        description="Fields of the matching single request; validated per item so one bad row "
+                    "does not fail the batch")
+
+
+class BatchRequest(BaseModel):
+    items: list[BatchItem] = Field(..., description="Calculations; results keep this order")
+
+
 class StudentRequest(BaseModel):
     su_monthly: float = Field(7426.0, description="Monthly SU before tax")
     work_gross_monthly: float = Field(..., description="Monthly gross work income")
     kommune: str = Field("København", description="Municipality name")
+    tax_year: int | None = Field(None, description="Tax year of the ruleset (null = current)")
     pension_pct: float = Field(0.0, description="Employee pension %")
     employer_pension_pct: float = Field(0.0, description="Employer pension %")
     pension_type: PensionType = Field("standard", description="standard | section53a")
@@ -103,12 +186,48 @@ class StudentRequest(BaseModel):
     union_fees_annual: float = Field(0.0, description="Annual trade union + a-kasse fees")
 
 
+class InverseRequest(BaseModel):
+    target_net_monthly: float = Field(..., description="Desired monthly net income in DKK")
+    service_type: Literal["fulltime", "parttime", "student"] = Field("fulltime")
+    solve_for: Literal["gross", "hours_month", "hourly_rate"] = Field(
+        "gross", description="gross | hours_month (needs hourly_rate) | hourly_rate (needs hours_month)")
+    hourly_rate: float | None = Field(None, description="Given hourly rate when solving for hours")
+    hours_month: float | None = Field(None, description="Given monthly hours when solving for rate")
+    su_monthly: float = Field(7426.0, description="Monthly SU before tax (student)")
+    aars_fribeloeb: float | None = Field(None, description="Annual fribeløb (student, null = default)")
+    kommune: str = Field("København", description="Municipality name")
+    tax_year: int | None = Field(None, description="Tax year of the ruleset (null = current)")
+    pension_pct: float | None = Field(None, description="Employee pension % (null = service type default)")
+    employer_pension_pct: float | None = Field(
+        None, description="Employer pension % (null = service type default)")
+    pension_type: PensionType = Field("standard", description="standard | section53a")
+    is_church: bool = Field(True, description="Member of Folkekirken?")
+    other_pay_monthly: float = Field(0.0, description="Extra monthly pay")
+    taxable_benefits_monthly: float = Field(0.0, description="Monthly taxable benefits")
+    pretax_deductions_monthly: float = Field(0.0, description="Monthly pre-tax deductions")
+    aftertax_deductions_monthly: float = Field(0.0, description="Monthly after-tax deductions")
+    atp_monthly: float | None = Field(None, description="Monthly ATP contribution (null = service type default)")
+    transport_km: float = Field(0.0, description="Round-trip daily commute in km")
+    union_fees_annual: float = Field(0.0, description="Annual trade union + a-kasse fees")
+
+    @model_validator(mode="after")
+    def _service_type_defaults(self):
+        # Same defaults as /fulltime, /parttime and /student use
+        model = {"fulltime": FullTimeRequest, "parttime": PartTimeRequest,
+                 "student": StudentRequest}[self.service_type]
+        for name in ("pension_pct", "employer_pension_pct", "atp_monthly"):
+            if getattr(self, name) is None:
+                setattr(self, name, model.model_fields[name].default)
+        return self
+
+
 # ═══════════════════════════════════════════════════════════════════════
 #  CURVE — request models
 # ═══════════════════════════════════════════════════════════════════════
 
 class CurveRequest(BaseModel):
     kommune: str = Field("København")
+    tax_year: int | None = Field(None)
     pension_pct: float = Field(4.0)
     employer_pension_pct: float = Field(8.0)
     pension_type: PensionType = Field("standard")
@@ -124,12 +243,18 @@ class CurveRequest(BaseModel):
     max_gross: float = Field(1_200_000)
     min_gross: float = Field(0)
     step_monthly: float = Field(0)       # 0 = use legacy `points` logic
-    points: int = Field(50)
+    points: int = Field(50, ge=1)
+    mode: Literal["sample", "breakpoints"] = Field(
+        "sample", description="sample = evenly spaced grid; breakpoints = exact kinks + segment slopes")
+    format: Literal["json", "ndjson", "columnar"] = Field(
+        "json", description="json = one array of rows; ndjson = streamed, one row per line; "
+                            "columnar = one array per field")
 
 
 class HoursCurveRequest(BaseModel):
     hourly_rate: float
     kommune: str = Field("København")
+    tax_year: int | None = Field(None)
     pension_pct: float = Field(0.0)
     employer_pension_pct: float = Field(0.0)
     pension_type: PensionType = Field("standard")
@@ -141,20 +266,55 @@ class HoursCurveRequest(BaseModel):
     aftertax_deductions_monthly: float = Field(0.0)
     transport_km: float = Field(0.0)
     union_fees_annual: float = Field(0.0)
+    min_hours: int = Field(0, ge=0)
     max_hours: int = Field(220)
+    step: int = Field(5, ge=1)
+    points: int = Field(0, ge=0, le=2_000_000,
+                        description="> 0: evenly spaced points from min to max hours (overrides step)")
+    refine: bool = Field(False, description="Add the exact hours where the net-vs-hours slope changes")
+    format: Literal["json", "ndjson", "columnar"] = Field(
+        "json", description="json = one array of rows; ndjson = streamed, one row per line; "
+                            "columnar = one array per field")
 
 
 class StudentHoursCurveRequest(BaseModel):
     hourly_rate: float = Field(..., description="Student hourly wage in DKK")
     su_monthly: float = Field(7426.0, description="Monthly SU before tax")
     kommune: str = Field("København")
+    tax_year: int | None = Field(None)
     pension_pct: float = Field(0.0)
     employer_pension_pct: float = Field(0.0)
     pension_type: PensionType = Field("standard")
     is_church: bool = Field(True)
     aars_fribeloeb: float | None = Field(None)
     max_hours: int = Field(220)
-    step: int = Field(5)
+    step: int = Field(5, ge=1)
+    format: Literal["json", "ndjson", "columnar"] = Field(
+        "json", description="json = one array of rows; ndjson = streamed, one row per line; "
+                            "columnar = one array per field")
+
+
+# ═══════════════════════════════════════════════════════════════════════
+#  GRID — request models (2D heatmaps)
+# ═══════════════════════════════════════════════════════════════════════
+
+class GridAxis(BaseModel):
+    field: str = Field(..., description="Input to vary, e.g. gross_annual, pension_pct, hours_month, su_monthly")
+    start: float = Field(..., description="First value (request units, e.g. % or kr/month)")
+    stop: float = Field(..., description="Last value (inclusive)")
+    points: int = Field(..., ge=1, description="Number of evenly spaced values")
+
+
+class GridRequest(BaseModel):
+    base: Literal["employee", "student"] = Field("employee", description="employee | student")
+    x: GridAxis
+    y: GridAxis
+    output: str = Field("net_monthly", description="Engine result field returned per cell")
+    gross_annual: float | None = Field(None, description="Fixed gross when no axis sets it (employee)")
+    hourly_rate: float | None = Field(None, description="Fixed hourly rate when hours_month is an axis")
+    hours_month: float | None = Field(None, description="Fixed monthly hours when hourly_rate is an axis")
+    employee: CurveRequest = Field(default_factory=CurveRequest, description="Fixed employee settings")
+    student: StudentRequest | None = Field(None, description="Fixed student settings")
 
 
 # ═══════════════════════════════════════════════════════════════════════
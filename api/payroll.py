@@ -0,0 +1,265 @@
+"""
+Streaming payroll files: one net-pay calculation per row.
+
+Input is a CSV (or, with ``pyarrow`` installed, Parquet) export with one
+employee per row. Columns are the ``FullTimeRequest`` / ``PartTimeRequest``
+field names (``gross_annual``, ``hourly_rate``, ``hours_month``,
+``kommune``, ``pension_pct``, ...); empty cells take the model default.
+Rows with ``gross_annual`` are salaried, rows with only ``hourly_rate`` +
+``hours_month`` are hourly (with the part-time defaults). Other columns
+(employee ids etc.) are passed through untouched.
+
+Rows are read in blocks of ``PAYROLL_BLOCK_SIZE``; each block is validated
+row by row and computed with one ``compute_tax_batch`` call per ruleset.
+Blocks run on the shared compute pool (``api.executor``) with a bounded number in
+flight and are written out in input order as they finish, so memory stays
+flat no matter how many rows the file has.
+
+Offline::
+
+    python -m api.payroll salaries.csv net.csv [--workers N] [--block-size N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import io
+import os
+import sys
+from collections import deque
+from collections.abc import Iterable, Iterator
+from contextlib import ExitStack
+from itertools import islice
+
+import numpy as np
+from pydantic import ValidationError
+
+from .batch import format_validation_error
+from .executor import compute_workers, configure_compute_pool, get_pool
+from .models import FullTimeRequest, PartTimeRequest
+from .rules import get_rules
+from .tax_engine import compute_tax_batch
+
+PAYROLL_BLOCK_SIZE = int(os.getenv("PAYROLL_BLOCK_SIZE", "5000"))
+
+INPUT_FIELDS = frozenset(FullTimeRequest.model_fields) | frozenset(PartTimeRequest.model_fields)
+
+# Appended to every output row (money in kr, rounded to øre).
+RESULT_FIELDS = (
+    "gross_annual",
+    "am_bidrag",
+    "total_income_tax",
+    "net_annual",
+    "net_monthly",
+    "effective_tax_rate",
+)
+OUTPUT_EXTRA = (*RESULT_FIELDS, "error")
+
+# Blocks queued per worker; bounds memory while keeping every core busy.
+_BLOCKS_IN_FLIGHT = 2
+
+
+def _parse_row(row: dict) -> FullTimeRequest | PartTimeRequest:
+    params = {
+        key: value for key, value in row.items()
+        if key in INPUT_FIELDS and value is not None and value != ""
+    }
+    if "gross_annual" not in params and ("hourly_rate" in params or "hours_month" in params):
+        return PartTimeRequest.model_validate(params)
+    return FullTimeRequest.model_validate(params)
+
+
+def compute_block(rows: list[dict]) -> list[tuple]:
+    """Result tuples (``OUTPUT_EXTRA`` order) for one block of input rows."""
+    out: list[tuple] = [()] * len(rows)
+    groups: dict = {}
+    for i, row in enumerate(rows):
+        try:
+            req = _parse_row(row)
+        except ValidationError as exc:
+            out[i] = (None,) * len(RESULT_FIELDS) + (format_validation_error(exc),)
+            continue
+        rules = get_rules(req.tax_year)
+        if rules is None:
+            error = f"Unsupported tax year: {req.tax_year}"
+        elif req.kommune not in rules.kommuner:
+            error = f"Unknown kommune: {req.kommune}"
+        else:
+            groups.setdefault(rules.year, (rules, []))[1].append((i, req))
+            continue
+        out[i] = (None,) * len(RESULT_FIELDS) + (error,)
+
+    for rules, members in groups.values():
+        reqs = [req for _, req in members]
+        fields = [vars(req) for req in reqs]
+
+        def col(name):
+            return np.array([f.get(name, 0.0) for f in fields], dtype=float)
+
+        hourly = np.array([isinstance(req, PartTimeRequest) for req in reqs])
+        rates = [rules.kommuner[req.kommune] for req in reqs]
+        r = compute_tax_batch(
+            gross_annual=np.where(hourly, col("hourly_rate") * col("hours_month") * 12, col("gross_annual")),
+            pension_pct=col("pension_pct") / 100,
+            kommune_pct=np.array([rate["kommuneskat"] for rate in rates]),
+            kirke_pct=np.array([rate["kirkeskat"] for rate in rates]),
+            is_church=np.array([req.is_church for req in reqs]),
+            employer_pension_pct=col("employer_pension_pct") / 100,
+            is_hourly=hourly,
+            taxable_benefits_annual=col("taxable_benefits_monthly") * 12,
+            other_pay_annual=col("other_pay_monthly") * 12,
+            pretax_deductions_annual=col("pretax_deductions_monthly") * 12,
+            aftertax_deductions_annual=col("aftertax_deductions_monthly") * 12,
+            atp_monthly=col("atp_monthly"),
+            transport_km=col("transport_km"),
+            union_fees_annual=col("union_fees_annual"),
+            pension_type=np.array([req.pension_type for req in reqs]),
+            rules=rules,
+        )
+        columns = [np.round(r[key], 4 if key == "effective_tax_rate" else 2).tolist()
+                   for key in RESULT_FIELDS]
+        for j, (i, _) in enumerate(members):
+            out[i] = tuple(column[j] for column in columns) + (None,)
+    return out
+
+
+def _blocks(rows: Iterable[dict], block_size: int) -> Iterator[list[dict]]:
+    rows = iter(rows)
+    while block := list(islice(rows, block_size)):
+        yield block
+
+
+def process_rows(
+    rows: Iterable[dict],
+    block_size: int = PAYROLL_BLOCK_SIZE,
+) -> Iterator[list[tuple[dict, tuple]]]:
+    """Yield ``(row, results)`` pairs block by block, in input order."""
+    pool = get_pool()
+    if pool is None:
+        for block in _blocks(rows, block_size):
+            yield list(zip(block, compute_block(block)))
+        return
+
+    pending: deque = deque()
+    for block in _blocks(rows, block_size):
+        pending.append((block, pool.submit(compute_block, block)))
+        if len(pending) >= compute_workers() * _BLOCKS_IN_FLIGHT:
+            done, future = pending.popleft()
+            yield list(zip(done, future.result()))
+    while pending:
+        done, future = pending.popleft()
+        yield list(zip(done, future.result()))
+
+
+def output_fieldnames(input_fields: Iterable[str]) -> list[str]:
+    """Input columns in order, then the result columns (not duplicated)."""
+    fields = [name for name in input_fields if name not in OUTPUT_EXTRA]
+    return fields + list(OUTPUT_EXTRA)
+
+
+def payroll_header_error(fieldnames: Iterable[str] | None) -> str | None:
+    if not fieldnames:
+        return "Payroll file has no header row"
+    if "gross_annual" not in fieldnames and not {"hourly_rate", "hours_month"} <= set(fieldnames):
+        return "Payroll file needs a gross_annual column or hourly_rate and hours_month columns"
+    return None
+
+
+def iter_payroll_csv(reader: csv.DictReader, block_size: int = PAYROLL_BLOCK_SIZE) -> Iterator[str]:
+    """Output CSV text, one chunk per block (header in the first chunk)."""
+    buf = io.StringIO()
+    writer = csv.DictWriter(buf, output_fieldnames(reader.fieldnames), extrasaction="ignore")
+    writer.writeheader()
+    for block in process_rows(reader, block_size):
+        for row, results in block:
+            writer.writerow({**row, **dict(zip(OUTPUT_EXTRA, results))})
+        yield buf.getvalue()
+        buf.seek(0)
+        buf.truncate()
+    if buf.tell():
+        yield buf.getvalue()
+
+
+# ── Offline mode ─────────────────────────────────────────────────────
+
+def _read_parquet(path: str, block_size: int):
+    import pyarrow.parquet as pq
+
+    source = pq.ParquetFile(path)
+    rows = (row for batch in source.iter_batches(batch_size=block_size) for row in batch.to_pylist())
+    return source.schema_arrow, rows
+
+
+def _write_parquet(path: str, input_schema, blocks: Iterator[list[tuple[dict, tuple]]]) -> int:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    fields = [field for field in input_schema if field.name not in OUTPUT_EXTRA]
+    schema = pa.schema(fields + [pa.field(name, pa.float64()) for name in RESULT_FIELDS]
+                       + [pa.field("error", pa.string())])
+    count = 0
+    with pq.ParquetWriter(path, schema) as writer:
+        for block in blocks:
+            data = {field.name: [row.get(field.name) for row, _ in block] for field in fields}
+            for k, name in enumerate(OUTPUT_EXTRA):
+                data[name] = [results[k] for _, results in block]
+            writer.write_table(pa.Table.from_pydict(data, schema=schema))
+            count += len(block)
+    return count
+
+
+def process_file(src: str, dst: str, block_size: int = PAYROLL_BLOCK_SIZE) -> int:
+    """Compute *src* into *dst* (CSV or .parquet by extension); returns row count."""
+    with ExitStack() as stack:
+        if src.endswith(".parquet"):
+            schema, rows = _read_parquet(src, block_size)
+            fieldnames = schema.names
+        else:
+            reader = csv.DictReader(stack.enter_context(open(src, newline="", encoding="utf-8-sig")))
+            rows, fieldnames = reader, reader.fieldnames
+            schema = None
+
+        error = payroll_header_error(fieldnames)
+        if error:
+            raise ValueError(error)
+
+        blocks = process_rows(rows, block_size)
+        if dst.endswith(".parquet"):
+            if schema is None:
+                import pyarrow as pa
+                schema = pa.schema([pa.field(name, pa.string()) for name in fieldnames])
+            return _write_parquet(dst, schema, blocks)
+
+        count = 0
+        out = stack.enter_context(open(dst, "w", newline="", encoding="utf-8"))
+        writer = csv.DictWriter(out, output_fieldnames(fieldnames), extrasaction="ignore")
+        writer.writeheader()
+        for block in blocks:
+            for row, results in block:
+                writer.writerow({**row, **dict(zip(OUTPUT_EXTRA, results))})
+            count += len(block)
+        return count
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m api.payroll",
+        description="Compute net pay, AM-bidrag and income tax for every row of a payroll file.")
+    parser.add_argument("input", help="CSV or .parquet file (columns named as in api/models.py)")
+    parser.add_argument("output", help="CSV or .parquet file to write")
+    parser.add_argument("--block-size", type=int, default=PAYROLL_BLOCK_SIZE)
+    parser.add_argument("--workers", type=int, default=compute_workers(),
+                        help="worker processes (0 = compute in this process)")
+    args = parser.parse_args(argv)
+    configure_compute_pool(args.workers)
+    try:
+        count = process_file(args.input, args.output, args.block_size)
+    except (ValueError, ImportError) as exc:
+        parser.exit(1, f"error: {exc}\n")
+    print(f"{count} rows written to {args.output}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,190 @@
+"""
+Month-by-month payslip simulation.
+
+``compute_tax`` works on annual figures and spreads ferietillæg / feriepenge
+evenly over 12 months (see the accuracy note in ``tax_engine``). Real
+payslips differ: the holiday supplement is paid out in May (or split
+between May and August), and each month is taxed on its own AM-basis with
+1/12 of the annual fradrag and bracket thresholds.
+
+``simulate_payslips`` models exactly that. Every month is run through the
+batch engine as an annualized month (month × 12, results ÷ 12), which
+allocates personfradrag, beskæftigelsesfradrag, jobfradrag and the bracket
+thresholds monthly. All 12 months — and any number of scenarios broadcast
+in front of the month axis — are computed in one vectorized call.
+
+The months need not add up to the annual engine: the difference is what
+the year-end tax settlement (årsopgørelse) reconciles.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+from .models import EmployeeScenarioRequest
+from .rules import DEFAULT_RULES, TaxRules, get_rules
+from .salary_scenarios import scenario_gross_annual
+from .tax_engine import compute_tax, compute_tax_batch
+
+MONTHS = np.arange(1, 13)
+
+# Share of the annual ferietillæg / feriepenge paid out in each month.
+FERIE_PAYOUT_SHARES: dict[str, np.ndarray] = {
+    "may":        np.where(MONTHS == 5, 1.0, 0.0),
+    "may_august": np.where((MONTHS == 5) | (MONTHS == 8), 0.5, 0.0),
+    "monthly":    np.full(12, 1 / 12),
+}
+
+# Per-month payslip lines (kr/month), in display order.
+PAYSLIP_FIELDS = (
+    "salary",
+    "feriepenge",
+    "other_pay",
+    "pretax_deductions",
+    "cash_pay",
+    "taxable_benefits",
+    "employee_pension",
+    "employer_pension",
+    "atp",
+    "am_basis",
+    "am_bidrag",
+    "fradrag",
+    "bundskat",
+    "kommuneskat",
+    "kirkeskat",
+    "mellemskat",
+    "topskat",
+    "toptopskat",
+    "income_tax",
+    "aftertax_deductions",
+    "net_pay",
+)
+
+
+def simulate_payslips(
+    gross_annual,
+    pension_pct,
+    kommune_pct,
+    kirke_pct,
+    is_church,
+    employer_pension_pct=0.0,
+    is_hourly=False,
+    taxable_benefits_annual=0.0,
+    other_pay_annual=0.0,
+    pretax_deductions_annual=0.0,
+    aftertax_deductions_annual=0.0,
+    atp_monthly=0.0,
+    transport_km=0.0,
+    union_fees_annual=0.0,
+    pension_type="standard",
+    ferie_payout: str = "may",
+    rules: TaxRules = DEFAULT_RULES,
+) -> dict[str, np.ndarray]:
+    """Twelve payslips per scenario in one vectorized engine pass.
+
+    Arguments match compute_tax_batch() (scalars or arrays, annual amounts)
+    plus ``ferie_payout``: ``may``, ``may_august`` or ``monthly``. A month
+    axis of length 12 is appended to the broadcast input shape; every
+    returned array (PAYSLIP_FIELDS, kr/month) has shape ``(..., 12)``.
+    """
+    shares = FERIE_PAYOUT_SHARES[ferie_payout]
+
+    def per_month(value):
+        return np.asarray(value)[..., np.newaxis]
+
+    gross_annual = per_month(np.asarray(gross_annual, dtype=float))
+    is_hourly = per_month(np.asarray(is_hourly, dtype=bool))
+    ferie_rate = np.where(is_hourly, rules.feriepenge_rate, rules.ferietillaeg_rate)
+    ferie_paid = gross_annual * ferie_rate * shares      # kr paid out this month
+
+    r = compute_tax_batch(
+        gross_annual, per_month(pension_pct), per_month(kommune_pct),
+        per_month(kirke_pct), per_month(is_church),
+        employer_pension_pct=per_month(employer_pension_pct),
+        is_hourly=is_hourly,
+        taxable_benefits_annual=per_month(taxable_benefits_annual),
+        other_pay_annual=per_month(other_pay_annual) + ferie_paid * 12,
+        pretax_deductions_annual=per_month(pretax_deductions_annual),
+        aftertax_deductions_annual=per_month(aftertax_deductions_annual),
+        atp_monthly=per_month(atp_monthly),
+        transport_km=per_month(transport_km),
+        union_fees_annual=per_month(union_fees_annual),
+        pension_type=per_month(pension_type),
+        rules=rules,
+        _skip_ferie=True,
+    )
+    shape = r["net_annual"].shape
+    other_pay = np.broadcast_to(per_month(other_pay_annual) / 12, shape)
+
+    return {
+        "salary":              r["gross_annual"] / 12,
+        "feriepenge":          np.broadcast_to(ferie_paid, shape),
+        "other_pay":           other_pay,
+        "pretax_deductions":   r["pretax_deductions"] / 12,
+        "cash_pay":            (r["gross_annual"] + r["other_pay"] - r["pretax_deductions"]) / 12,
+        "taxable_benefits":    r["taxable_benefits"] / 12,
+        "employee_pension":    r["employee_pension"] / 12,
+        "employer_pension":    r["employer_pension"] / 12,
+        "atp":                 r["atp_annual"] / 12,
+        "am_basis":            r["taxable_income"] / 12,
+        "am_bidrag":           r["am_bidrag"] / 12,
+        "fradrag":             (rules.personfradrag + r["beskaeft_fradrag"]
+                                + r["job_fradrag"] + r["lignings_fradrag"]) / 12,
+        "bundskat":            r["bundskat"] / 12,
+        "kommuneskat":         r["kommuneskat"] / 12,
+        "kirkeskat":           r["kirkeskat"] / 12,
+        "mellemskat":          r["mellemskat"] / 12,
+        "topskat":             r["topskat"] / 12,
+        "toptopskat":          r["toptopskat"] / 12,
+        "income_tax":          r["total_income_tax"] / 12,
+        "aftertax_deductions": r["aftertax_deductions"] / 12,
+        "net_pay":             r["net_monthly"],
+    }
+
+
+def simulate_employee_payslips(scenario: EmployeeScenarioRequest, ferie_payout: str) -> dict:
+    """Payslips for one wizard scenario, with the annual engine for reference."""
+    rules = get_rules(scenario.tax_year)
+    if rules is None:
+        return {"error": f"Unsupported tax year: {scenario.tax_year}"}
+    if scenario.kommune not in rules.kommuner:
+        return {"error": f"Unknown kommune: {scenario.kommune}"}
+
+    rates = rules.kommuner[scenario.kommune]
+    args = dict(
+        gross_annual=scenario_gross_annual(scenario),
+        pension_pct=scenario.pension_pct / 100,
+        kommune_pct=rates["kommuneskat"],
+        kirke_pct=rates["kirkeskat"],
+        is_church=scenario.is_church,
+        employer_pension_pct=scenario.employer_pension_pct / 100,
+        is_hourly=scenario.employment_type == "parttime",
+        taxable_benefits_annual=scenario.taxable_benefits_monthly * 12,
+        other_pay_annual=scenario.other_pay_monthly * 12,
+        pretax_deductions_annual=scenario.pretax_deductions_monthly * 12,
+        aftertax_deductions_annual=scenario.aftertax_deductions_monthly * 12,
+        atp_monthly=scenario.atp_monthly,
+        transport_km=scenario.transport_km,
+        union_fees_annual=scenario.union_fees_annual,
+        pension_type=scenario.pension_type,
+        rules=rules,
+    )
+    slips = simulate_payslips(ferie_payout=ferie_payout, **args)
+    annual = compute_tax(**args)
+
+    cols = {key: slips[key].tolist() for key in PAYSLIP_FIELDS}
+    months = [
+        {"month": month, **{key: cols[key][i] for key in PAYSLIP_FIELDS}}
+        for i, month in enumerate(MONTHS.tolist())
+    ]
+    totals = {key: sum(cols[key]) for key in PAYSLIP_FIELDS}
+    return {
+        "employment_type": scenario.employment_type,
+        "kommune": scenario.kommune,
+        "ferie_payout": ferie_payout,
+        "months": months,
+        "totals": totals,
+        "annual_net": annual.net_annual,
+        # What the årsopgørelse settles: positive = refund, negative = restskat
+        "year_end_settlement": annual.net_annual - totals["net_pay"],
+    }
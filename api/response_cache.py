@@ -0,0 +1,148 @@
+"""
+Content-addressed response cache for the pure chart endpoints.
+
+``/api/compute/curve``, ``/hours-curve`` and ``/student-hours-curve`` are
+pure functions of their request body. Responses are cached under a SHA-256
+of the endpoint path and the validated request model (canonical JSON, so
+``1200000`` and ``1200000.0`` or reordered keys hit the same entry) and
+stored already encoded, so a repeat load skips both computation and JSON
+encoding.
+
+Each response carries an ``ETag`` (hash of the encoded body) with
+``Cache-Control: no-cache``; a matching ``If-None-Match`` gets an empty
+304. Memory is bounded by ``RESPONSE_CACHE_MAX_BYTES`` (LRU eviction; 0
+disables the cache). Errors and streamed responses are never cached.
+
+Payloads the landing page and wizards always start with are *pinned* at
+startup (``pin``): they are never evicted or cleared and are served even
+when the LRU is disabled, so the first paint does no engine work.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+
+from fastapi import Request, Response
+from pydantic import BaseModel
+
+from .json_response import FastJSONResponse, dumps
+
+_DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in tags or etag in tags or f"W/{etag}" in tags
+
+
+def _cacheable(result: object) -> bool:
+    return isinstance(result, list) or (isinstance(result, dict) and "error" not in result)
+
+
+class ResponseCache:
+    """Bounded (by encoded size) LRU of JSON response bodies with ETags."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[str, tuple[str, bytes]] = OrderedDict()
+        self._pinned: dict[str, tuple[str, bytes]] = {}
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(path: str, model: BaseModel) -> str:
+        canonical = json.dumps(model.model_dump(mode="json"), sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(f"{path}\0{canonical}".encode()).hexdigest()
+
+    @staticmethod
+    def _encode(result: object) -> tuple[str, bytes]:
+        body = dumps(result)
+        return f'"{hashlib.sha256(body).hexdigest()[:32]}"', body
+
+    def _get(self, key: str) -> tuple[str, bytes] | None:
+        with self._lock:
+            entry = self._pinned.get(key)
+            if entry is not None:
+                self.hits += 1
+                return entry
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def _put(self, key: str, etag: str, body: bytes) -> None:
+        if len(body) > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._size -= len(old[1])
+            self._entries[key] = (etag, body)
+            self._size += len(body)
+            while self._size > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+
+    async def respond(self, request: Request, model: BaseModel, compute: Callable[[], Awaitable[object]]):
+        """Serve *model*'s response from the cache, or compute and store it.
+
+        *compute* awaits the endpoint's normal result; chart data (a list of
+        rows or a columnar dict) is cached — error dicts and streaming
+        responses pass through.
+        """
+        key = self.key(request.url.path, model)
+        entry = self._get(key) if self.max_bytes > 0 or self._pinned else None
+        if entry is None:
+            result = await compute()
+            if not _cacheable(result):
+                return result
+            if self.max_bytes <= 0:
+                return FastJSONResponse(result)
+            etag, body = self._encode(result)
+            self._put(key, etag, body)
+        else:
+            etag, body = entry
+
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if _etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers=headers)
+        return Response(content=body, media_type="application/json", headers=headers)
+
+    def pin(self, path: str, model: BaseModel, result: object) -> None:
+        """Store *result* for (*path*, *model*) permanently (not LRU-managed)."""
+        entry = self._encode(result)
+        with self._lock:
+            self._pinned[self.key(path, model)] = entry
+
+    def clear(self) -> None:
+        """Drop the LRU entries and counters (pinned payloads stay)."""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+            self.hits = self.misses = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "max_bytes": self.max_bytes,
+                "bytes": self._size,
+                "entries": len(self._entries),
+                "pinned": len(self._pinned),
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+curve_cache = ResponseCache(int(os.getenv("RESPONSE_CACHE_MAX_BYTES", str(_DEFAULT_MAX_BYTES))))
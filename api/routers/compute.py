@@ -2,27 +2,61 @@
 Tax computation endpoints: full-time, part-time, student, and chart curves.
 """
 
-from fastapi import APIRouter
+import csv
+import io
+import json
+import os
+import tempfile
+import time
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from itertools import islice
 
-from ..data import KOMMUNER
-from ..tax_engine import compute_tax, compute_student_income
+import numpy as np
+from fastapi import APIRouter, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+from ..data import ATP_MONTHLY, ATP_MONTHLY_PARTTIME
+from ..rules import TaxRules, get_rules
+from ..engine_cache import cached_compute_tax, cached_compute_student_income
+from ..tax_engine import compute_tax_batch, compute_student_income_batch
+from ..tax_schedule import get_schedule, get_student_schedule
+from ..payslip import simulate_employee_payslips
+from ..batch import BATCH_MAX_ITEMS, run_batch
+from ..executor import run_cpu_bound
+from ..payroll import iter_payroll_csv, payroll_header_error
+from ..response_cache import curve_cache
+from ..json_response import FastJSONResponse
 from ..salary_scenarios import (
+    compare_employee_scenarios,
     comparison_delta,
     compute_employee_scenario,
+    optimize_employee_scenario,
+    projection_delta,
     project_employee_scenario,
+    simulate_employee_projection,
 )
 from ..models import (
     FullTimeRequest,
     PartTimeRequest,
     StudentRequest,
+    InverseRequest,
+    KommuneSweepRequest,
     ProjectionRequest,
+    MonteCarloProjectionRequest,
     ComparisonRequest,
+    MultiComparisonRequest,
+    OptimizeRequest,
+    PayslipRequest,
     CurveRequest,
     HoursCurveRequest,
     StudentHoursCurveRequest,
+    GridRequest,
+    BatchRequest,
 )
 
-router = APIRouter(prefix="/api")
+router = APIRouter(prefix="/api", default_response_class=FastJSONResponse)
 
 
 # ═══════════════════════════════════════════════════════════════════════
@@ -32,11 +66,14 @@ router = APIRouter(prefix="/api")
 @router.post("/compute/fulltime")
 def compute_fulltime(req: FullTimeRequest):
     """Full-time salary tax calculation."""
-    if req.kommune not in KOMMUNER:
+    rules = get_rules(req.tax_year)
+    if rules is None:
+        return {"error": f"Unsupported tax year: {req.tax_year}"}
+    if req.kommune not in rules.kommuner:
         return {"error": f"Unknown kommune: {req.kommune}"}
 
-    rates = KOMMUNER[req.kommune]
-    res = compute_tax(
+    rates = rules.kommuner[req.kommune]
+    res = cached_compute_tax(
         gross_annual=req.gross_annual,
         pension_pct=req.pension_pct / 100,
         kommune_pct=rates["kommuneskat"],
@@ -53,25 +90,29 @@ def compute_fulltime(req: FullTimeRequest):
         transport_km=req.transport_km,
         union_fees_annual=req.union_fees_annual,
         pension_type=req.pension_type,
+        rules=rules,
     )
     return {
         "kommune": req.kommune,
         "kommune_pct": rates["kommuneskat"],
         "kirke_pct": rates["kirkeskat"],
-        **res,
+        **res.as_dict(),
     }
 
 
 @router.post("/compute/parttime")
 def compute_parttime(req: PartTimeRequest):
     """Part-time / hourly tax calculation."""
-    if req.kommune not in KOMMUNER:
+    rules = get_rules(req.tax_year)
+    if rules is None:
+        return {"error": f"Unsupported tax year: {req.tax_year}"}
+    if req.kommune not in rules.kommuner:
         return {"error": f"Unknown kommune: {req.kommune}"}
 
-    rates = KOMMUNER[req.kommune]
+    rates = rules.kommuner[req.kommune]
     gross_annual = req.hourly_rate * req.hours_month * 12
 
-    res = compute_tax(
+    res = cached_compute_tax(
         gross_annual=gross_annual,
         pension_pct=req.pension_pct / 100,
         kommune_pct=rates["kommuneskat"],
@@ -88,6 +129,7 @@ def compute_parttime(req: PartTimeRequest):
         transport_km=req.transport_km,
         union_fees_annual=req.union_fees_annual,
         pension_type=req.pension_type,
+        rules=rules,
     )
     return {
         "kommune": req.kommune,
@@ -95,18 +137,21 @@ def compute_parttime(req: PartTimeRequest):
         "kirke_pct": rates["kirkeskat"],
         "hourly_rate": req.hourly_rate,
         "hours_month": req.hours_month,
-        **res,
+        **res.as_dict(),
     }
 
 
 @router.post("/compute/student")
 def compute_student(req: StudentRequest):
     """Student (SU + work) tax calculation."""
-    if req.kommune not in KOMMUNER:
+    rules = get_rules(req.tax_year)
+    if rules is None:
+        return {"error": f"Unsupported tax year: {req.tax_year}"}
+    if req.kommune not in rules.kommuner:
         return {"error": f"Unknown kommune: {req.kommune}"}
 
-    rates = KOMMUNER[req.kommune]
-    res = compute_student_income(
+    rates = rules.kommuner[req.kommune]
+    res = cached_compute_student_income(
         su_monthly=req.su_monthly,
         work_gross_monthly=req.work_gross_monthly,
         pension_pct=req.pension_pct / 100,
@@ -122,19 +167,237 @@ def compute_student(req: StudentRequest):
         transport_km=req.transport_km,
         union_fees_annual=req.union_fees_annual,
         pension_type=req.pension_type,
+        rules=rules,
     )
     return {
         "kommune": req.kommune,
         "kommune_pct": rates["kommuneskat"],
         "kirke_pct": rates["kirkeskat"],
-        **res,
+        **res.as_dict(),
+    }
+
+
+@router.post("/compute/inverse")
+def compute_inverse(req: InverseRequest):
+    """Gross salary (or hours / hourly rate) needed to reach a target net.
+
+    Solved exactly on the compiled piecewise-linear schedule. For students
+    the first (lowest) work income reaching the target is returned, or 0
+    (``already_met``) when SU alone reaches it. Unset pension and ATP fields
+    take the service type's own defaults.
+    """
+    rules = get_rules(req.tax_year)
+    if rules is None:
+        return {"error": f"Unsupported tax year: {req.tax_year}"}
+    if req.kommune not in rules.kommuner:
+        return {"error": f"Unknown kommune: {req.kommune}"}
+    if req.service_type == "fulltime" and req.solve_for != "gross":
+        return {"error": "fulltime can only solve for gross"}
+    if req.solve_for == "hours_month" and not req.hourly_rate:
+        return {"error": "hourly_rate is required when solving for hours_month"}
+    if req.solve_for == "hourly_rate" and not req.hours_month:
+        return {"error": "hours_month is required when solving for hourly_rate"}
+
+    rates = rules.kommuner[req.kommune]
+    if req.service_type == "student":
+        schedule = get_student_schedule(
+            kommune_pct=rates["kommuneskat"],
+            kirke_pct=rates["kirkeskat"],
+            is_church=req.is_church,
+            su_monthly=req.su_monthly,
+            pension_pct=req.pension_pct / 100,
+            pension_type=req.pension_type,
+            employer_pension_pct=req.employer_pension_pct / 100,
+            aars_fribeloeb=req.aars_fribeloeb,
+            atp_monthly=req.atp_monthly,
+            pretax_deductions_annual=req.pretax_deductions_monthly * 12,
+            aftertax_deductions_annual=req.aftertax_deductions_monthly * 12,
+            other_pay_annual=req.other_pay_monthly * 12,
+            transport_km=req.transport_km,
+            union_fees_annual=req.union_fees_annual,
+            rules=rules,
+        )
+        months = 1    # student schedules run over monthly work income
+    else:
+        schedule = get_schedule(
+            kommune_pct=rates["kommuneskat"],
+            kirke_pct=rates["kirkeskat"],
+            is_church=req.is_church,
+            pension_pct=req.pension_pct / 100,
+            pension_type=req.pension_type,
+            employer_pension_pct=req.employer_pension_pct / 100,
+            atp_monthly=req.atp_monthly,
+            is_hourly=req.service_type == "parttime",
+            taxable_benefits_annual=req.taxable_benefits_monthly * 12,
+            other_pay_annual=req.other_pay_monthly * 12,
+            pretax_deductions_annual=req.pretax_deductions_monthly * 12,
+            aftertax_deductions_annual=req.aftertax_deductions_monthly * 12,
+            transport_km=req.transport_km,
+            union_fees_annual=req.union_fees_annual,
+            rules=rules,
+        )
+        months = 12   # employee schedules run over annual gross
+
+    # Students already get SU without working; the net at zero may meet the target
+    target = req.target_net_monthly * 12
+    already_met = schedule.value("net_annual", 0.0) >= target
+    x = 0.0 if already_met else schedule.solve("net_annual", target)
+    if x is None:
+        return {"error": "Target net income is not reachable with these settings"}
+
+    gross_monthly = x / months
+    result = {
+        "service_type": req.service_type,
+        "solve_for": req.solve_for,
+        "kommune": req.kommune,
+        "target_net_monthly": req.target_net_monthly,
+        "already_met": already_met,
+        "gross_monthly": gross_monthly,
+        "gross_annual": gross_monthly * 12,
+        "net_monthly": schedule.value("net_annual", x) / 12,
+    }
+    if req.solve_for == "hours_month":
+        result["hourly_rate"] = req.hourly_rate
+        result["hours_month"] = gross_monthly / req.hourly_rate
+    elif req.solve_for == "hourly_rate":
+        result["hours_month"] = req.hours_month
+        result["hourly_rate"] = gross_monthly / req.hours_month
+    return result
+
+
+@router.post("/compute/kommune-sweep")
+def compute_kommune_sweep(req: KommuneSweepRequest):
+    """One salary profile in every kommune, with and without church tax.
+
+    All kommuner × {no church, church} are evaluated in a single batched
+    engine call. The result is columnar (one list per field, same order)
+    and ranked by net pay for the ``is_church`` variant, best first.
+    """
+    rules = get_rules(req.tax_year)
+    if rules is None:
+        return {"error": f"Unsupported tax year: {req.tax_year}"}
+
+    names = list(rules.kommuner)
+    kommune_pct = np.array([rules.kommuner[n]["kommuneskat"] for n in names])
+    kirke_pct = np.array([rules.kommuner[n]["kirkeskat"] for n in names])
+    r = compute_tax_batch(
+        req.gross_annual, req.pension_pct / 100,
+        kommune_pct, kirke_pct,
+        np.array([[False], [True]]),      # rows: without / with church tax
+        employer_pension_pct=req.employer_pension_pct / 100,
+        is_hourly=req.is_hourly,
+        atp_monthly=req.atp_monthly,
+        other_pay_annual=req.other_pay_monthly * 12,
+        taxable_benefits_annual=req.taxable_benefits_monthly * 12,
+        pretax_deductions_annual=req.pretax_deductions_monthly * 12,
+        aftertax_deductions_annual=req.aftertax_deductions_monthly * 12,
+        transport_km=req.transport_km,
+        union_fees_annual=req.union_fees_annual,
+        pension_type=req.pension_type,
+        rules=rules,
+    )
+    ranked_by = r["net_monthly"][int(req.is_church)]
+    # Best net first; ties (identical rates) keep alphabetical order
+    order = sorted(range(len(names)), key=lambda i: (-ranked_by[i], names[i]))
+    best = ranked_by[order[0]]
+
+    def column(values) -> list:
+        return [values[i] for i in order]
+
+    return {
+        "gross_annual": req.gross_annual,
+        "is_church": req.is_church,
+        "kommune": column(names),
+        "kommune_pct": column(kommune_pct.tolist()),
+        "kirke_pct": column(kirke_pct.tolist()),
+        "net_monthly": column(r["net_monthly"][0].tolist()),
+        "net_monthly_church": column(r["net_monthly"][1].tolist()),
+        "effective_rate": column(r["effective_tax_rate"][0].tolist()),
+        "effective_rate_church": column(r["effective_tax_rate"][1].tolist()),
+        "total_income_tax": column(r["total_income_tax"][0].tolist()),
+        "total_income_tax_church": column(r["total_income_tax"][1].tolist()),
+        "behind_best_monthly": column((best - ranked_by).tolist()),
     }
 
 
+@router.post("/compute/batch")
+async def compute_batch(req: BatchRequest):
+    """Many fulltime / parttime / student calculations in one request.
+
+    Results come back in input order, each exactly what the single endpoint
+    returns — including per-item ``{"error": ...}`` for invalid rows.
+    """
+    if len(req.items) > BATCH_MAX_ITEMS:
+        return {"error": f"Batch has {len(req.items)} items, limit is {BATCH_MAX_ITEMS}"}
+    results = await run_batch([(item.type, item.params) for item in req.items])
+    return FastJSONResponse({"results": results})
+
+
+PAYROLL_MAX_BYTES = int(os.getenv("PAYROLL_MAX_BYTES", str(256 * 1024 * 1024)))
+_PAYROLL_SPOOL_BYTES = 8 * 1024 * 1024
+
+
+@router.post("/compute/payroll")
+async def compute_payroll(request: Request):
+    """Net pay per row of an uploaded payroll CSV (raw ``text/csv`` body).
+
+    Columns use the FullTimeRequest / PartTimeRequest field names; see
+    ``api.payroll``. The upload is spooled (to disk past a few MB, written
+    from the thread pool) and the result CSV is streamed back block by block.
+    """
+    spool = tempfile.SpooledTemporaryFile(max_size=_PAYROLL_SPOOL_BYTES)
+    size = 0
+    async for chunk in request.stream():
+        size += len(chunk)
+        if size > PAYROLL_MAX_BYTES:
+            spool.close()
+            return {"error": f"Payroll file exceeds {PAYROLL_MAX_BYTES} bytes"}
+        # Past the in-memory limit the spool writes to disk; keep that off the event loop
+        await run_in_threadpool(spool.write, chunk)
+    spool.seek(0)
+
+    text = io.TextIOWrapper(spool, encoding="utf-8-sig", newline="")
+    reader = csv.DictReader(text)
+    error = payroll_header_error(await run_in_threadpool(lambda: reader.fieldnames))
+    if error:
+        text.close()
+        return {"error": error}
+
+    def body():
+        try:
+            yield from iter_payroll_csv(reader)
+        finally:
+            text.close()
+
+    return StreamingResponse(
+        body(), media_type="text/csv",
+        headers={"Content-Disposition": 'attachment; filename="payroll-net.csv"'},
+    )
+
+
 @router.post("/compute/projection")
-def compute_projection(req: ProjectionRequest):
+async def compute_projection(req: ProjectionRequest):
     """Project salary, tax, compensation, and pension over time."""
-    return project_employee_scenario(req.scenario, req.settings)
+    return FastJSONResponse(await run_cpu_bound(project_employee_scenario, req.scenario, req.settings))
+
+
+@router.post("/compute/projection/monte-carlo")
+async def compute_projection_monte_carlo(req: MonteCarloProjectionRequest):
+    """Projection with random returns and salary growth: p5/p50/p95 per year."""
+    return FastJSONResponse(await run_cpu_bound(
+        simulate_employee_projection, req.scenario, req.settings, req.monte_carlo))
+
+
+@router.post("/compute/optimize")
+def compute_optimize(req: OptimizeRequest):
+    """Best pension %, pension type and benefit exchange under a minimum net."""
+    return optimize_employee_scenario(req.scenario, req.settings)
+
+
+@router.post("/compute/payslip")
+def compute_payslip(req: PayslipRequest):
+    """Month-by-month payslips, with ferietillæg paid out when it really is."""
+    return simulate_employee_payslips(req.scenario, req.ferie_payout)
 
 
 @router.post("/compute/comparison")
@@ -147,7 +410,7 @@ def compute_comparison(req: ComparisonRequest):
     if "error" in scenario_b:
         return scenario_b
 
-    projection_a = projection_b = projection_delta = None
+    projection_a = projection_b = projections_delta = None
     settings_a = req.projection_a or req.projection
     settings_b = req.projection_b or req.projection
     if settings_a is not None and settings_b is not None:
@@ -157,10 +420,7 @@ def compute_comparison(req: ComparisonRequest):
         projection_b = project_employee_scenario(req.scenario_b, settings_b)
         if "error" in projection_b:
             return projection_b
-        projection_delta = {
-            key: projection_b["totals"][key] - projection_a["totals"][key]
-            for key in projection_a["totals"]
-        }
+        projections_delta = projection_delta(projection_a, projection_b)
 
     return {
         "scenario_a": scenario_a,
@@ -168,39 +428,267 @@ def compute_comparison(req: ComparisonRequest):
         "delta": comparison_delta(scenario_a, scenario_b),
         "projection_a": projection_a,
         "projection_b": projection_b,
-        "projection_delta": projection_delta,
+        "projection_delta": projections_delta,
+    }
+
+
+@router.post("/compute/comparison/multi")
+async def compute_multi_comparison(req: MultiComparisonRequest):
+    """Compare N scenarios against a baseline; duplicates are computed once."""
+    if req.baseline >= len(req.scenarios):
+        return {"error": f"baseline must be an index into scenarios (0-{len(req.scenarios) - 1})"}
+    if req.projections is not None and len(req.projections) != len(req.scenarios):
+        return {"error": "projections must have one entry per scenario"}
+    projections = [
+        settings or req.projection
+        for settings in (req.projections or [None] * len(req.scenarios))
+    ]
+    return FastJSONResponse(await run_cpu_bound(
+        compare_employee_scenarios, req.scenarios, projections, req.baseline))
+
+
+# ═══════════════════════════════════════════════════════════════════════
+#  GRID (2D heatmaps)
+# ═══════════════════════════════════════════════════════════════════════
+
+GRID_MAX_CELLS = int(os.getenv("GRID_MAX_CELLS", "250000"))
+
+EMPLOYEE_GRID_FIELDS = (
+    "gross_annual", "gross_monthly", "hourly_rate", "hours_month",
+    "pension_pct", "employer_pension_pct", "atp_monthly",
+    "other_pay_monthly", "taxable_benefits_monthly",
+    "pretax_deductions_monthly", "aftertax_deductions_monthly",
+    "transport_km", "union_fees_annual",
+)
+STUDENT_GRID_FIELDS = (
+    "su_monthly", "work_gross_monthly", "hourly_rate", "hours_month",
+    "pension_pct", "employer_pension_pct", "atp_monthly",
+    "other_pay_monthly", "pretax_deductions_monthly",
+    "aftertax_deductions_monthly", "transport_km", "union_fees_annual",
+)
+
+# Axes that each set the pay; two from different groups would override each other
+EMPLOYEE_PAY_AXES = ({"gross_annual"}, {"gross_monthly"}, {"hourly_rate", "hours_month"})
+STUDENT_PAY_AXES = ({"work_gross_monthly"}, {"hourly_rate", "hours_month"})
+
+
+@router.post("/compute/grid")
+async def compute_grid(req: GridRequest):
+    """Dense matrix of one result field over two varying inputs (see _compute_grid)."""
+    return FastJSONResponse(await run_cpu_bound(_compute_grid, req))
+
+
+def _compute_grid(req: GridRequest):
+    """Dense matrix of one result field over two varying inputs.
+
+    Axes are given in request units (% for pension, kr/month for monthly
+    fields). The whole grid is one broadcast batch-engine call: x varies
+    along columns, y along rows, so ``values[j][i]`` is at (x[i], y[j]).
+    """
+    allowed = STUDENT_GRID_FIELDS if req.base == "student" else EMPLOYEE_GRID_FIELDS
+    for axis in (req.x, req.y):
+        if axis.field not in allowed:
+            return {"error": f"Unsupported {req.base} grid axis: {axis.field}"}
+    if req.x.field == req.y.field:
+        return {"error": "x and y must vary different fields"}
+    pay_axes = STUDENT_PAY_AXES if req.base == "student" else EMPLOYEE_PAY_AXES
+    if sum(1 for group in pay_axes if {req.x.field, req.y.field} & group) > 1:
+        return {"error": f"{req.x.field} and {req.y.field} both set the pay; vary only one of them"}
+    cells = req.x.points * req.y.points
+    if cells > GRID_MAX_CELLS:
+        return {"error": f"Grid has {cells} cells, limit is {GRID_MAX_CELLS}"}
+
+    if req.base == "student":
+        fixed = req.student or StudentRequest(work_gross_monthly=0)
+    else:
+        fixed = req.employee
+    rules = get_rules(fixed.tax_year)
+    if rules is None:
+        return {"error": f"Unsupported tax year: {fixed.tax_year}"}
+    if fixed.kommune not in rules.kommuner:
+        return {"error": f"Unknown kommune: {fixed.kommune}"}
+    rates = rules.kommuner[fixed.kommune]
+
+    xs = np.linspace(req.x.start, req.x.stop, req.x.points)
+    ys = np.linspace(req.y.start, req.y.stop, req.y.points)
+    axes = {req.x.field: xs[np.newaxis, :], req.y.field: ys[:, np.newaxis]}
+
+    def value(field: str, default):
+        return axes.get(field, default)
+
+    # Pay from an hourly axis: rate × hours (the other factor may be fixed)
+    uses_hours = "hourly_rate" in axes or "hours_month" in axes
+    if uses_hours:
+        hourly_rate = value("hourly_rate", req.hourly_rate)
+        hours_month = value("hours_month", req.hours_month)
+        if hourly_rate is None or hours_month is None:
+            return {"error": "hourly_rate and hours_month are both required for an hourly grid"}
+
+    common = dict(
+        employer_pension_pct=value("employer_pension_pct", fixed.employer_pension_pct) / 100,
+        pretax_deductions_annual=value("pretax_deductions_monthly", fixed.pretax_deductions_monthly) * 12,
+        aftertax_deductions_annual=value("aftertax_deductions_monthly", fixed.aftertax_deductions_monthly) * 12,
+        atp_monthly=value("atp_monthly", fixed.atp_monthly),
+        other_pay_annual=value("other_pay_monthly", fixed.other_pay_monthly) * 12,
+        transport_km=value("transport_km", fixed.transport_km),
+        union_fees_annual=value("union_fees_annual", fixed.union_fees_annual),
+        pension_type=fixed.pension_type,
+        rules=rules,
+    )
+    if req.base == "student":
+        if uses_hours:
+            work = hourly_rate * hours_month
+        else:
+            work = value("work_gross_monthly", fixed.work_gross_monthly)
+        r = compute_student_income_batch(
+            value("su_monthly", fixed.su_monthly), work,
+            value("pension_pct", fixed.pension_pct) / 100,
+            rates["kommuneskat"], rates["kirkeskat"], fixed.is_church,
+            aars_fribeloeb=fixed.aars_fribeloeb,
+            **common,
+        )
+    else:
+        if uses_hours:
+            gross = hourly_rate * hours_month * 12
+        elif "gross_monthly" in axes:
+            gross = axes["gross_monthly"] * 12
+        elif "gross_annual" in axes:
+            gross = axes["gross_annual"]
+        elif req.gross_annual is not None:
+            gross = req.gross_annual
+        else:
+            return {"error": "gross_annual is required unless an axis sets the pay"}
+        r = compute_tax_batch(
+            gross, value("pension_pct", fixed.pension_pct) / 100,
+            rates["kommuneskat"], rates["kirkeskat"], fixed.is_church,
+            is_hourly=fixed.is_hourly or uses_hours,
+            taxable_benefits_annual=value("taxable_benefits_monthly", fixed.taxable_benefits_monthly) * 12,
+            **common,
+        )
+
+    if req.output not in r or req.output == "pension_type":
+        return {"error": f"Unknown output field: {req.output}"}
+    out = np.broadcast_to(r[req.output], (len(ys), len(xs)))
+    return {
+        "base": req.base,
+        "output": req.output,
+        "x": {"field": req.x.field, "values": xs.tolist()},
+        "y": {"field": req.y.field, "values": ys.tolist()},
+        "values": (out if out.dtype == bool else np.round(out, 2)).tolist(),
     }
 
 
 # ═══════════════════════════════════════════════════════════════════════
 #  CURVE ENDPOINTS (for charts)
 # ═══════════════════════════════════════════════════════════════════════
+#
+# Curves are computed in chunks of _CURVE_CHUNK points. format="json"
+# collects them into one list (capped at CURVE_MAX_POINTS); format="ndjson"
+# streams one row per line as chunks are computed, in constant memory
+# (capped at CURVE_MAX_STREAM_POINTS). Either way a request stops after
+# CURVE_TIME_BUDGET_S seconds so it cannot pin a worker.
+
+CURVE_MAX_POINTS = int(os.getenv("CURVE_MAX_POINTS", "20000"))
+CURVE_MAX_STREAM_POINTS = int(os.getenv("CURVE_MAX_STREAM_POINTS", "2000000"))
+CURVE_TIME_BUDGET_S = float(os.getenv("CURVE_TIME_BUDGET_S", "10"))
+_CURVE_CHUNK = 4096
+
+
+def _grid_limit_error(n_points: int, fmt: str) -> dict | None:
+    limit = CURVE_MAX_STREAM_POINTS if fmt == "ndjson" else CURVE_MAX_POINTS
+    if n_points <= limit:
+        return None
+    hint = "use a larger step or format=ndjson" if fmt != "ndjson" else "use a larger step"
+    return {"error": f"Curve has {n_points} points, limit is {limit} ({hint})"}
+
+
+def _chunked(values: Iterable, size: int = _CURVE_CHUNK) -> Iterator[list]:
+    it = iter(values)
+    while chunk := list(islice(it, size)):
+        yield chunk
+
+
+def _curve_response(fmt: str, row_chunks: Iterable[list[dict]]):
+    """Collect (json, columnar) or stream (ndjson) lazily computed row chunks.
+
+    The time budget is checked between chunks; a stream that runs out ends
+    with a single ``{"error": ...}`` line.
+    """
+    deadline = time.monotonic() + CURVE_TIME_BUDGET_S
+    timeout = {"error": f"Curve exceeded the {CURVE_TIME_BUDGET_S:g} s time budget"}
+
+    if fmt == "ndjson":
+        def lines() -> Iterator[str]:
+            for rows in row_chunks:
+                yield "".join(json.dumps(row, separators=(",", ":")) + "\n" for row in rows)
+                if time.monotonic() > deadline:
+                    yield json.dumps(timeout) + "\n"
+                    return
+        return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+    data = []
+    for rows in row_chunks:
+        data.extend(rows)
+        if time.monotonic() > deadline:
+            return timeout
+    if fmt == "columnar":
+        return {key: [row[key] for row in data] for key in (data[0] if data else ())}
+    return data
+
+
+async def _offload_curve(request: Request, req, compute):
+    """Run a curve off the event loop.
+
+    JSON curves go through the response cache and are computed on the
+    process pool; NDJSON streams are generated lazily on the thread pool.
+    """
+    if req.format == "ndjson":
+        return await run_in_threadpool(compute, req)
+    return await curve_cache.respond(request, req, lambda: run_cpu_bound(compute, req))
+
 
 @router.post("/compute/curve")
-def compute_curve(req: CurveRequest):
-    """Return net-vs-gross curve data for charts."""
-    if req.kommune not in KOMMUNER:
+async def compute_curve(req: CurveRequest, request: Request):
+    """Return net-vs-gross curve data for charts (ETag-cached)."""
+    return await _offload_curve(request, req, _compute_curve)
+
+
+def _compute_curve(req: CurveRequest):
+    rules = get_rules(req.tax_year)
+    if rules is None:
+        return {"error": f"Unsupported tax year: {req.tax_year}"}
+    if req.kommune not in rules.kommuner:
         return {"error": f"Unknown kommune: {req.kommune}"}
-    rates = KOMMUNER[req.kommune]
+    rates = rules.kommuner[req.kommune]
+    if req.mode == "breakpoints":
+        return _curve_response(req.format, [_curve_breakpoints(req, rules, rates)])
 
-    # Build gross-annual values list
+    # Gross-annual grid, generated lazily
     if req.step_monthly > 0:
         # Fine-grained: step in monthly DKK, converted to annual
         step_annual = req.step_monthly * 12
         gross_start = max(req.min_gross, 0)
-        gross_values = []
-        g = gross_start
-        while g <= req.max_gross:
-            gross_values.append(g)
-            g += step_annual
+        n_points = max(int((req.max_gross - gross_start) // step_annual) + 1, 0)
+
+        def gross_values() -> Iterator[float]:
+            g = gross_start
+            while g <= req.max_gross:
+                yield g
+                g += step_annual
     else:
         step = req.max_gross / req.points
-        gross_values = [step * i for i in range(req.points + 1)]
+        n_points = max(req.points + 1, 0)
 
-    data = []
-    for gross in gross_values:
-        r = compute_tax(
-            gross, req.pension_pct / 100,
+        def gross_values() -> Iterator[float]:
+            return (step * i for i in range(req.points + 1))
+
+    error = _grid_limit_error(n_points, req.format)
+    if error:
+        return error
+
+    def rows(gross_chunk: list[float]) -> list[dict]:
+        r = compute_tax_batch(
+            gross_chunk, req.pension_pct / 100,
             rates["kommuneskat"], rates["kirkeskat"],
             req.is_church,
             employer_pension_pct=req.employer_pension_pct / 100,
@@ -213,28 +701,102 @@ def compute_curve(req: CurveRequest):
             transport_km=req.transport_km,
             union_fees_annual=req.union_fees_annual,
             pension_type=req.pension_type,
+            rules=rules,
         )
-        data.append({
+        return [
+            {
+                "gross_annual": round(gross),
+                "gross_monthly": round(gross / 12),
+                "net_monthly": round(net),
+                "ferie_net_monthly": round(ferie),
+                "effective_rate": round(rate, 2),
+            }
+            for gross, net, ferie, rate in zip(
+                r["gross_annual"].tolist(), r["net_monthly"].tolist(),
+                r["net_ferie_monthly"].tolist(), r["effective_tax_rate"].tolist(),
+            )
+        ]
+
+    return _curve_response(req.format, map(rows, _chunked(gross_values())))
+
+
+def _curve_breakpoints(req: CurveRequest, rules: TaxRules, rates: Mapping) -> list[dict]:
+    """Vertices of the net-vs-gross curve: range ends plus every kink.
+
+    Each row also carries the exact slope of the segment that starts at it
+    (``net_slope`` = kr net per kr gross, ``marginal_rate`` = 1 − slope in %);
+    the last row closes the range and has no segment.
+    """
+    schedule = get_schedule(
+        kommune_pct=rates["kommuneskat"],
+        kirke_pct=rates["kirkeskat"],
+        is_church=req.is_church,
+        pension_pct=req.pension_pct / 100,
+        pension_type=req.pension_type,
+        employer_pension_pct=req.employer_pension_pct / 100,
+        atp_monthly=req.atp_monthly,
+        is_hourly=req.is_hourly,
+        taxable_benefits_annual=req.taxable_benefits_monthly * 12,
+        other_pay_annual=req.other_pay_monthly * 12,
+        pretax_deductions_annual=req.pretax_deductions_monthly * 12,
+        aftertax_deductions_annual=req.aftertax_deductions_monthly * 12,
+        transport_km=req.transport_km,
+        union_fees_annual=req.union_fees_annual,
+        rules=rules,
+    )
+    lo = max(req.min_gross, 0)
+    hi = req.max_gross
+    if hi < lo:
+        return []
+    vertices = [lo, *(g for g in schedule.breakpoints if lo < g < hi), hi]
+    if hi == lo:
+        vertices = [lo]
+
+    data = []
+    for i, gross in enumerate(vertices):
+        r = schedule.evaluate(gross)
+        row = {
             "gross_annual": round(gross),
             "gross_monthly": round(gross / 12),
             "net_monthly": round(r["net_monthly"]),
             "ferie_net_monthly": round(r["net_ferie_monthly"]),
             "effective_rate": round(r["effective_tax_rate"], 2),
-        })
+            "net_slope": None,
+            "marginal_rate": None,
+        }
+        if i + 1 < len(vertices):
+            slope = schedule.slopes["net_annual"][schedule.segment(gross)]
+            row["net_slope"] = round(slope, 6)
+            row["marginal_rate"] = round((1 - slope) * 100, 2)
+        data.append(row)
     return data
 
 
 @router.post("/compute/hours-curve")
-def compute_hours_curve(req: HoursCurveRequest):
-    """Return net-vs-hours curve data for part-time charts."""
-    if req.kommune not in KOMMUNER:
+async def compute_hours_curve(req: HoursCurveRequest, request: Request):
+    """Return net-vs-hours curve data for part-time charts (ETag-cached)."""
+    return await _offload_curve(request, req, _compute_hours_curve)
+
+
+def _compute_hours_curve(req: HoursCurveRequest):
+    rules = get_rules(req.tax_year)
+    if rules is None:
+        return {"error": f"Unsupported tax year: {req.tax_year}"}
+    if req.kommune not in rules.kommuner:
         return {"error": f"Unknown kommune: {req.kommune}"}
-    rates = KOMMUNER[req.kommune]
-    data = []
-    for h in range(0, req.max_hours + 1, 5):
-        gross_annual = req.hourly_rate * h * 12
-        r = compute_tax(
-            gross_annual, req.pension_pct / 100,
+    rates = rules.kommuner[req.kommune]
+    # Check the size before building the grid
+    stepped = range(req.min_hours, req.max_hours + 1, req.step)
+    error = _grid_limit_error(req.points if req.points > 0 else len(stepped), req.format)
+    if error:
+        return error
+    hours = np.linspace(req.min_hours, req.max_hours, req.points).tolist() if req.points > 0 else stepped
+    if req.refine:
+        hours = sorted({*hours, *_hours_curve_kinks(req, rules, rates)})
+
+    def rows(hours_chunk: list[int]) -> list[dict]:
+        r = compute_tax_batch(
+            [req.hourly_rate * h * 12 for h in hours_chunk], req.pension_pct / 100,
             rates["kommuneskat"], rates["kirkeskat"],
             req.is_church,
             employer_pension_pct=req.employer_pension_pct / 100,
@@ -247,29 +809,73 @@ def compute_hours_curve(req: HoursCurveRequest):
             transport_km=req.transport_km,
             union_fees_annual=req.union_fees_annual,
             pension_type=req.pension_type,
+            rules=rules,
         )
-        data.append({
-            "hours_month": h,
-            "gross_monthly": round(gross_annual / 12),
-            "net_monthly": round(r["net_monthly"]),
-            "ferie_net_monthly": round(r["net_ferie_monthly"]),
-            "effective_rate": round(r["effective_tax_rate"], 2),
-        })
-    return data
+        return [
+            {
+                "hours_month": h if isinstance(h, int) else round(h, 2),
+                "gross_monthly": round(gross / 12),
+                "net_monthly": round(net),
+                "ferie_net_monthly": round(ferie),
+                "effective_rate": round(rate, 2),
+            }
+            for h, gross, net, ferie, rate in zip(
+                hours_chunk, r["gross_annual"].tolist(), r["net_monthly"].tolist(),
+                r["net_ferie_monthly"].tolist(), r["effective_tax_rate"].tolist(),
+            )
+        ]
+
+    return _curve_response(req.format, map(rows, _chunked(hours)))
+
+
+def _hours_curve_kinks(req: HoursCurveRequest, rules: TaxRules, rates: Mapping) -> list[float]:
+    """Hours in (min_hours, max_hours) where the net-vs-hours slope changes."""
+    if req.hourly_rate <= 0:
+        return []
+    schedule = get_schedule(
+        kommune_pct=rates["kommuneskat"],
+        kirke_pct=rates["kirkeskat"],
+        is_church=req.is_church,
+        pension_pct=req.pension_pct / 100,
+        pension_type=req.pension_type,
+        employer_pension_pct=req.employer_pension_pct / 100,
+        atp_monthly=req.atp_monthly,
+        is_hourly=True,
+        taxable_benefits_annual=req.taxable_benefits_monthly * 12,
+        other_pay_annual=req.other_pay_monthly * 12,
+        pretax_deductions_annual=req.pretax_deductions_monthly * 12,
+        aftertax_deductions_annual=req.aftertax_deductions_monthly * 12,
+        transport_km=req.transport_km,
+        union_fees_annual=req.union_fees_annual,
+        rules=rules,
+    )
+    per_hour = req.hourly_rate * 12
+    return [g / per_hour for g in schedule.breakpoints
+            if req.min_hours < g / per_hour < req.max_hours]
 
 
 @router.post("/compute/student-hours-curve")
-def compute_student_hours_curve(req: StudentHoursCurveRequest):
-    """Return net-vs-hours curve data for student (SU + work) charts."""
-    if req.kommune not in KOMMUNER:
+async def compute_student_hours_curve(req: StudentHoursCurveRequest, request: Request):
+    """Return net-vs-hours curve data for student (SU + work) charts (ETag-cached)."""
+    return await _offload_curve(request, req, _compute_student_hours_curve)
+
+
+def _compute_student_hours_curve(req: StudentHoursCurveRequest):
+    rules = get_rules(req.tax_year)
+    if rules is None:
+        return {"error": f"Unsupported tax year: {req.tax_year}"}
+    if req.kommune not in rules.kommuner:
         return {"error": f"Unknown kommune: {req.kommune}"}
-    rates = KOMMUNER[req.kommune]
-    data = []
-    for h in range(0, req.max_hours + 1, req.step):
-        work_gross_monthly = req.hourly_rate * h
-        r = compute_student_income(
+    rates = rules.kommuner[req.kommune]
+    hours = range(0, req.max_hours + 1, req.step)
+    error = _grid_limit_error(len(hours), req.format)
+    if error:
+        return error
+
+    def rows(hours_chunk: list[int]) -> list[dict]:
+        r = compute_student_income_batch(
             su_monthly=req.su_monthly,
-            work_gross_monthly=work_gross_monthly,
+            work_gross_monthly=[req.hourly_rate * h for h in hours_chunk],
             pension_pct=req.pension_pct / 100,
             kommune_pct=rates["kommuneskat"],
             kirke_pct=rates["kirkeskat"],
@@ -277,15 +883,72 @@ def compute_student_hours_curve(req: StudentHoursCurveRequest):
             employer_pension_pct=req.employer_pension_pct / 100,
             aars_fribeloeb=req.aars_fribeloeb,
             pension_type=req.pension_type,
+            rules=rules,
         )
-        data.append({
-            "hours_month": h,
-            "net_monthly": round(r["net_monthly"]),
-            "net_annual": round(r["net_annual"]),
-            "su_gross_monthly": round(r["su_annual_gross"] / 12),
-            "work_gross_monthly": round(work_gross_monthly),
-            "feriepenge_monthly": round(r["work_feriepenge"] / 12),
-            "deductions_monthly": round(r["total_deductions"] / 12),
-            "over_fribeloeb": r["over_fribeloeb"],
-        })
-    return data
+        col = {key: r[key].tolist() for key in (
+            "net_monthly", "net_annual", "su_annual_gross", "work_gross_monthly",
+            "work_feriepenge", "total_deductions", "over_fribeloeb",
+        )}
+        return [
+            {
+                "hours_month": h,
+                "net_monthly": round(col["net_monthly"][i]),
+                "net_annual": round(col["net_annual"][i]),
+                "su_gross_monthly": round(col["su_annual_gross"][i] / 12),
+                "work_gross_monthly": round(col["work_gross_monthly"][i]),
+                "feriepenge_monthly": round(col["work_feriepenge"][i] / 12),
+                "deductions_monthly": round(col["total_deductions"][i] / 12),
+                "over_fribeloeb": col["over_fribeloeb"][i],
+            }
+            for i, h in enumerate(hours_chunk)
+        ]
+
+    return _curve_response(req.format, map(rows, _chunked(hours)))
+
+
+# ── Precomputed default curves ───────────────────────────────────────
+#
+# Pinned entries are never evicted, so only bodies the frontend really
+# sends are precomputed: the landing-page chart, and the charts Results.tsx
+# requests after a default Wizard run (one set per kommune).
+
+# The landing-page chart (frontend QuickOverview.tsx STANDARD)
+QUICK_OVERVIEW_CURVE = CurveRequest(
+    pension_pct=4, employer_pension_pct=8, atp_monthly=99,
+    max_gross=1_680_000, step_monthly=500,
+)
+
+# Wizard.tsx defaults: 180 kr/h for 80 h/month (≈ 18.5 h/week, C-sats ATP),
+# 4 % / 8 % standard pension, no church tax, no extras
+DEFAULT_HOURLY_RATE = 180.0
+_WIZARD_ATP_FULLTIME = ATP_MONTHLY
+_WIZARD_ATP_PARTTIME = ATP_MONTHLY_PARTTIME["18-26"]
+_WIZARD_CHART = dict(pension_pct=4, employer_pension_pct=8, pension_type="standard", is_church=False)
+
+
+def default_chart_requests(kommune: str) -> list[tuple[str, BaseModel, Callable]]:
+    """``(path, request, compute)`` for the charts Results.tsx fetches after a
+    default full-time or part-time Wizard run in *kommune*."""
+    curve = dict(kommune=kommune, max_gross=1_680_000, step_monthly=500, **_WIZARD_CHART)
+    return [
+        (f"{router.prefix}/compute/curve",
+         CurveRequest(is_hourly=False, atp_monthly=_WIZARD_ATP_FULLTIME, **curve), _compute_curve),
+        (f"{router.prefix}/compute/curve",
+         CurveRequest(is_hourly=True, atp_monthly=_WIZARD_ATP_PARTTIME, **curve), _compute_curve),
+        (f"{router.prefix}/compute/hours-curve",
+         HoursCurveRequest(hourly_rate=DEFAULT_HOURLY_RATE, kommune=kommune, max_hours=220,
+                           atp_monthly=_WIZARD_ATP_PARTTIME, **_WIZARD_CHART),
+         _compute_hours_curve),
+    ]
+
+
+def precompute_default_curves(rules: TaxRules | None = None) -> int:
+    """Pin the landing-page curve and every kommune's default Wizard charts
+    in the response cache. Returns the number pinned."""
+    rules = rules or get_rules()
+    jobs = [(f"{router.prefix}/compute/curve", QUICK_OVERVIEW_CURVE, _compute_curve)]
+    for kommune in rules.kommuner:
+        jobs += default_chart_requests(kommune)
+    for path, req, compute in jobs:
+        curve_cache.pin(path, req, compute(req))
+    return len(jobs)
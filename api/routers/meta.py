@@ -22,6 +22,9 @@ from ..data import (
     FERIETILLAEG_RATE, FERIEPENGE_RATE,
     ATP_MONTHLY, ATP_MONTHLY_PARTTIME,
 )
+from ..engine_cache import engine_cache_stats
+from ..executor import compute_workers
+from ..rules import TAX_RULES
 
 router = APIRouter(prefix="/api")
 
@@ -35,6 +38,7 @@ def get_meta():
     """Return tax year, kommune list, constants, and fallback exchange rate."""
     return {
         "tax_year": TAX_YEAR,
+        "tax_years": sorted(TAX_RULES),
         "dkk_per_eur": DKK_PER_EUR,
         "kommuner": {
             name: {
@@ -97,6 +101,21 @@ def get_meta():
     }
 
 
+@router.get("/meta/engine-cache")
+def get_engine_cache_stats():
+    """Hit/miss counters of the opt-in engine memoization layer.
+
+    Each compute worker process has its own cache, so the counters only
+    cover calls served in this (the main) process; ``scope`` and
+    ``compute_workers`` say so in the response.
+    """
+    return {
+        **engine_cache_stats(),
+        "scope": "main process",
+        "compute_workers": compute_workers(),
+    }
+
+
 # ═══════════════════════════════════════════════════════════════════════
 #  EXCHANGE RATES (cached 1 hour)
 # ═══════════════════════════════════════════════════════════════════════
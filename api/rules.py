@@ -0,0 +1,134 @@
+"""
+Versioned, immutable tax rulesets.
+
+``data.py`` holds the published constants for one tax year as module
+globals. This module freezes them into a ``TaxRules`` object per year that
+is passed explicitly to the engine, so several years (or an indexed
+next-year projection) can be served from one process, and compiled caches
+(schedules, memoized results) can key on the ruleset.
+
+Add a year by building another ``TaxRules`` and registering it in
+``TAX_RULES``.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field, replace
+from types import MappingProxyType
+from typing import Mapping
+
+from . import data
+
+
+# Kr amounts that are indexed (reguleret) from year to year; rates and the
+# km thresholds of befordringsfradrag stay fixed.
+INDEXED_FIELDS = (
+    "personfradrag",
+    "mellemskat_threshold",
+    "topskat_threshold",
+    "toptopskat_threshold",
+    "beskaeft_max",
+    "job_fradrag_threshold",
+    "job_fradrag_max",
+    "fribeloeb_laveste_vid",
+    "fagforening_max",
+)
+
+
+@dataclass(frozen=True, slots=True)
+class TaxRules:
+    """All rates, thresholds and caps the engine needs for one tax year.
+
+    Amounts are kr/year unless noted. The kommune table is excluded from
+    equality and hashing: the engine receives kommune rates as arguments,
+    so caches only depend on the national rules (and ``year``).
+    """
+
+    year: int
+    am_rate: float
+    personfradrag: float
+    bundskat_rate: float
+    mellemskat_threshold: float
+    mellemskat_rate: float
+    topskat_threshold: float
+    topskat_rate: float
+    toptopskat_threshold: float
+    toptopskat_rate: float
+    skatteloft: float
+    beskaeft_rate: float
+    beskaeft_max: float
+    job_fradrag_threshold: float
+    job_fradrag_rate: float
+    job_fradrag_max: float
+    fribeloeb_laveste_vid: float        # kr/month
+    su_repayment_interest_rate: float
+    ferietillaeg_rate: float
+    feriepenge_rate: float
+    befordring_rate_low: float          # kr/km
+    befordring_rate_high: float         # kr/km
+    befordring_threshold: float         # km/day
+    befordring_high_threshold: float    # km/day
+    fagforening_max: float
+    kommuner: Mapping[str, Mapping[str, float]] = field(
+        default_factory=dict, compare=False, hash=False, repr=False)
+
+    def replace(self, **changes) -> TaxRules:
+        """Copy with some rules changed (e.g. for what-if or indexed years)."""
+        return replace(self, **changes)
+
+    def indexed(self, factors) -> TaxRules:
+        """Copy with the thresholds and caps in ``INDEXED_FIELDS`` scaled by *factors*.
+
+        *factors* may be an array (one per projection year, say); the copy
+        then holds arrays that ``compute_tax_batch`` broadcasts against its
+        inputs, so every year is computed in the same batch. Such a ruleset
+        is for the batch engine only: it is not hashable and must not reach
+        the scalar engine or its caches.
+        """
+        return replace(self, **{name: getattr(self, name) * factors for name in INDEXED_FIELDS})
+
+
+def _freeze_kommuner(table: dict[str, dict[str, float]]) -> Mapping[str, Mapping[str, float]]:
+    return MappingProxyType({name: MappingProxyType(dict(rates)) for name, rates in table.items()})
+
+
+RULES_2026 = TaxRules(
+    year=2026,
+    am_rate=data.AM_RATE,
+    personfradrag=data.PERSONFRADRAG,
+    bundskat_rate=data.BUNDSKAT_RATE,
+    mellemskat_threshold=data.MELLEMSKAT_THRESHOLD,
+    mellemskat_rate=data.MELLEMSKAT_RATE,
+    topskat_threshold=data.TOPSKAT_THRESHOLD,
+    topskat_rate=data.TOPSKAT_RATE,
+    toptopskat_threshold=data.TOPTOPSKAT_THRESHOLD,
+    toptopskat_rate=data.TOPTOPSKAT_RATE,
+    skatteloft=data.SKATTELOFT,
+    beskaeft_rate=data.BESKAEFT_RATE,
+    beskaeft_max=data.BESKAEFT_MAX,
+    job_fradrag_threshold=data.JOB_FRADRAG_THRESHOLD,
+    job_fradrag_rate=data.JOB_FRADRAG_RATE,
+    job_fradrag_max=data.JOB_FRADRAG_MAX,
+    fribeloeb_laveste_vid=data.FRIBELOEB_LAVESTE_VID,
+    su_repayment_interest_rate=data.SU_REPAYMENT_INTEREST_RATE,
+    ferietillaeg_rate=data.FERIETILLAEG_RATE,
+    feriepenge_rate=data.FERIEPENGE_RATE,
+    befordring_rate_low=data.BEFORDRING_RATE_LOW,
+    befordring_rate_high=data.BEFORDRING_RATE_HIGH,
+    befordring_threshold=data.BEFORDRING_THRESHOLD,
+    befordring_high_threshold=data.BEFORDRING_HIGH_THRESHOLD,
+    fagforening_max=data.FAGFORENING_MAX,
+    kommuner=_freeze_kommuner(data.KOMMUNER),
+)
+
+# Registry of supported years (loaded once at import).
+TAX_RULES: Mapping[int, TaxRules] = MappingProxyType({
+    RULES_2026.year: RULES_2026,
+})
+
+DEFAULT_RULES = TAX_RULES[data.TAX_YEAR]
+
+
+def get_rules(year: int | None = None) -> TaxRules | None:
+    """Ruleset for *year* (default: the current tax year), or None if unsupported."""
+    return TAX_RULES.get(data.TAX_YEAR if year is None else year)
@@ -1,16 +1,23 @@
 """
 Reusable salary-scenario calculations for comparisons and projections.
 
-The functions in this module deliberately wrap ``compute_tax`` instead of
-reimplementing salary math. That keeps wizard results, comparisons, and
-projections aligned.
+The functions in this module deliberately wrap ``compute_tax`` (through the
+opt-in engine cache) and ``compute_tax_batch`` instead of reimplementing
+salary math. That keeps wizard results, comparisons, and projections
+aligned.
 """
 
 from __future__ import annotations
 
-from .data import KOMMUNER
-from .models import EmployeeScenarioRequest, ProjectionSettings
-from .tax_engine import compute_tax
+from functools import partial
+
+import numpy as np
+
+from .models import EmployeeScenarioRequest, MonteCarloSettings, OptimizerSettings, ProjectionSettings
+from .rules import TaxRules, get_rules
+from .engine_cache import cached_compute_tax
+from .tax_engine import TaxResult, compute_befordringsfradrag, compute_tax_batch
+from .tax_schedule import income_kinks
 
 
 def scenario_gross_annual(scenario: EmployeeScenarioRequest) -> float:
@@ -20,12 +27,15 @@ def scenario_gross_annual(scenario: EmployeeScenarioRequest) -> float:
 
 
 def compute_employee_scenario(scenario: EmployeeScenarioRequest) -> dict:
-    if scenario.kommune not in KOMMUNER:
+    rules = get_rules(scenario.tax_year)
+    if rules is None:
+        return {"error": f"Unsupported tax year: {scenario.tax_year}"}
+    if scenario.kommune not in rules.kommuner:
         return {"error": f"Unknown kommune: {scenario.kommune}"}
 
-    rates = KOMMUNER[scenario.kommune]
+    rates = rules.kommuner[scenario.kommune]
     gross_annual = scenario_gross_annual(scenario)
-    result = compute_tax(
+    result = cached_compute_tax(
         gross_annual=gross_annual,
         pension_pct=scenario.pension_pct / 100,
         kommune_pct=rates["kommuneskat"],
@@ -42,7 +52,12 @@ def compute_employee_scenario(scenario: EmployeeScenarioRequest) -> dict:
         transport_km=scenario.transport_km,
         union_fees_annual=scenario.union_fees_annual,
         pension_type=scenario.pension_type,
+        rules=rules,
     )
+    return _scenario_response(scenario, rates, result.as_dict())
+
+
+def _scenario_response(scenario: EmployeeScenarioRequest, rates, breakdown: dict) -> dict:
     return {
         "employment_type": scenario.employment_type,
         "kommune": scenario.kommune,
@@ -50,7 +65,7 @@ def compute_employee_scenario(scenario: EmployeeScenarioRequest) -> dict:
         "kirke_pct": rates["kirkeskat"],
         "hourly_rate": scenario.hourly_rate,
         "hours_month": scenario.hours_month,
-        **result,
+        **breakdown,
     }
 
 
@@ -77,57 +92,486 @@ def comparison_delta(a: dict, b: dict) -> dict:
     }
 
 
+def projection_delta(a: dict, b: dict) -> dict:
+    return {key: b["totals"][key] - a["totals"][key] for key in a["totals"]}
+
+
+def _grown_gross(scenario: EmployeeScenarioRequest, factors: np.ndarray) -> np.ndarray:
+    """Gross pay with salary growth *factors* (part-time: the hourly rate grows)."""
+    if scenario.employment_type == "parttime":
+        return (scenario.hourly_rate or 0.0) * factors * (scenario.hours_month or 0.0) * 12
+    return (scenario.gross_annual or 0.0) * factors
+
+
+def _yearly_factors(pct: float, years: int) -> np.ndarray:
+    growth = pct / 100
+    return np.array([(1 + growth) ** year for year in range(years)])
+
+
+def _projection_rules(rules: TaxRules, settings: ProjectionSettings) -> TaxRules:
+    """*rules* with thresholds indexed per projection year (if requested).
+
+    Only the indexed thresholds and caps become per-year arrays; rates and
+    everything derived from them are computed once for the whole batch.
+    """
+    if not settings.threshold_indexation_pct:
+        return rules
+    return rules.indexed(_yearly_factors(settings.threshold_indexation_pct, settings.years))
+
+
+def _scenario_tax_batch(scenario: EmployeeScenarioRequest, gross, rules: TaxRules, rates, **overrides) -> dict:
+    """``compute_tax_batch`` for *scenario*; *overrides* replace its arguments (e.g. lever arrays)."""
+    kwargs = dict(
+        gross_annual=gross,
+        pension_pct=scenario.pension_pct / 100,
+        kommune_pct=rates["kommuneskat"],
+        kirke_pct=rates["kirkeskat"],
+        is_church=scenario.is_church,
+        has_employment_income=True,
+        employer_pension_pct=scenario.employer_pension_pct / 100,
+        is_hourly=scenario.employment_type == "parttime",
+        taxable_benefits_annual=scenario.taxable_benefits_monthly * 12,
+        other_pay_annual=scenario.other_pay_monthly * 12,
+        pretax_deductions_annual=scenario.pretax_deductions_monthly * 12,
+        aftertax_deductions_annual=scenario.aftertax_deductions_monthly * 12,
+        atp_monthly=scenario.atp_monthly,
+        transport_km=scenario.transport_km,
+        union_fees_annual=scenario.union_fees_annual,
+        pension_type=scenario.pension_type,
+        rules=rules,
+    )
+    kwargs.update(overrides)
+    return compute_tax_batch(**kwargs)
+
+
+def _scenarios_tax_batch(entries: list[tuple[EmployeeScenarioRequest, np.ndarray]], rules: TaxRules) -> dict:
+    """One ``compute_tax_batch`` over several scenarios, each at its growth *factors*."""
+    scenarios = [scenario for scenario, _ in entries]
+    counts = [len(factors) for _, factors in entries]
+    rates = [rules.kommuner[scenario.kommune] for scenario in scenarios]
+
+    def col(values):
+        return np.repeat(values, counts)
+
+    def field(name):
+        return col(np.array([getattr(scenario, name) for scenario in scenarios], dtype=float))
+
+    return compute_tax_batch(
+        gross_annual=np.concatenate([_grown_gross(scenario, factors) for scenario, factors in entries]),
+        pension_pct=field("pension_pct") / 100,
+        kommune_pct=col([rate["kommuneskat"] for rate in rates]),
+        kirke_pct=col([rate["kirkeskat"] for rate in rates]),
+        is_church=col([scenario.is_church for scenario in scenarios]),
+        has_employment_income=True,
+        employer_pension_pct=field("employer_pension_pct") / 100,
+        is_hourly=col([scenario.employment_type == "parttime" for scenario in scenarios]),
+        taxable_benefits_annual=field("taxable_benefits_monthly") * 12,
+        other_pay_annual=field("other_pay_monthly") * 12,
+        pretax_deductions_annual=field("pretax_deductions_monthly") * 12,
+        aftertax_deductions_annual=field("aftertax_deductions_monthly") * 12,
+        atp_monthly=field("atp_monthly"),
+        transport_km=field("transport_km"),
+        union_fees_annual=field("union_fees_annual"),
+        pension_type=col([scenario.pension_type for scenario in scenarios]),
+        rules=rules,
+    )
+
+
+def compound_balance(contributions: np.ndarray, rate: float) -> np.ndarray:
+    """Year-end balances ``b[y] = b[y-1] * (1 + rate) + contributions[y]``.
+
+    A plain recurrence (at most 50 steps): unlike a cumulative-product
+    closed form it stays finite for returns at or near -100 %.
+    """
+    factor = 1 + rate
+    balance = np.empty(len(contributions))
+    running = 0.0
+    for year, contribution in enumerate(contributions.tolist()):
+        running = running * factor + contribution
+        balance[year] = running
+    return balance
+
+
 def project_employee_scenario(
     scenario: EmployeeScenarioRequest,
     settings: ProjectionSettings,
 ) -> dict:
-    growth = settings.salary_growth_pct / 100
-    return_rate = settings.annual_return_pct / 100
-    base_gross = scenario_gross_annual(scenario)
-    balance = 0.0
-    rows = []
-
-    for year in range(1, settings.years + 1):
-        projected = scenario.model_copy(
-            update={"gross_annual": base_gross * ((1 + growth) ** (year - 1))}
-        )
-        if projected.employment_type == "parttime" and scenario.hours_month:
-            projected = projected.model_copy(
-                update={"hourly_rate": (scenario.hourly_rate or 0.0) * ((1 + growth) ** (year - 1))}
-            )
-        result = compute_employee_scenario(projected)
-        if "error" in result:
-            return result
-
-        employee_pension = result["employee_pension"]
-        employer_pension = result["employer_pension"]
-        total_pension = result["total_pension"]
-        balance = balance * (1 + return_rate) + total_pension
-        total_comp = compensation_annual(result)
-
-        rows.append({
-            "year": year,
-            "gross_annual": result["gross_annual"],
-            "net_annual": result["net_annual"],
-            "net_monthly": result["net_monthly"],
-            "tax": result["am_bidrag"] + result["total_income_tax"],
-            "employee_pension": employee_pension,
-            "employer_pension": employer_pension,
-            "total_pension": total_pension,
-            "total_compensation": total_comp,
-            "projected_pension_balance": balance,
-        })
+    """Year-by-year projection with salary growth, in one batched tax pass.
+
+    Salary grows by ``salary_growth_pct`` a year (part-time: the hourly
+    rate grows, hours stay fixed); the pension balance earns
+    ``annual_return_pct`` on last year's balance plus this year's payments.
+    With ``threshold_indexation_pct`` the thresholds and caps grow too
+    (``TaxRules.indexed``), still in the same single batch.
+    """
+    rules = get_rules(scenario.tax_year)
+    if rules is None:
+        return {"error": f"Unsupported tax year: {scenario.tax_year}"}
+    if scenario.kommune not in rules.kommuner:
+        return {"error": f"Unknown kommune: {scenario.kommune}"}
+
+    rates = rules.kommuner[scenario.kommune]
+    factors = _yearly_factors(settings.salary_growth_pct, settings.years)
+    gross = _grown_gross(scenario, factors)
+    r = _scenario_tax_batch(scenario, gross, _projection_rules(rules, settings), rates)
+    return _projection_response(settings, r)
+
+
+def _projection_response(settings: ProjectionSettings, r: dict) -> dict:
+    balance = compound_balance(r["total_pension"], settings.annual_return_pct / 100)
+    columns = {
+        "year": list(range(1, settings.years + 1)),
+        "gross_annual": r["gross_annual"].tolist(),
+        "net_annual": r["net_annual"].tolist(),
+        "net_monthly": r["net_monthly"].tolist(),
+        "tax": (r["am_bidrag"] + r["total_income_tax"]).tolist(),
+        "employee_pension": r["employee_pension"].tolist(),
+        "employer_pension": r["employer_pension"].tolist(),
+        "total_pension": r["total_pension"].tolist(),
+        "total_compensation": (r["total_gross"] + r["employer_pension"]
+                               - r["taxable_employer_pension"]).tolist(),
+        "projected_pension_balance": balance.tolist(),
+    }
+    rows = [dict(zip(columns, values)) for values in zip(*columns.values())]
 
     return {
         "settings": settings.model_dump(),
         "years": rows,
         "totals": {
-            "employee_pension": sum(row["employee_pension"] for row in rows),
-            "employer_pension": sum(row["employer_pension"] for row in rows),
-            "total_pension": sum(row["total_pension"] for row in rows),
-            "net_annual": sum(row["net_annual"] for row in rows),
-            "tax": sum(row["tax"] for row in rows),
-            "total_compensation": sum(row["total_compensation"] for row in rows),
-            "projected_pension_balance": balance,
+            **{key: sum(columns[key]) for key in (
+                "employee_pension", "employer_pension", "total_pension",
+                "net_annual", "tax", "total_compensation",
+            )},
+            "projected_pension_balance": columns["projected_pension_balance"][-1],
         },
     }
+
+
+# Percentile bands reported by the Monte Carlo projection
+PROJECTION_PERCENTILES = (5, 50, 95)
+PROJECTION_BAND_FIELDS = (
+    "gross_annual",
+    "net_annual",
+    "net_monthly",
+    "tax",
+    "total_pension",
+    "projected_pension_balance",
+)
+# Paths per batched tax pass; bounds the engine's intermediates to a few MB
+MONTE_CARLO_CHUNK_PATHS = 1_000
+
+
+def simulate_employee_projection(
+    scenario: EmployeeScenarioRequest,
+    settings: ProjectionSettings,
+    monte_carlo: MonteCarloSettings,
+) -> dict:
+    """Stochastic projection: p5/p50/p95 bands per year over simulated paths.
+
+    Each path draws yearly salary growth and pension return from normal
+    distributions around ``settings`` (floored at -100 %) with a seeded
+    generator. Paths go through the batched tax engine
+    ``MONTE_CARLO_CHUNK_PATHS`` at a time (all years in one pass) and only
+    the band fields are kept, so memory stays flat as ``paths`` grows; the
+    balance recurrence loops over years on whole path vectors.
+    """
+    rules = get_rules(scenario.tax_year)
+    if rules is None:
+        return {"error": f"Unsupported tax year: {scenario.tax_year}"}
+    if scenario.kommune not in rules.kommuner:
+        return {"error": f"Unknown kommune: {scenario.kommune}"}
+
+    rates = rules.kommuner[scenario.kommune]
+    paths, years = monte_carlo.paths, settings.years
+    rng = np.random.default_rng(monte_carlo.seed)
+    growth = rng.normal(settings.salary_growth_pct, monte_carlo.salary_growth_volatility_pct,
+                        (paths, years - 1)) / 100
+    returns = rng.normal(settings.annual_return_pct, monte_carlo.return_volatility_pct,
+                         (paths, years)) / 100
+    projection_rules = _projection_rules(rules, settings)
+
+    # Only the band fields are kept for all paths; the batch engine's
+    # intermediates live for one chunk at a time
+    values = {key: np.empty((paths, years)) for key in PROJECTION_BAND_FIELDS}
+    for start in range(0, paths, MONTE_CARLO_CHUNK_PATHS):
+        chunk = slice(start, min(start + MONTE_CARLO_CHUNK_PATHS, paths))
+        n = chunk.stop - chunk.start
+
+        # Year 1 is today's salary; growth compounds from year 2 on
+        factors = np.ones((n, years))
+        np.cumprod(1 + np.maximum(growth[chunk], -1), axis=1, out=factors[:, 1:])
+        gross = _grown_gross(scenario, factors)
+        # Indexed thresholds are per year and broadcast over the paths
+        r = _scenario_tax_batch(scenario, gross, projection_rules, rates)
+
+        contributions = r["total_pension"]
+        growth_of_balance = 1 + np.maximum(returns[chunk], -1)
+        balance = values["projected_pension_balance"][chunk]
+        running = np.zeros(n)
+        for year in range(years):
+            running = running * growth_of_balance[:, year] + contributions[:, year]
+            balance[:, year] = running
+
+        values["gross_annual"][chunk] = r["gross_annual"]
+        values["net_annual"][chunk] = r["net_annual"]
+        values["net_monthly"][chunk] = r["net_monthly"]
+        np.add(r["am_bidrag"], r["total_income_tax"], out=values["tax"][chunk])
+        values["total_pension"][chunk] = contributions
+
+    bands = {
+        key: np.percentile(values[key], PROJECTION_PERCENTILES, axis=0).tolist()
+        for key in PROJECTION_BAND_FIELDS
+    }
+    rows = [
+        {
+            "year": year + 1,
+            **{
+                key: {f"p{p}": bands[key][i][year] for i, p in enumerate(PROJECTION_PERCENTILES)}
+                for key in PROJECTION_BAND_FIELDS
+            },
+        }
+        for year in range(years)
+    ]
+    return {
+        "settings": settings.model_dump(),
+        "monte_carlo": monte_carlo.model_dump(),
+        "percentiles": list(PROJECTION_PERCENTILES),
+        "years": rows,
+        "final_balance": rows[-1]["projected_pension_balance"],
+    }
+
+
+def compare_employee_scenarios(
+    scenarios: list[EmployeeScenarioRequest],
+    projections: list[ProjectionSettings | None],
+    baseline: int = 0,
+) -> dict:
+    """N-way comparison with ``comparison_delta`` against ``scenarios[baseline]``.
+
+    Identical scenarios, and identical scenario + projection settings
+    pairs, are computed once. Every unique scenario and every year of every
+    unique projection that share a ruleset go through one
+    ``compute_tax_batch`` call. Results agree with
+    ``compute_employee_scenario`` and ``project_employee_scenario`` up to
+    floating-point rounding (the batch engine sums in a different order).
+    """
+    scenario_keys = [scenario.model_dump_json() for scenario in scenarios]
+    projection_keys = [
+        None if settings is None else (key, settings.model_dump_json())
+        for key, settings in zip(scenario_keys, projections)
+    ]
+    unique = dict(zip(scenario_keys, scenarios))
+    unique_projections = {
+        key: settings for key, settings in zip(projection_keys, projections) if key is not None
+    }
+
+    # rules.year -> (rules, [(key, scenario, growth factors, projection settings)])
+    groups: dict = {}
+    years: dict[str, int] = {}
+    for key, scenario in unique.items():
+        rules = get_rules(scenario.tax_year)
+        if rules is None:
+            return {"error": f"Unsupported tax year: {scenario.tax_year}"}
+        if scenario.kommune not in rules.kommuner:
+            return {"error": f"Unknown kommune: {scenario.kommune}"}
+        years[key] = rules.year
+        groups.setdefault(rules.year, (rules, []))[1].append((key, scenario, np.ones(1), None))
+    for key, settings in unique_projections.items():
+        factors = _yearly_factors(settings.salary_growth_pct, settings.years)
+        groups[years[key[0]]][1].append((key, unique[key[0]], factors, settings))
+
+    results: dict = {}
+    projected: dict = {}
+    for rules, entries in groups.values():
+        batch_rules = rules
+        if any(settings is not None and settings.threshold_indexation_pct for *_, settings in entries):
+            batch_rules = rules.indexed(np.concatenate([
+                np.ones(len(factors)) if settings is None
+                else _yearly_factors(settings.threshold_indexation_pct, settings.years)
+                for _, _, factors, settings in entries
+            ]))
+        r = _scenarios_tax_batch([(scenario, factors) for _, scenario, factors, _ in entries], batch_rules)
+        start = 0
+        for key, scenario, factors, settings in entries:
+            stop = start + len(factors)
+            part = {name: column[start:stop] for name, column in r.items()}
+            if settings is None:
+                breakdown = {
+                    name: scenario.pension_type if name == "pension_type" else part[name][0].item()
+                    for name in TaxResult._KEYS
+                }
+                results[key] = _scenario_response(scenario, rules.kommuner[scenario.kommune], breakdown)
+            else:
+                projected[key] = _projection_response(settings, part)
+            start = stop
+
+    rows = [results[key] for key in scenario_keys]
+    projection_rows = [None if key is None else projected[key] for key in projection_keys]
+    base, base_projection = rows[baseline], projection_rows[baseline]
+    return {
+        "baseline": baseline,
+        "scenarios": rows,
+        "deltas": [comparison_delta(base, row) for row in rows],
+        "projections": projection_rows,
+        "projection_deltas": [
+            None if base_projection is None or row is None else projection_delta(base_projection, row)
+            for row in projection_rows
+        ],
+        "unique_scenarios": len(unique),
+        "unique_projections": len(unique_projections),
+    }
+
+
+# Net income (kr/year) within this of the minimum counts as meeting it
+_NET_TOLERANCE = 1e-4
+
+
+def _lever_values(
+    scenario: EmployeeScenarioRequest,
+    rules: TaxRules,
+    rates,
+    objective: str,
+    pct,
+    benefit,
+    pension_type: str,
+) -> tuple[dict, np.ndarray]:
+    """Engine columns and objective for arrays of lever settings.
+
+    *pct* is the employee pension %, *benefit* the salary exchanged for
+    pre-tax benefits (kr/month, on top of the scenario's own deductions).
+    """
+    pct = np.asarray(pct, dtype=float)
+    benefit = np.asarray(benefit, dtype=float)
+    r = _scenario_tax_batch(
+        scenario, scenario_gross_annual(scenario), rules, rates,
+        pension_pct=pct / 100,
+        pretax_deductions_annual=(scenario.pretax_deductions_monthly + benefit) * 12,
+        pension_type=pension_type,
+    )
+    if objective == "total_pension":
+        return r, r["total_pension"]
+    return r, r["net_annual"] + r["total_pension"] + benefit * 12
+
+
+def _lever_vertices(evaluate, kinks: list[float], corners: list[tuple[float, float]], target: float) -> list:
+    """Every point where the optimum over the lever box can sit.
+
+    Net pay and the objective are affine in the levers except where income
+    after AM crosses one of *kinks*; those level lines are parallel and cut
+    the box into strips. Within a strip the problem is a linear program, so
+    its optimum is a corner of strip ∩ box ∩ {net ≥ target}: a box corner,
+    a kink line meeting an edge, or the net = target line meeting an edge
+    or a kink line. Three batched engine calls find them all.
+    """
+    xs = np.array(corners)
+    u = evaluate(xs[:, 0], xs[:, 1])[0]["income_after_am"]
+
+    edges = []
+    on_kink: dict[float, list] = {}
+    for i in range(len(xs)):
+        j = (i + 1) % len(xs)
+        points = [(0.0, xs[i]), (1.0, xs[j])]
+        if u[i] != u[j]:
+            for k in kinks:
+                t = (k - u[i]) / (u[j] - u[i])
+                if 0 <= t <= 1:
+                    point = xs[i] + t * (xs[j] - xs[i])
+                    on_kink.setdefault(k, []).append(point)
+                    if 0 < t < 1:
+                        points.append((t, point))
+        edges.append([point for _, point in sorted(points, key=lambda item: item[0])])
+
+    # Pieces along which net is affine: edge pieces, and each kink line across the box
+    segments = [(a, b) for points in edges for a, b in zip(points, points[1:])]
+    for points in on_kink.values():
+        points.sort(key=tuple)
+        segments.append((points[0], points[-1]))
+
+    vertices = [point for points in edges for point in points]
+    ends = np.array([end for segment in segments for end in segment])
+    net = evaluate(ends[:, 0], ends[:, 1])[0]["net_annual"].reshape(-1, 2) - target
+    for (a, b), (n0, n1) in zip(segments, net.tolist()):
+        if n0 * n1 < 0:
+            vertices.append(a + n0 / (n0 - n1) * (b - a))
+    return vertices
+
+
+def optimize_employee_scenario(scenario: EmployeeScenarioRequest, settings: OptimizerSettings) -> dict:
+    """Best employee pension %, pension type and benefit exchange for *settings*.
+
+    Each pension type is solved exactly on the engine's piecewise-linear
+    structure (``_lever_vertices``) instead of by grid search, so a request
+    costs a handful of small batched engine calls. The optimum is
+    recomputed with the scalar engine for the returned breakdown.
+    """
+    rules = get_rules(scenario.tax_year)
+    if rules is None:
+        return {"error": f"Unsupported tax year: {scenario.tax_year}"}
+    if scenario.kommune not in rules.kommuner:
+        return {"error": f"Unknown kommune: {scenario.kommune}"}
+    if settings.min_pension_pct > settings.max_pension_pct:
+        return {"error": "min_pension_pct must not exceed max_pension_pct"}
+
+    rates = rules.kommuner[scenario.kommune]
+    befordring = (compute_befordringsfradrag(scenario.transport_km, rules=rules)
+                  if scenario.transport_km > 0 else 0.0)
+    kinks = income_kinks(befordring + min(scenario.union_fees_annual, rules.fagforening_max), True, rules)
+    target = settings.min_net_monthly * 12
+    lo, hi, top = settings.min_pension_pct, settings.max_pension_pct, settings.max_benefit_monthly
+    corners = [(lo, 0.0), (hi, 0.0), (hi, top), (lo, top)]
+
+    def option(r, value, pct, benefit, i, pension_type) -> dict:
+        return {
+            "pension_type": pension_type,
+            "pension_pct": float(pct[i]),
+            "benefit_monthly": float(benefit[i]),
+            "objective_value": float(value[i]),
+            "net_monthly": float(r["net_monthly"][i]),
+        }
+
+    by_type: dict = {}
+    for pension_type in dict.fromkeys(settings.pension_types):
+        evaluate = partial(_lever_values, scenario, rules, rates, settings.objective,
+                           pension_type=pension_type)
+        pct, benefit = np.array(_lever_vertices(evaluate, kinks, corners, target)).T
+        r, value = evaluate(pct, benefit)
+        feasible = np.flatnonzero(r["net_annual"] >= target - _NET_TOLERANCE)
+        if len(feasible) == 0:
+            by_type[pension_type] = None
+            continue
+        best = max(feasible.tolist(), key=lambda i: (value[i], r["net_annual"][i]))
+        by_type[pension_type] = option(r, value, pct, benefit, best, pension_type)
+
+    candidates = [choice for choice in by_type.values() if choice is not None]
+    if not candidates:
+        return {"error": "Minimum net income is not reachable with these settings"}
+    optimum = max(candidates, key=lambda choice: choice["objective_value"])
+
+    binding = []
+    if settings.min_net_monthly > 0 and abs(optimum["net_monthly"] * 12 - target) <= _NET_TOLERANCE:
+        binding.append("min_net_monthly")
+    if optimum["pension_pct"] == hi:
+        binding.append("max_pension_pct")
+    elif optimum["pension_pct"] == lo:
+        binding.append("min_pension_pct")
+    if top > 0 and optimum["benefit_monthly"] == top:
+        binding.append("max_benefit_monthly")
+
+    pct, benefit = np.array([scenario.pension_pct]), np.zeros(1)
+    r, value = _lever_values(scenario, rules, rates, settings.objective, pct, benefit, scenario.pension_type)
+    current = option(r, value, pct, benefit, 0, scenario.pension_type)
+
+    result = compute_employee_scenario(scenario.model_copy(update={
+        "pension_pct": optimum["pension_pct"],
+        "pension_type": optimum["pension_type"],
+        "pretax_deductions_monthly": scenario.pretax_deductions_monthly + optimum["benefit_monthly"],
+    }))
+    return {
+        "settings": settings.model_dump(),
+        "optimum": optimum,
+        "binding_constraints": binding,
+        "current": current,
+        "gain_annual": optimum["objective_value"] - current["objective_value"],
+        "by_pension_type": by_type,
+        "result": result,
+    }
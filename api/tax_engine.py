@@ -1,9 +1,18 @@
 """
-Tax calculation engine for Denmark (2026).
+Tax calculation engine for Denmark.
 
-Two public functions:
+Public functions:
   • compute_tax()            — salary/wage earners (full-time or part-time)
   • compute_student_income() — student (SU + part-time work)
+  • compute_tax_batch()      — compute_tax() over NumPy arrays (curves, bulk)
+  • compute_student_income_batch() — compute_student_income() over arrays
+
+Scalar functions return slotted result objects (TaxResult,
+StudentIncomeResult) that read like the breakdown dict; call
+``as_dict()`` when the full breakdown is actually needed.
+
+Rates and thresholds come from a ``TaxRules`` ruleset (see rules.py),
+passed as ``rules=``; the default is the current tax year.
 
 ACCURACY NOTE (~±1.5%)
 ─────────────────────
@@ -36,48 +45,306 @@ actual net pay shown on a payslip.
 
 from __future__ import annotations
 
-from .data import (
-    AM_RATE,
-    PERSONFRADRAG,
-    BUNDSKAT_RATE,
-    MELLEMSKAT_THRESHOLD, MELLEMSKAT_RATE,
-    TOPSKAT_THRESHOLD,    TOPSKAT_RATE,
-    TOPTOPSKAT_THRESHOLD, TOPTOPSKAT_RATE,
-    SKATTELOFT,
-    BESKAEFT_RATE, BESKAEFT_MAX,
-    JOB_FRADRAG_THRESHOLD, JOB_FRADRAG_RATE, JOB_FRADRAG_MAX,
-    FRIBELOEB_LAVESTE_VID,
-    SU_REPAYMENT_INTEREST_RATE,
-    FERIETILLAEG_RATE, FERIEPENGE_RATE,
-    ATP_MONTHLY,
-    BEFORDRING_RATE_LOW, BEFORDRING_RATE_HIGH,
-    BEFORDRING_THRESHOLD, BEFORDRING_HIGH_THRESHOLD,
-    FAGFORENING_MAX,
-)
-
-
-def compute_befordringsfradrag(daily_km: float, work_days: int = 218) -> float:
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+
+import numpy as np
+
+from .rules import DEFAULT_RULES, TaxRules
+
+
+def compute_befordringsfradrag(
+    daily_km: float, work_days: int = 218, rules: TaxRules = DEFAULT_RULES,
+) -> float:
     """Compute annual transport deduction (befordringsfradrag).
 
     Parameters
     ----------
     daily_km    Round-trip distance home ↔ work in km.
     work_days   Working days per year (default 218 ≈ 52w × 5d − 30 holidays/sick).
+    rules       Tax-year ruleset (km thresholds and rates).
     """
-    if daily_km <= BEFORDRING_THRESHOLD:
+    if daily_km <= rules.befordring_threshold:
         return 0.0
-    deductible_km = daily_km - BEFORDRING_THRESHOLD
-    if daily_km <= BEFORDRING_HIGH_THRESHOLD:
-        return deductible_km * BEFORDRING_RATE_LOW * work_days
+    deductible_km = daily_km - rules.befordring_threshold
+    if daily_km <= rules.befordring_high_threshold:
+        return deductible_km * rules.befordring_rate_low * work_days
     # Split: 25–120 km at high rate, >120 km at low rate
-    km_at_low  = BEFORDRING_HIGH_THRESHOLD - BEFORDRING_THRESHOLD
-    km_at_high = daily_km - BEFORDRING_HIGH_THRESHOLD
-    return (km_at_low * BEFORDRING_RATE_LOW + km_at_high * BEFORDRING_RATE_HIGH) * work_days
+    km_at_low  = rules.befordring_high_threshold - rules.befordring_threshold
+    km_at_high = daily_km - rules.befordring_high_threshold
+    return (km_at_low * rules.befordring_rate_low + km_at_high * rules.befordring_rate_high) * work_days
+
+
+# ═══════════════════════════════════════════════════════════════════════
+#  RESULT OBJECTS
+# ═══════════════════════════════════════════════════════════════════════
+
+class _EngineResult(Mapping):
+    """Read-only mapping view over a slotted engine result.
+
+    Results are compact ``__slots__`` objects; callers that only need a few
+    figures read attributes (``r.net_monthly``) and nothing else is built.
+    ``as_dict()`` materializes the full breakdown for the single-calculation
+    endpoints, and ``r["key"]`` / ``**r`` keep working like the old dicts.
+    Treat results as immutable — memoized results are shared.
+    """
+
+    __slots__ = ()
+    _KEYS: tuple[str, ...] = ()
+
+    def __getitem__(self, key: str):
+        if key not in self._KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self):
+        return iter(self._KEYS)
+
+    def __len__(self) -> int:
+        return len(self._KEYS)
+
+    def as_dict(self, fields: Iterable[str] | None = None) -> dict:
+        """Full breakdown as a plain dict, or only *fields* if given."""
+        return {key: getattr(self, key) for key in (self._KEYS if fields is None else fields)}
+
+
+@dataclass(slots=True, eq=False)
+class TaxResult(_EngineResult):
+    """Result of compute_tax(); keys match the historical dict output."""
+
+    gross_annual: float
+    feriepenge: float
+    other_pay: float
+    pretax_deductions: float
+    aftertax_deductions: float
+    taxable_benefits: float
+    total_gross: float
+    taxable_income: float
+    pension_type: str
+    employee_pension: float
+    employer_pension: float
+    total_pension: float
+    taxable_employer_pension: float
+    am_bidrag: float
+    atp_annual: float
+    income_after_am: float
+    beskaeft_fradrag: float
+    job_fradrag: float
+    befordring: float
+    union_deduction: float
+    lignings_fradrag: float
+    bundskat: float
+    kommuneskat: float
+    kirkeskat: float
+    mellemskat: float
+    topskat: float
+    toptopskat: float
+    total_income_tax: float
+    total_deductions: float
+    net_annual: float
+    net_ferie: float
+
+    _KEYS = (
+        "gross_annual", "feriepenge", "other_pay", "pretax_deductions",
+        "aftertax_deductions", "taxable_benefits", "total_gross",
+        "taxable_income", "pension_type", "pension", "employee_pension",
+        "employer_pension", "total_pension", "taxable_employer_pension",
+        "am_bidrag", "atp_annual", "income_after_am", "beskaeft_fradrag",
+        "job_fradrag", "befordring", "union_deduction", "lignings_fradrag",
+        "bundskat", "kommuneskat", "kirkeskat", "mellemskat", "topskat",
+        "toptopskat", "total_income_tax", "total_deductions", "net_annual",
+        "net_monthly", "effective_tax_rate", "net_ferie", "net_ferie_monthly",
+    )
+
+    @property
+    def pension(self) -> float:
+        """Cash pension deduction (the employee share in both pension models)."""
+        return self.employee_pension
+
+    @property
+    def net_monthly(self) -> float:
+        return self.net_annual / 12
+
+    @property
+    def net_ferie_monthly(self) -> float:
+        return self.net_ferie / 12
+
+    @property
+    def effective_tax_rate(self) -> float:
+        if self.total_gross > 0:
+            return self.total_deductions / self.total_gross * 100
+        return 0
+
+
+@dataclass(slots=True, eq=False)
+class StudentIncomeResult(_EngineResult):
+    """Result of compute_student_income(); keys match the historical dict output."""
+
+    su_annual_gross: float
+    su_annual: float
+    su_monthly: float
+    su_repayment: float
+    su_repayment_interest: float
+    aars_fribeloeb: float
+    fribeloeb_excess: float
+    work_feriepenge: float
+    work_gross_annual: float
+    work_gross_monthly: float
+    pension_type: str
+    work_employee_pension: float
+    work_employer_pension: float
+    work_total_pension: float
+    work_taxable_employer_pension: float
+    work_taxable_income: float
+    work_am_bidrag: float
+    work_after_am: float
+    atp_annual: float
+    other_pay: float
+    pretax_deductions: float
+    aftertax_deductions: float
+    befordring: float
+    union_deduction: float
+    lignings_fradrag: float
+    total_personal: float
+    beskaeft_fradrag: float
+    job_fradrag: float
+    bundskat: float
+    kommuneskat: float
+    kirkeskat: float
+    mellemskat: float
+    total_income_tax: float
+    total_deductions: float
+    net_annual: float
+    net_ferie: float
+    fribeloeb_limit: float
+
+    _KEYS = (
+        "su_annual_gross", "su_annual", "su_monthly", "su_repayment",
+        "su_repayment_interest", "aars_fribeloeb", "fribeloeb_excess",
+        "work_feriepenge", "work_gross_annual", "work_gross_monthly",
+        "work_pension", "pension_type", "work_employee_pension",
+        "work_employer_pension", "work_total_pension",
+        "work_taxable_employer_pension", "work_taxable_income",
+        "work_am_bidrag", "work_after_am", "atp_annual", "other_pay",
+        "pretax_deductions", "aftertax_deductions", "befordring",
+        "union_deduction", "lignings_fradrag", "total_personal",
+        "beskaeft_fradrag", "job_fradrag", "bundskat", "kommuneskat",
+        "kirkeskat", "mellemskat", "total_income_tax", "total_deductions",
+        "net_annual", "net_monthly", "over_fribeloeb", "fribeloeb_limit",
+        "work_after_am_monthly", "net_ferie", "net_ferie_monthly",
+    )
+
+    @property
+    def work_pension(self) -> float:
+        """Cash pension deduction (the employee share in both pension models)."""
+        return self.work_employee_pension
+
+    @property
+    def net_monthly(self) -> float:
+        return self.net_annual / 12
+
+    @property
+    def over_fribeloeb(self) -> bool:
+        return self.fribeloeb_excess > 0
+
+    @property
+    def work_after_am_monthly(self) -> float:
+        return self.work_after_am / 12
+
+    @property
+    def net_ferie_monthly(self) -> float:
+        return self.net_ferie / 12
 
 
 # ═══════════════════════════════════════════════════════════════════════
 #  EMPLOYEE TAX
 # ═══════════════════════════════════════════════════════════════════════
+
+def _skatteloft_rates(k_pct: float, rules: TaxRules) -> tuple[float, float, float]:
+    """Mellem/top/toptop rates reduced so state + kommune never exceeds skatteloft."""
+    base_marginal = rules.bundskat_rate + k_pct
+
+    eff_mellem = rules.mellemskat_rate
+    if base_marginal + eff_mellem > rules.skatteloft:
+        eff_mellem = max(rules.skatteloft - base_marginal, 0)
+
+    eff_top = rules.topskat_rate
+    if base_marginal + eff_mellem + eff_top > rules.skatteloft:
+        eff_top = max(rules.skatteloft - base_marginal - eff_mellem, 0)
+
+    eff_toptop = rules.toptopskat_rate
+    if base_marginal + eff_mellem + eff_top + eff_toptop > rules.skatteloft:
+        eff_toptop = max(rules.skatteloft - base_marginal - eff_mellem - eff_top, 0)
+
+    return eff_mellem, eff_top, eff_toptop
+
+
+def _employee_stages(
+    am_basis: float,
+    has_employment_income: bool,
+    k_pct: float,
+    kirke_pct: float,
+    is_church: bool,
+    lignings_fradrag: float,
+    bracket_rates: tuple[float, float, float],
+    rules: TaxRules,
+) -> tuple[float, ...]:
+    """Steps 2–7 of compute_tax() for one AM-basis.
+
+    Everything that does not depend on the AM-basis (pension, fradrag caps,
+    skatteloft-capped rates) is computed once by the caller, so the with- and
+    without-feriepenge variants share it.
+
+    Returns (am_bidrag, income_after_am, beskaeft, job_frad, bundskat,
+    kommuneskat, kirkeskat, mellemskat, topskat, toptopskat).
+    """
+    # 2) AM-bidrag
+    am_bidrag = am_basis * rules.am_rate if has_employment_income else 0.0
+    income_after_am = am_basis - am_bidrag
+
+    # 3) Employment deductions
+    if has_employment_income:
+        beskaeft = min(income_after_am * rules.beskaeft_rate, rules.beskaeft_max)
+        # Jobfradrag: only on income ABOVE bundgrænse (ligningsloven § 9 K)
+        job_frad = min(max(income_after_am - rules.job_fradrag_threshold, 0)
+                       * rules.job_fradrag_rate, rules.job_fradrag_max)
+    else:
+        beskaeft = job_frad = 0.0
+
+    # 4) Bundskat
+    #    NOTE: The fradrag used here (personfradrag + beskæftigelsesfradrag +
+    #    jobfradrag) is the "standard" calculation. Each employee's actual
+    #    trækprocent is determined by their forskudsopgørelse (preliminary tax
+    #    assessment on skat.dk), which may include personal deductions we don't
+    #    know about (rentefradrag, kapitalindkomst, etc.). This is the primary
+    #    source of deviation between our estimate and real payslips.
+    bundskat_base = max(income_after_am - rules.personfradrag, 0)
+    bundskat = bundskat_base * rules.bundskat_rate
+
+    # 5) Kommuneskat (reduced base via fradrag)
+    kommune_base = max(income_after_am - rules.personfradrag - beskaeft - job_frad - lignings_fradrag, 0)
+    kommuneskat = kommune_base * k_pct
+
+    # 6) Kirkeskat (also reduced by all ligningsmæssige fradrag)
+    kirkeskat = 0.0
+    if is_church:
+        kirkeskat = kommune_base * (kirke_pct / 100.0)
+
+    # 7) Progressive brackets — capped by skatteloft
+    eff_mellem, eff_top, eff_toptop = bracket_rates
+    mellem_base = max(min(income_after_am, rules.topskat_threshold)
+                      - rules.mellemskat_threshold, 0)
+    top_base    = max(min(income_after_am, rules.toptopskat_threshold)
+                      - rules.topskat_threshold, 0)
+    toptop_base = max(income_after_am - rules.toptopskat_threshold, 0)
+
+    mellemskat = mellem_base * eff_mellem
+    topskat    = top_base    * eff_top
+    toptopskat = toptop_base * eff_toptop
+
+    return (am_bidrag, income_after_am, beskaeft, job_frad, bundskat,
+            kommuneskat, kirkeskat, mellemskat, topskat, toptopskat)
+
 
 def compute_tax(
     gross_annual: float,
@@ -96,8 +363,9 @@ def compute_tax(
     transport_km: float = 0.0,
     union_fees_annual: float = 0.0,
     pension_type: str = "standard",
+    rules: TaxRules = DEFAULT_RULES,
     _skip_ferie: bool = False,
-) -> dict:
+) -> TaxResult:
     """Full Danish tax calculation for one year.
 
     Parameters
@@ -120,6 +388,8 @@ def compute_tax(
     atp_monthly            ATP employee contribution per month.
     transport_km           Round-trip daily commute km (>24 → befordringsfradrag).
     union_fees_annual      Annual trade union + a-kasse fees (max 7,000 deductible).
+    rules                  Tax-year ruleset (rates, thresholds, caps).
+    _skip_ferie            Compute as if no feriepenge were earned.
     """
     # 0) Feriepenge / ferietillæg (additional taxable income)
     #    Hourly workers: 12.5% feriepenge (paid with each paycheck or via FerieKonto).
@@ -130,7 +400,7 @@ def compute_tax(
     if _skip_ferie:
         feriepenge = 0.0
     else:
-        ferie_rate = FERIEPENGE_RATE if is_hourly else FERIETILLAEG_RATE
+        ferie_rate = rules.feriepenge_rate if is_hourly else rules.ferietillaeg_rate
         feriepenge = gross_annual * ferie_rate
 
     # Total cash pay = salary + feriepenge + other pay - pretax deductions
@@ -151,69 +421,19 @@ def compute_tax(
     pension_tax_deduction = 0.0 if is_section53a else employee_pension
     am_basis = total_gross - pension_tax_deduction - atp_annual
 
-    # 2) AM-bidrag
-    am_bidrag = am_basis * AM_RATE if has_employment_income else 0.0
-    income_after_am = am_basis - am_bidrag
-
-    # 3) Employment deductions
-    if has_employment_income:
-        beskaeft = min(income_after_am * BESKAEFT_RATE, BESKAEFT_MAX)
-        # Jobfradrag: only on income ABOVE bundgrænse (ligningsloven § 9 K)
-        job_frad = min(max(income_after_am - JOB_FRADRAG_THRESHOLD, 0)
-                       * JOB_FRADRAG_RATE, JOB_FRADRAG_MAX)
-    else:
-        beskaeft = job_frad = 0.0
-
     # 3b) Ligningsmæssige fradrag (reduce kommune/kirke base, NOT bundskat base)
-    befordring = compute_befordringsfradrag(transport_km) if transport_km > 0 else 0.0
-    union_deduction = min(union_fees_annual, FAGFORENING_MAX)
+    befordring = compute_befordringsfradrag(transport_km, rules=rules) if transport_km > 0 else 0.0
+    union_deduction = min(union_fees_annual, rules.fagforening_max)
     lignings_fradrag = befordring + union_deduction
 
-    # 4) Bundskat
-    #    NOTE: The fradrag used here (personfradrag + beskæftigelsesfradrag +
-    #    jobfradrag) is the "standard" calculation. Each employee's actual
-    #    trækprocent is determined by their forskudsopgørelse (preliminary tax
-    #    assessment on skat.dk), which may include personal deductions we don't
-    #    know about (rentefradrag, kapitalindkomst, etc.). This is the primary
-    #    source of deviation between our estimate and real payslips.
-    bundskat_base = max(income_after_am - PERSONFRADRAG, 0)
-    bundskat = bundskat_base * BUNDSKAT_RATE
-
-    # 5) Kommuneskat (reduced base via fradrag)
-    kommune_base = max(income_after_am - PERSONFRADRAG - beskaeft - job_frad - lignings_fradrag, 0)
+    # 2)–7) AM-bidrag, fradrag, bundskat, kommune/kirke, brackets
     k_pct = kommune_pct / 100.0
-    kommuneskat = kommune_base * k_pct
-
-    # 6) Kirkeskat (also reduced by all ligningsmæssige fradrag)
-    kirkeskat = 0.0
-    if is_church:
-        kirke_base = max(income_after_am - PERSONFRADRAG - beskaeft - job_frad - lignings_fradrag, 0)
-        kirkeskat = kirke_base * (kirke_pct / 100.0)
-
-    # 7) Progressive brackets — capped by skatteloft
-    base_marginal = BUNDSKAT_RATE + k_pct
-
-    eff_mellem = MELLEMSKAT_RATE
-    if base_marginal + eff_mellem > SKATTELOFT:
-        eff_mellem = max(SKATTELOFT - base_marginal, 0)
-
-    eff_top = TOPSKAT_RATE
-    if base_marginal + eff_mellem + eff_top > SKATTELOFT:
-        eff_top = max(SKATTELOFT - base_marginal - eff_mellem, 0)
-
-    eff_toptop = TOPTOPSKAT_RATE
-    if base_marginal + eff_mellem + eff_top + eff_toptop > SKATTELOFT:
-        eff_toptop = max(SKATTELOFT - base_marginal - eff_mellem - eff_top, 0)
-
-    mellem_base = max(min(income_after_am, TOPSKAT_THRESHOLD)
-                      - MELLEMSKAT_THRESHOLD, 0)
-    top_base    = max(min(income_after_am, TOPTOPSKAT_THRESHOLD)
-                      - TOPSKAT_THRESHOLD, 0)
-    toptop_base = max(income_after_am - TOPTOPSKAT_THRESHOLD, 0)
-
-    mellemskat = mellem_base * eff_mellem
-    topskat    = top_base    * eff_top
-    toptopskat = toptop_base * eff_toptop
+    bracket_rates = _skatteloft_rates(k_pct, rules)
+    (am_bidrag, income_after_am, beskaeft, job_frad, bundskat, kommuneskat,
+     kirkeskat, mellemskat, topskat, toptopskat) = _employee_stages(
+        am_basis, has_employment_income, k_pct, kirke_pct, is_church,
+        lignings_fradrag, bracket_rates, rules,
+    )
 
     # 8) Totals
     total_income_tax = (bundskat + kommuneskat + kirkeskat
@@ -223,66 +443,101 @@ def compute_tax(
     # (taxable benefits are non-cash so not in net)
     net_annual = total_cash - total_deductions - aftertax_deductions_annual
 
-    result = {
-        "gross_annual":        gross_annual,
-        "feriepenge":          feriepenge,
-        "other_pay":           other_pay_annual,
-        "pretax_deductions":   pretax_deductions_annual,
-        "aftertax_deductions": aftertax_deductions_annual,
-        "taxable_benefits":    taxable_benefits_annual,
-        "total_gross":         total_gross,
-        "taxable_income":      am_basis,
-        "pension_type":        pension_type,
-        "pension":             pension,
-        "employee_pension":    employee_pension,
-        "employer_pension":    employer_pension,
-        "total_pension":       total_pension,
-        "taxable_employer_pension": taxable_employer_pension,
-        "am_bidrag":           am_bidrag,
-        "atp_annual":          atp_annual,
-        "income_after_am":     income_after_am,
-        "beskaeft_fradrag":    beskaeft,
-        "job_fradrag":         job_frad,
-        "befordring":          befordring,
-        "union_deduction":     union_deduction,
-        "lignings_fradrag":    lignings_fradrag,
-        "bundskat":            bundskat,
-        "kommuneskat":         kommuneskat,
-        "kirkeskat":           kirkeskat,
-        "mellemskat":          mellemskat,
-        "topskat":             topskat,
-        "toptopskat":          toptopskat,
-        "total_income_tax":    total_income_tax,
-        "total_deductions":    total_deductions,
-        "net_annual":          net_annual,
-        "net_monthly":         net_annual / 12,
-        "effective_tax_rate":  (total_deductions / total_gross * 100)
-                                 if total_gross > 0 else 0,
-    }
-
-    # Compute net contribution of feriepenge (difference method)
-    if not _skip_ferie and feriepenge > 0:
-        r_no = compute_tax(
-            gross_annual, pension_pct, kommune_pct, kirke_pct,
-            is_church, has_employment_income, employer_pension_pct,
-            is_hourly, taxable_benefits_annual, other_pay_annual,
-            pretax_deductions_annual, aftertax_deductions_annual,
-            atp_monthly, transport_km, union_fees_annual,
-            pension_type=pension_type,
-            _skip_ferie=True,
+    # Net contribution of feriepenge (difference method): re-run only the
+    # AM-basis-dependent stages without feriepenge, sharing everything else.
+    if feriepenge > 0:
+        nf_cash = gross_annual + 0.0 + other_pay_annual - pretax_deductions_annual
+        nf_gross = nf_cash + taxable_benefits_annual + taxable_employer_pension
+        nf_am_bidrag, _, _, _, *nf_taxes = _employee_stages(
+            nf_gross - pension_tax_deduction - atp_annual,
+            has_employment_income, k_pct, kirke_pct, is_church,
+            lignings_fradrag, bracket_rates, rules,
         )
-        net_ferie = net_annual - r_no["net_annual"]
+        nf_deductions = nf_am_bidrag + pension + sum(nf_taxes) + atp_annual
+        net_ferie = net_annual - (nf_cash - nf_deductions - aftertax_deductions_annual)
     else:
         net_ferie = 0.0
-    result["net_ferie"] = net_ferie
-    result["net_ferie_monthly"] = net_ferie / 12
 
-    return result
+    return TaxResult(
+        gross_annual, feriepenge, other_pay_annual, pretax_deductions_annual,
+        aftertax_deductions_annual, taxable_benefits_annual, total_gross,
+        am_basis, pension_type, employee_pension, employer_pension,
+        total_pension, taxable_employer_pension, am_bidrag, atp_annual,
+        income_after_am, beskaeft, job_frad, befordring, union_deduction,
+        lignings_fradrag, bundskat, kommuneskat, kirkeskat, mellemskat,
+        topskat, toptopskat, total_income_tax, total_deductions, net_annual,
+        net_ferie,
+    )
 
 
 # ═══════════════════════════════════════════════════════════════════════
 #  STUDENT (SU + WORK)
 # ═══════════════════════════════════════════════════════════════════════
+
+def _student_stages(
+    work_am_basis: float,
+    su_annual_gross: float,
+    aars_fribeloeb: float,
+    k_pct: float,
+    kirke_pct: float,
+    is_church: bool,
+    lignings_fradrag: float,
+    eff_mellem: float,
+    rules: TaxRules,
+) -> tuple[float, ...]:
+    """AM-basis-dependent part of compute_student_income().
+
+    Returns (work_am_bidrag, work_after_am, fribeloeb_excess, su_repayment,
+    su_repayment_interest, su_annual, total_personal, beskaeft, job_frad,
+    bundskat, kommuneskat, kirkeskat, mellemskat).
+    """
+    work_am_bidrag = work_am_basis * rules.am_rate
+    work_after_am  = work_am_basis - work_am_bidrag
+
+    # ── Fribeløb check & SU repayment ──────────────────────────────
+    # Egenindkomst includes feriepenge (su.dk: "Dine feriepenge tæller med")
+    # Årsfribeløb = sum of 12 månedsfribeløb (passed in or default)
+    fribeloeb_excess = max(work_after_am - aars_fribeloeb, 0)
+    # Repayment is krone-for-krone, capped at total SU received
+    su_repayment     = min(fribeloeb_excess, su_annual_gross)
+
+    # Interest on the repayment amount (9.75 % p.a.)
+    su_repayment_interest = su_repayment * rules.su_repayment_interest_rate
+
+    # Effective SU after repayment (what you actually keep)
+    su_annual = su_annual_gross - su_repayment
+
+    # Combined personal income (using effective SU)
+    total_personal = su_annual + work_after_am
+
+    # Employment deductions (work portion only)
+    beskaeft = min(work_after_am * rules.beskaeft_rate, rules.beskaeft_max)
+    # Jobfradrag: only on income ABOVE bundgrænse (ligningsloven § 9 K)
+    job_frad = min(max(work_after_am - rules.job_fradrag_threshold, 0)
+                   * rules.job_fradrag_rate, rules.job_fradrag_max)
+
+    # Bundskat
+    bundskat_base = max(total_personal - rules.personfradrag, 0)
+    bundskat = bundskat_base * rules.bundskat_rate
+
+    # Kommuneskat
+    kommune_base = max(total_personal - rules.personfradrag - beskaeft - job_frad - lignings_fradrag, 0)
+    kommuneskat = kommune_base * k_pct
+
+    # Kirkeskat (reduced by ligningsmæssige fradrag: beskaeft + jobfradrag)
+    kirkeskat = 0.0
+    if is_church:
+        kirkeskat = kommune_base * (kirke_pct / 100.0)
+
+    # Higher brackets (unlikely for most students)
+    mellem_base = max(min(total_personal, rules.topskat_threshold)
+                      - rules.mellemskat_threshold, 0)
+    mellemskat = mellem_base * eff_mellem
+
+    return (work_am_bidrag, work_after_am, fribeloeb_excess, su_repayment,
+            su_repayment_interest, su_annual, total_personal, beskaeft,
+            job_frad, bundskat, kommuneskat, kirkeskat, mellemskat)
+
 
 def compute_student_income(
     su_monthly: float,
@@ -300,20 +555,22 @@ def compute_student_income(
     transport_km: float = 0.0,
     union_fees_annual: float = 0.0,
     pension_type: str = "standard",
+    rules: TaxRules = DEFAULT_RULES,
     _skip_ferie: bool = False,
-) -> dict:
+) -> StudentIncomeResult:
     """Combined net income: SU (no AM) + work wages (AM applies).
 
     The personfradrag covers the combined personal income.
-    If aars_fribeloeb is not given, defaults to 12 × laveste videregående.
+    If aars_fribeloeb is not given, defaults to 12 × laveste videregående
+    from *rules*.
     """
     if aars_fribeloeb is None:
-        aars_fribeloeb = FRIBELOEB_LAVESTE_VID * 12
+        aars_fribeloeb = rules.fribeloeb_laveste_vid * 12
     su_annual_gross = su_monthly * 12
     work_annual     = work_gross_monthly * 12
 
     # Feriepenge (12.5 % for hourly student jobs — counts towards egenindkomst)
-    work_feriepenge = 0.0 if _skip_ferie else work_annual * FERIEPENGE_RATE
+    work_feriepenge = 0.0 if _skip_ferie else work_annual * rules.feriepenge_rate
 
     # Total cash = work salary + feriepenge + other pay - pretax deductions
     total_work_cash = work_annual + work_feriepenge + other_pay_annual - pretax_deductions_annual
@@ -333,59 +590,23 @@ def compute_student_income(
         - work_pension_tax_deduction
         - atp_annual
     )
-    work_am_bidrag = work_am_basis * AM_RATE
-    work_after_am  = work_am_basis - work_am_bidrag
-
-    # ── Fribeløb check & SU repayment ──────────────────────────────
-    # Egenindkomst includes feriepenge (su.dk: "Dine feriepenge tæller med")
-    # Årsfribeløb = sum of 12 månedsfribeløb (passed in or default)
-    fribeloeb_excess = max(work_after_am - aars_fribeloeb, 0)
-    # Repayment is krone-for-krone, capped at total SU received
-    su_repayment     = min(fribeloeb_excess, su_annual_gross)
-    over_fribeloeb   = fribeloeb_excess > 0
-
-    # Interest on the repayment amount (9.75 % p.a.)
-    su_repayment_interest = su_repayment * SU_REPAYMENT_INTEREST_RATE
-
-    # Effective SU after repayment (what you actually keep)
-    su_annual = su_annual_gross - su_repayment
-
-    # Combined personal income (using effective SU)
-    total_personal = su_annual + work_after_am
-
-    # Employment deductions (work portion only)
-    beskaeft = min(work_after_am * BESKAEFT_RATE, BESKAEFT_MAX)
-    # Jobfradrag: only on income ABOVE bundgrænse (ligningsloven § 9 K)
-    job_frad = min(max(work_after_am - JOB_FRADRAG_THRESHOLD, 0)
-                   * JOB_FRADRAG_RATE, JOB_FRADRAG_MAX)
 
     # Ligningsmæssige fradrag (reduce kommune/kirke base)
-    befordring = compute_befordringsfradrag(transport_km) if transport_km > 0 else 0.0
-    union_deduction = min(union_fees_annual, FAGFORENING_MAX)
+    befordring = compute_befordringsfradrag(transport_km, rules=rules) if transport_km > 0 else 0.0
+    union_deduction = min(union_fees_annual, rules.fagforening_max)
     lignings_fradrag = befordring + union_deduction
 
-    # Bundskat
-    bundskat_base = max(total_personal - PERSONFRADRAG, 0)
-    bundskat = bundskat_base * BUNDSKAT_RATE
-
-    # Kommuneskat
-    kommune_base = max(total_personal - PERSONFRADRAG - beskaeft - job_frad - lignings_fradrag, 0)
-    k_pct = kommune_pct / 100.0
-    kommuneskat = kommune_base * k_pct
-
-    # Kirkeskat (reduced by ligningsmæssige fradrag: beskaeft + jobfradrag)
-    kirkeskat = 0.0
-    if is_church:
-        kirke_base = max(total_personal - PERSONFRADRAG - beskaeft - job_frad - lignings_fradrag, 0)
-        kirkeskat = kirke_base * (kirke_pct / 100.0)
-
-    # Higher brackets (unlikely for most students)
-    base_marginal = BUNDSKAT_RATE + k_pct
-    eff_mellem = min(MELLEMSKAT_RATE, max(SKATTELOFT - base_marginal, 0))
-    mellem_base = max(min(total_personal, TOPSKAT_THRESHOLD)
-                      - MELLEMSKAT_THRESHOLD, 0)
-    mellemskat = mellem_base * eff_mellem
+    k_pct = kommune_pct / 100.0
+    base_marginal = rules.bundskat_rate + k_pct
+    eff_mellem = min(rules.mellemskat_rate, max(rules.skatteloft - base_marginal, 0))
 
+    # AM-bidrag, fribeløb/SU repayment, fradrag and income taxes
+    (work_am_bidrag, work_after_am, fribeloeb_excess, su_repayment,
+     su_repayment_interest, su_annual, total_personal, beskaeft, job_frad,
+     bundskat, kommuneskat, kirkeskat, mellemskat) = _student_stages(
+        work_am_basis, su_annual_gross, aars_fribeloeb, k_pct, kirke_pct,
+        is_church, lignings_fradrag, eff_mellem, rules,
+    )
     # Totals — note: net is based on effective SU (after repayment)
     total_income_tax = bundskat + kommuneskat + kirkeskat + mellemskat
     total_deductions = (work_am_bidrag + work_pension + total_income_tax
@@ -394,68 +615,425 @@ def compute_student_income(
     # Net = SU gross + work cash - deductions - after-tax items
     net_annual = (su_annual_gross + total_work_cash) - total_deductions - aftertax_deductions_annual
 
-    # Monthly helpers
-    work_after_am_monthly = work_after_am / 12
-
-    result = {
-        "su_annual_gross":         su_annual_gross,
-        "su_annual":               su_annual,
-        "su_monthly":              su_monthly,
-        "su_repayment":            su_repayment,
-        "su_repayment_interest":   su_repayment_interest,
-        "aars_fribeloeb":          aars_fribeloeb,
-        "fribeloeb_excess":        fribeloeb_excess,
-        "work_feriepenge":         work_feriepenge,
-        "work_gross_annual":       work_annual,
-        "work_gross_monthly":      work_gross_monthly,
-        "work_pension":            work_pension,
-        "pension_type":            pension_type,
-        "work_employee_pension":   work_employee_pension,
-        "work_employer_pension":   work_employer_pension,
-        "work_total_pension":      work_total_pension,
-        "work_taxable_employer_pension": work_taxable_employer_pension,
-        "work_taxable_income":     work_am_basis,
-        "work_am_bidrag":          work_am_bidrag,
-        "work_after_am":           work_after_am,
-        "atp_annual":              atp_annual,
-        "other_pay":               other_pay_annual,
-        "pretax_deductions":       pretax_deductions_annual,
-        "aftertax_deductions":     aftertax_deductions_annual,
-        "befordring":              befordring,
-        "union_deduction":         union_deduction,
-        "lignings_fradrag":        lignings_fradrag,
-        "total_personal":          total_personal,
-        "beskaeft_fradrag":        beskaeft,
-        "job_fradrag":             job_frad,
-        "bundskat":                bundskat,
-        "kommuneskat":             kommuneskat,
-        "kirkeskat":               kirkeskat,
-        "mellemskat":              mellemskat,
-        "total_income_tax":        total_income_tax,
-        "total_deductions":        total_deductions,
-        "net_annual":              net_annual,
-        "net_monthly":             net_annual / 12,
-        "over_fribeloeb":          over_fribeloeb,
-        "fribeloeb_limit":         FRIBELOEB_LAVESTE_VID,
-        "work_after_am_monthly":   work_after_am_monthly,
+    # Net contribution of feriepenge (difference method): re-run only the
+    # AM-basis-dependent stages without feriepenge, sharing everything else.
+    if work_feriepenge > 0:
+        nf_cash = work_annual + 0.0 + other_pay_annual - pretax_deductions_annual
+        (nf_am_bidrag, _, _, nf_repayment, nf_interest, _, _, _, _,
+         *nf_taxes) = _student_stages(
+            nf_cash + work_taxable_employer_pension - work_pension_tax_deduction - atp_annual,
+            su_annual_gross, aars_fribeloeb, k_pct, kirke_pct,
+            is_church, lignings_fradrag, eff_mellem, rules,
+        )
+        nf_deductions = (nf_am_bidrag + work_pension + sum(nf_taxes)
+                         + atp_annual
+                         + nf_repayment + nf_interest)
+        nf_net = (su_annual_gross + nf_cash) - nf_deductions - aftertax_deductions_annual
+        net_ferie = net_annual - nf_net
+    else:
+        net_ferie = 0.0
+
+    return StudentIncomeResult(
+        su_annual_gross, su_annual, su_monthly, su_repayment,
+        su_repayment_interest, aars_fribeloeb, fribeloeb_excess,
+        work_feriepenge, work_annual, work_gross_monthly, pension_type,
+        work_employee_pension, work_employer_pension, work_total_pension,
+        work_taxable_employer_pension, work_am_basis, work_am_bidrag,
+        work_after_am, atp_annual, other_pay_annual, pretax_deductions_annual,
+        aftertax_deductions_annual, befordring, union_deduction,
+        lignings_fradrag, total_personal, beskaeft, job_frad, bundskat,
+        kommuneskat, kirkeskat, mellemskat, total_income_tax,
+        total_deductions, net_annual, net_ferie, rules.fribeloeb_laveste_vid,
+    )
+
+
+# ═══════════════════════════════════════════════════════════════════════
+#  EMPLOYEE TAX — BATCH (NumPy)
+# ═══════════════════════════════════════════════════════════════════════
+
+def _befordringsfradrag_batch(
+    daily_km: np.ndarray, rules: TaxRules, work_days: int = 218,
+) -> np.ndarray:
+    """Vectorized compute_befordringsfradrag()."""
+    deductible_km = np.maximum(daily_km - rules.befordring_threshold, 0.0)
+    km_at_low  = np.minimum(deductible_km, rules.befordring_high_threshold - rules.befordring_threshold)
+    km_at_high = np.maximum(daily_km - rules.befordring_high_threshold, 0.0)
+    return (km_at_low * rules.befordring_rate_low + km_at_high * rules.befordring_rate_high) * work_days
+
+
+def _employee_stages_batch(
+    total_cash: np.ndarray,
+    total_gross: np.ndarray,
+    pension_tax_deduction: np.ndarray,
+    atp_annual: np.ndarray,
+    has_employment_income: np.ndarray,
+    k_pct: np.ndarray,
+    kirke_rate: np.ndarray,
+    lignings_fradrag: np.ndarray,
+    eff_mellem: np.ndarray,
+    eff_top: np.ndarray,
+    eff_toptop: np.ndarray,
+    rules: TaxRules,
+) -> dict[str, np.ndarray]:
+    """Steps 2–7 of compute_tax() for whole arrays at once."""
+    am_basis = total_gross - pension_tax_deduction - atp_annual
+    am_bidrag = np.where(has_employment_income, am_basis * rules.am_rate, 0.0)
+    income_after_am = am_basis - am_bidrag
+
+    beskaeft = np.where(
+        has_employment_income,
+        np.minimum(income_after_am * rules.beskaeft_rate, rules.beskaeft_max),
+        0.0,
+    )
+    job_frad = np.where(
+        has_employment_income,
+        np.minimum(np.maximum(income_after_am - rules.job_fradrag_threshold, 0)
+                   * rules.job_fradrag_rate, rules.job_fradrag_max),
+        0.0,
+    )
+
+    bundskat = np.maximum(income_after_am - rules.personfradrag, 0) * rules.bundskat_rate
+    kommune_base = np.maximum(
+        income_after_am - rules.personfradrag - beskaeft - job_frad - lignings_fradrag, 0)
+    kommuneskat = kommune_base * k_pct
+    kirkeskat = kommune_base * kirke_rate
+
+    mellem_base = np.maximum(np.minimum(income_after_am, rules.topskat_threshold)
+                             - rules.mellemskat_threshold, 0)
+    top_base    = np.maximum(np.minimum(income_after_am, rules.toptopskat_threshold)
+                             - rules.topskat_threshold, 0)
+    toptop_base = np.maximum(income_after_am - rules.toptopskat_threshold, 0)
+    mellemskat = mellem_base * eff_mellem
+    topskat    = top_base    * eff_top
+    toptopskat = toptop_base * eff_toptop
+
+    total_income_tax = (bundskat + kommuneskat + kirkeskat
+                        + mellemskat + topskat + toptopskat)
+    return {
+        "total_gross":      total_gross,
+        "taxable_income":   am_basis,
+        "am_bidrag":        am_bidrag,
+        "income_after_am":  income_after_am,
+        "beskaeft_fradrag": beskaeft,
+        "job_fradrag":      job_frad,
+        "bundskat":         bundskat,
+        "kommuneskat":      kommuneskat,
+        "kirkeskat":        kirkeskat,
+        "mellemskat":       mellemskat,
+        "topskat":          topskat,
+        "toptopskat":       toptopskat,
+        "total_income_tax": total_income_tax,
     }
 
-    # Compute net contribution of feriepenge (difference method)
-    if not _skip_ferie and work_feriepenge > 0:
-        r_no = compute_student_income(
-            su_monthly, work_gross_monthly, pension_pct,
-            kommune_pct, kirke_pct, is_church,
-            employer_pension_pct, aars_fribeloeb,
-            atp_monthly, pretax_deductions_annual,
-            aftertax_deductions_annual, other_pay_annual,
-            transport_km, union_fees_annual,
-            pension_type=pension_type,
-            _skip_ferie=True,
+
+def compute_tax_batch(
+    gross_annual,
+    pension_pct,
+    kommune_pct,
+    kirke_pct,
+    is_church,
+    has_employment_income=True,
+    employer_pension_pct=0.0,
+    is_hourly=False,
+    taxable_benefits_annual=0.0,
+    other_pay_annual=0.0,
+    pretax_deductions_annual=0.0,
+    aftertax_deductions_annual=0.0,
+    atp_monthly=0.0,
+    transport_km=0.0,
+    union_fees_annual=0.0,
+    pension_type="standard",
+    rules: TaxRules = DEFAULT_RULES,
+    _skip_ferie: bool = False,
+) -> dict[str, np.ndarray]:
+    """Vectorized compute_tax() — one call for a whole grid of inputs.
+
+    Every argument accepts a scalar or an array; all of them are broadcast
+    against each other (same units as compute_tax()). ``pension_type`` may
+    be a string or an array of strings; ``rules`` is a single ruleset.
+    ``_skip_ferie`` computes as if no feriepenge were earned (callers that
+    pay feriepenge out explicitly pass them as other pay instead).
+
+    Returns a dict of float arrays with the broadcast shape, using the same
+    keys as compute_tax() (``pension_type`` excluded) — i.e. columnar
+    output: ``res["net_monthly"][i]`` is the i-th input's net pay.
+    """
+    (gross_annual, pension_pct, kommune_pct, kirke_pct, is_church,
+     has_employment_income, employer_pension_pct, is_hourly,
+     taxable_benefits_annual, other_pay_annual, pretax_deductions_annual,
+     aftertax_deductions_annual, atp_monthly, transport_km,
+     union_fees_annual, is_section53a) = np.broadcast_arrays(
+        np.asarray(gross_annual, dtype=float),
+        np.asarray(pension_pct, dtype=float),
+        np.asarray(kommune_pct, dtype=float),
+        np.asarray(kirke_pct, dtype=float),
+        np.asarray(is_church, dtype=bool),
+        np.asarray(has_employment_income, dtype=bool),
+        np.asarray(employer_pension_pct, dtype=float),
+        np.asarray(is_hourly, dtype=bool),
+        np.asarray(taxable_benefits_annual, dtype=float),
+        np.asarray(other_pay_annual, dtype=float),
+        np.asarray(pretax_deductions_annual, dtype=float),
+        np.asarray(aftertax_deductions_annual, dtype=float),
+        np.asarray(atp_monthly, dtype=float),
+        np.asarray(transport_km, dtype=float),
+        np.asarray(union_fees_annual, dtype=float),
+        np.asarray(pension_type) == "section53a",
+    )
+
+    # 0) Feriepenge / ferietillæg
+    if _skip_ferie:
+        feriepenge = np.zeros_like(gross_annual)
+    else:
+        feriepenge = gross_annual * np.where(is_hourly, rules.feriepenge_rate, rules.ferietillaeg_rate)
+    base_cash = other_pay_annual - pretax_deductions_annual
+
+    # 1) Pension
+    employee_pension = gross_annual * pension_pct
+    employer_pension = gross_annual * employer_pension_pct
+    total_pension    = employee_pension + employer_pension
+    taxable_employer_pension = np.where(is_section53a, employer_pension, 0.0)
+    pension_tax_deduction = np.where(is_section53a, 0.0, employee_pension)
+    atp_annual = atp_monthly * 12
+
+    # 3b) Ligningsmæssige fradrag
+    befordring = _befordringsfradrag_batch(transport_km, rules)
+    union_deduction = np.minimum(union_fees_annual, rules.fagforening_max)
+    lignings_fradrag = befordring + union_deduction
+
+    # 7) Skatteloft-capped bracket rates (depend on the kommune rate only)
+    k_pct = kommune_pct / 100.0
+    kirke_rate = np.where(is_church, kirke_pct / 100.0, 0.0)
+    base_marginal = rules.bundskat_rate + k_pct
+    eff_mellem = np.where(base_marginal + rules.mellemskat_rate > rules.skatteloft,
+                          np.maximum(rules.skatteloft - base_marginal, 0), rules.mellemskat_rate)
+    eff_top = np.where(base_marginal + eff_mellem + rules.topskat_rate > rules.skatteloft,
+                       np.maximum(rules.skatteloft - base_marginal - eff_mellem, 0),
+                       rules.topskat_rate)
+    eff_toptop = np.where(base_marginal + eff_mellem + eff_top + rules.toptopskat_rate > rules.skatteloft,
+                          np.maximum(rules.skatteloft - base_marginal - eff_mellem - eff_top, 0),
+                          rules.toptopskat_rate)
+
+    def stages(ferie: np.ndarray) -> dict[str, np.ndarray]:
+        total_cash = gross_annual + ferie + base_cash
+        total_gross = total_cash + taxable_benefits_annual + taxable_employer_pension
+        res = _employee_stages_batch(
+            total_cash, total_gross, pension_tax_deduction, atp_annual,
+            has_employment_income, k_pct, kirke_rate, lignings_fradrag,
+            eff_mellem, eff_top, eff_toptop, rules,
         )
-        net_ferie = net_annual - r_no["net_annual"]
+        res["total_deductions"] = (res["am_bidrag"] + employee_pension
+                                   + res["total_income_tax"] + atp_annual)
+        res["net_annual"] = total_cash - res["total_deductions"] - aftertax_deductions_annual
+        return res
+
+    result = stages(feriepenge)
+    # Net contribution of feriepenge (difference method, vectorized)
+    if _skip_ferie:
+        net_ferie = np.zeros_like(feriepenge)
     else:
-        net_ferie = 0.0
-    result["net_ferie"] = net_ferie
-    result["net_ferie_monthly"] = net_ferie / 12
+        net_ferie = np.where(feriepenge > 0,
+                             result["net_annual"] - stages(np.zeros_like(feriepenge))["net_annual"],
+                             0.0)
 
+    total_gross = result["total_gross"]
+    total_deductions = result["total_deductions"]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        effective_tax_rate = np.where(total_gross > 0,
+                                      total_deductions / total_gross * 100, 0.0)
+
+    result.update({
+        "gross_annual":        gross_annual,
+        "feriepenge":          feriepenge,
+        "other_pay":           other_pay_annual,
+        "pretax_deductions":   pretax_deductions_annual,
+        "aftertax_deductions": aftertax_deductions_annual,
+        "taxable_benefits":    taxable_benefits_annual,
+        "pension":             employee_pension,
+        "employee_pension":    employee_pension,
+        "employer_pension":    employer_pension,
+        "total_pension":       total_pension,
+        "taxable_employer_pension": taxable_employer_pension,
+        "atp_annual":          atp_annual,
+        "befordring":          befordring,
+        "union_deduction":     union_deduction,
+        "lignings_fradrag":    lignings_fradrag,
+        "net_monthly":         result["net_annual"] / 12,
+        "effective_tax_rate":  effective_tax_rate,
+        "net_ferie":           net_ferie,
+        "net_ferie_monthly":   net_ferie / 12,
+    })
     return result
+
+
+# ═══════════════════════════════════════════════════════════════════════
+#  STUDENT (SU + WORK) — BATCH (NumPy)
+# ═══════════════════════════════════════════════════════════════════════
+
+def _student_stages_batch(
+    work_am_basis: np.ndarray,
+    su_annual_gross: np.ndarray,
+    aars_fribeloeb: np.ndarray,
+    k_pct: np.ndarray,
+    kirke_rate: np.ndarray,
+    lignings_fradrag: np.ndarray,
+    eff_mellem: np.ndarray,
+    rules: TaxRules,
+) -> dict[str, np.ndarray]:
+    """AM-basis-dependent part of compute_student_income() for whole arrays."""
+    work_am_bidrag = work_am_basis * rules.am_rate
+    work_after_am = work_am_basis - work_am_bidrag
+
+    # Fribeløb excess → krone-for-krone SU repayment (capped) + interest
+    fribeloeb_excess = np.maximum(work_after_am - aars_fribeloeb, 0)
+    su_repayment = np.minimum(fribeloeb_excess, su_annual_gross)
+    su_repayment_interest = su_repayment * rules.su_repayment_interest_rate
+    su_annual = su_annual_gross - su_repayment
+    total_personal = su_annual + work_after_am
+
+    beskaeft = np.minimum(work_after_am * rules.beskaeft_rate, rules.beskaeft_max)
+    job_frad = np.minimum(np.maximum(work_after_am - rules.job_fradrag_threshold, 0)
+                          * rules.job_fradrag_rate, rules.job_fradrag_max)
+
+    bundskat = np.maximum(total_personal - rules.personfradrag, 0) * rules.bundskat_rate
+    kommune_base = np.maximum(
+        total_personal - rules.personfradrag - beskaeft - job_frad - lignings_fradrag, 0)
+    kommuneskat = kommune_base * k_pct
+    kirkeskat = kommune_base * kirke_rate
+    mellem_base = np.maximum(np.minimum(total_personal, rules.topskat_threshold)
+                             - rules.mellemskat_threshold, 0)
+    mellemskat = mellem_base * eff_mellem
+
+    return {
+        "work_taxable_income":   work_am_basis,
+        "work_am_bidrag":        work_am_bidrag,
+        "work_after_am":         work_after_am,
+        "fribeloeb_excess":      fribeloeb_excess,
+        "su_repayment":          su_repayment,
+        "su_repayment_interest": su_repayment_interest,
+        "su_annual":             su_annual,
+        "total_personal":        total_personal,
+        "beskaeft_fradrag":      beskaeft,
+        "job_fradrag":           job_frad,
+        "bundskat":              bundskat,
+        "kommuneskat":           kommuneskat,
+        "kirkeskat":             kirkeskat,
+        "mellemskat":            mellemskat,
+        "total_income_tax":      bundskat + kommuneskat + kirkeskat + mellemskat,
+    }
+
+
+def compute_student_income_batch(
+    su_monthly,
+    work_gross_monthly,
+    pension_pct,
+    kommune_pct,
+    kirke_pct,
+    is_church,
+    employer_pension_pct=0.0,
+    aars_fribeloeb=None,
+    atp_monthly=0.0,
+    pretax_deductions_annual=0.0,
+    aftertax_deductions_annual=0.0,
+    other_pay_annual=0.0,
+    transport_km=0.0,
+    union_fees_annual=0.0,
+    pension_type="standard",
+    rules: TaxRules = DEFAULT_RULES,
+) -> dict[str, np.ndarray]:
+    """Vectorized compute_student_income() — e.g. SU × work-income sweeps.
+
+    Arguments broadcast against each other like compute_tax_batch();
+    ``aars_fribeloeb=None`` means the default 12 × laveste videregående.
+    Returns columnar arrays under the compute_student_income() keys
+    (``pension_type`` excluded).
+    """
+    if aars_fribeloeb is None:
+        aars_fribeloeb = rules.fribeloeb_laveste_vid * 12
+    (su_monthly, work_gross_monthly, pension_pct, kommune_pct, kirke_pct,
+     is_church, employer_pension_pct, aars_fribeloeb, atp_monthly,
+     pretax_deductions_annual, aftertax_deductions_annual, other_pay_annual,
+     transport_km, union_fees_annual, is_section53a) = np.broadcast_arrays(
+        np.asarray(su_monthly, dtype=float),
+        np.asarray(work_gross_monthly, dtype=float),
+        np.asarray(pension_pct, dtype=float),
+        np.asarray(kommune_pct, dtype=float),
+        np.asarray(kirke_pct, dtype=float),
+        np.asarray(is_church, dtype=bool),
+        np.asarray(employer_pension_pct, dtype=float),
+        np.asarray(aars_fribeloeb, dtype=float),
+        np.asarray(atp_monthly, dtype=float),
+        np.asarray(pretax_deductions_annual, dtype=float),
+        np.asarray(aftertax_deductions_annual, dtype=float),
+        np.asarray(other_pay_annual, dtype=float),
+        np.asarray(transport_km, dtype=float),
+        np.asarray(union_fees_annual, dtype=float),
+        np.asarray(pension_type) == "section53a",
+    )
+    su_annual_gross = su_monthly * 12
+    work_annual = work_gross_monthly * 12
+    work_feriepenge = work_annual * rules.feriepenge_rate
+    base_cash = other_pay_annual - pretax_deductions_annual
+
+    work_employee_pension = work_annual * pension_pct
+    work_employer_pension = work_annual * employer_pension_pct
+    work_taxable_employer_pension = np.where(is_section53a, work_employer_pension, 0.0)
+    work_pension_tax_deduction = np.where(is_section53a, 0.0, work_employee_pension)
+    atp_annual = atp_monthly * 12
+
+    befordring = _befordringsfradrag_batch(transport_km, rules)
+    union_deduction = np.minimum(union_fees_annual, rules.fagforening_max)
+    lignings_fradrag = befordring + union_deduction
+
+    k_pct = kommune_pct / 100.0
+    kirke_rate = np.where(is_church, kirke_pct / 100.0, 0.0)
+    eff_mellem = np.minimum(rules.mellemskat_rate,
+                            np.maximum(rules.skatteloft - (rules.bundskat_rate + k_pct), 0))
+
+    def stages(ferie: np.ndarray) -> dict[str, np.ndarray]:
+        total_work_cash = work_annual + ferie + base_cash
+        res = _student_stages_batch(
+            total_work_cash + work_taxable_employer_pension
+            - work_pension_tax_deduction - atp_annual,
+            su_annual_gross, aars_fribeloeb, k_pct, kirke_rate,
+            lignings_fradrag, eff_mellem, rules,
+        )
+        res["total_deductions"] = (res["work_am_bidrag"] + work_employee_pension
+                                   + res["total_income_tax"] + atp_annual
+                                   + res["su_repayment"] + res["su_repayment_interest"])
+        res["net_annual"] = ((su_annual_gross + total_work_cash)
+                             - res["total_deductions"] - aftertax_deductions_annual)
+        return res
+
+    result = stages(work_feriepenge)
+    net_ferie = np.where(work_feriepenge > 0,
+                         result["net_annual"] - stages(np.zeros_like(work_feriepenge))["net_annual"],
+                         0.0)
+
+    result.update({
+        "su_annual_gross":       su_annual_gross,
+        "su_monthly":            su_monthly,
+        "aars_fribeloeb":        aars_fribeloeb,
+        "work_feriepenge":       work_feriepenge,
+        "work_gross_annual":     work_annual,
+        "work_gross_monthly":    work_gross_monthly,
+        "work_pension":          work_employee_pension,
+        "work_employee_pension": work_employee_pension,
+        "work_employer_pension": work_employer_pension,
+        "work_total_pension":    work_employee_pension + work_employer_pension,
+        "work_taxable_employer_pension": work_taxable_employer_pension,
+        "atp_annual":            atp_annual,
+        "other_pay":             other_pay_annual,
+        "pretax_deductions":     pretax_deductions_annual,
+        "aftertax_deductions":   aftertax_deductions_annual,
+        "befordring":            befordring,
+        "union_deduction":       union_deduction,
+        "lignings_fradrag":      lignings_fradrag,
+        "net_monthly":           result["net_annual"] / 12,
+        "over_fribeloeb":        result["fribeloeb_excess"] > 0,
+        "fribeloeb_limit":       np.full_like(su_annual_gross, rules.fribeloeb_laveste_vid),
+        "work_after_am_monthly": result["work_after_am"] / 12,
+        "net_ferie":             net_ferie,
+        "net_ferie_monthly":     net_ferie / 12,
+    })
+    return result
@@ -0,0 +1,361 @@
+"""
+Compiled piecewise-linear tax schedules.
+
+For fixed kommune, church, pension and ATP settings the engine's net income
+is a continuous piecewise-linear function of gross salary. Its kinks sit
+where one of the clamped stages in ``compute_tax`` changes slope:
+
+  • personfradrag            (bundskat base becomes positive)
+  • kommune/kirke base zero  (income covers personfradrag + all fradrag)
+  • beskæftigelsesfradrag cap, jobfradrag bundgrænse and cap
+  • mellem / top / toptop thresholds (rates already skatteloft-capped)
+
+Each kink is located in income-after-AM space from the ``TaxRules``
+thresholds, mapped back to gross through the (affine) AM-basis, and the
+engine is evaluated exactly once per breakpoint. Between breakpoints the
+schedule interpolates linearly, which is exact — so ``net``/``tax`` for any
+gross costs one binary search instead of a full ``compute_tax`` call, and
+the schedule can be inverted exactly (gross needed for a given net).
+
+Student schedules do the same for ``compute_student_income`` over monthly
+work income, adding the fribeløb and SU-repayment-cap kinks. Schedules are
+cached per settings *and* ruleset, so several tax years can coexist.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_right
+from dataclasses import dataclass
+from functools import lru_cache
+
+import numpy as np
+
+from .rules import DEFAULT_RULES, TaxRules
+from .tax_engine import (
+    compute_befordringsfradrag,
+    compute_student_income_batch,
+    compute_tax_batch,
+)
+
+# Quantities carried by an employee schedule (all linear between kinks).
+SCHEDULE_FIELDS = (
+    "net_annual",
+    "net_ferie",
+    "total_gross",
+    "total_deductions",
+    "am_bidrag",
+    "total_income_tax",
+)
+STUDENT_SCHEDULE_FIELDS = (
+    "net_annual",
+    "net_ferie",
+    "total_deductions",
+    "work_am_bidrag",
+    "total_income_tax",
+    "su_repayment",
+)
+
+# Far enough past every threshold to read off the final slope.
+_TAIL = 10_000_000.0
+
+
+@dataclass(frozen=True, slots=True)
+class TaxSchedule:
+    """Piecewise-linear view of the engine along one input variable.
+
+    ``breakpoints`` are sorted input values (gross_annual for employee
+    schedules). ``values[f][i]`` is field *f* at ``breakpoints[i]`` and
+    ``slopes[f][i]`` its slope on the segment starting there; the last slope
+    extends to +∞ and the first one is used below ``breakpoints[0]``.
+    """
+
+    breakpoints: tuple[float, ...]
+    values: dict[str, tuple[float, ...]]
+    slopes: dict[str, tuple[float, ...]]
+
+    def segment(self, x: float) -> int:
+        """Index of the segment containing *x* (O(log k))."""
+        return max(bisect_right(self.breakpoints, x) - 1, 0)
+
+    def value(self, field: str, x: float) -> float:
+        i = self.segment(x)
+        return self.values[field][i] + self.slopes[field][i] * (x - self.breakpoints[i])
+
+    def evaluate(self, x: float) -> dict[str, float]:
+        """All schedule fields at *x*, plus the derived monthly/effective figures."""
+        i = self.segment(x)
+        dx = x - self.breakpoints[i]
+        res = {f: self.values[f][i] + self.slopes[f][i] * dx for f in self.values}
+        _add_derived(res)
+        return res
+
+    def solve(self, field: str, target: float) -> float | None:
+        """Smallest input ≥ breakpoints[0] at which *field* equals *target*.
+
+        Exact inversion of the piecewise-linear schedule: walk the segments
+        and solve the first one whose value range contains *target*. Works
+        for non-monotone fields too (e.g. student net around the fribeløb).
+        Returns None if the target is never reached.
+        """
+        xs, ys, ss = self.breakpoints, self.values[field], self.slopes[field]
+        for i, (x0, y0, slope) in enumerate(zip(xs, ys, ss)):
+            if y0 == target:
+                return x0
+            if i + 1 < len(xs):
+                y1 = ys[i + 1]
+                if min(y0, y1) <= target <= max(y0, y1) and slope != 0:
+                    return x0 + (target - y0) / slope
+            elif (target - y0) * slope > 0:
+                return x0 + (target - y0) / slope
+        return None
+
+    def evaluate_batch(self, x) -> dict[str, np.ndarray]:
+        """Vectorized evaluate() over an array of inputs."""
+        x = np.asarray(x, dtype=float)
+        bp = np.asarray(self.breakpoints)
+        i = np.maximum(np.searchsorted(bp, x, side="right") - 1, 0)
+        dx = x - bp[i]
+        res = {
+            f: np.asarray(self.values[f])[i] + np.asarray(self.slopes[f])[i] * dx
+            for f in self.values
+        }
+        _add_derived(res)
+        return res
+
+
+def _add_derived(res: dict) -> None:
+    res["net_monthly"] = res["net_annual"] / 12
+    res["net_ferie_monthly"] = res["net_ferie"] / 12
+    if "total_gross" not in res:
+        return
+    total_gross = res["total_gross"]
+    if isinstance(total_gross, np.ndarray):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            res["effective_tax_rate"] = np.where(
+                total_gross > 0, res["total_deductions"] / total_gross * 100, 0.0)
+    else:
+        res["effective_tax_rate"] = (res["total_deductions"] / total_gross * 100
+                                     if total_gross > 0 else 0)
+
+
+def _crossings(fn, points: list[float]) -> list[float]:
+    """Zeros of a piecewise-linear *fn* whose kinks all lie in *points*."""
+    pts = sorted(set(points))
+    vals = [fn(p) for p in pts]
+    roots = []
+    for (x0, y0), (x1, y1) in zip(zip(pts, vals), zip(pts[1:], vals[1:])):
+        if y0 == 0:
+            roots.append(x0)
+        elif (y0 < 0) != (y1 < 0) and y1 != 0:
+            roots.append(x0 - y0 * (x1 - x0) / (y1 - y0))
+    if vals and vals[-1] == 0:
+        roots.append(pts[-1])
+    return roots
+
+
+def income_kinks(
+    lignings_fradrag: float,
+    has_employment_income: bool = True,
+    rules: TaxRules = DEFAULT_RULES,
+) -> list[float]:
+    """Income-after-AM levels where an employee tax stage changes slope."""
+    kinks = [rules.personfradrag, rules.mellemskat_threshold,
+             rules.topskat_threshold, rules.toptopskat_threshold]
+    if has_employment_income:
+        kinks += [
+            rules.beskaeft_max / rules.beskaeft_rate,
+            rules.job_fradrag_threshold,
+            rules.job_fradrag_threshold + rules.job_fradrag_max / rules.job_fradrag_rate,
+        ]
+
+    def kommune_base_arg(income: float) -> float:
+        if not has_employment_income:
+            return income - rules.personfradrag - lignings_fradrag
+        beskaeft = min(income * rules.beskaeft_rate, rules.beskaeft_max)
+        job_frad = min(max(income - rules.job_fradrag_threshold, 0)
+                       * rules.job_fradrag_rate, rules.job_fradrag_max)
+        return income - rules.personfradrag - beskaeft - job_frad - lignings_fradrag
+
+    kinks += _crossings(kommune_base_arg, [0.0, *kinks, _TAIL + lignings_fradrag])
+    return kinks
+
+
+def student_income_kinks(
+    su_annual_gross: float,
+    aars_fribeloeb: float,
+    lignings_fradrag: float,
+    rules: TaxRules = DEFAULT_RULES,
+) -> list[float]:
+    """Work-income-after-AM levels where a student stage changes slope.
+
+    Personal income is SU (reduced krone-for-krone above the fribeløb) plus
+    work income, so thresholds on personal income are found as crossings.
+    """
+    kinks = [
+        aars_fribeloeb,
+        aars_fribeloeb + su_annual_gross,
+        rules.beskaeft_max / rules.beskaeft_rate,
+        rules.job_fradrag_threshold,
+        rules.job_fradrag_threshold + rules.job_fradrag_max / rules.job_fradrag_rate,
+    ]
+
+    def total_personal(work: float) -> float:
+        su_repayment = min(max(work - aars_fribeloeb, 0), su_annual_gross)
+        return su_annual_gross - su_repayment + work
+
+    def kommune_base_arg(work: float) -> float:
+        beskaeft = min(work * rules.beskaeft_rate, rules.beskaeft_max)
+        job_frad = min(max(work - rules.job_fradrag_threshold, 0)
+                       * rules.job_fradrag_rate, rules.job_fradrag_max)
+        return total_personal(work) - rules.personfradrag - beskaeft - job_frad - lignings_fradrag
+
+    span = [-_TAIL, *kinks, _TAIL + su_annual_gross + aars_fribeloeb]
+    crossings = _crossings(kommune_base_arg, span)
+    for threshold in (rules.personfradrag, rules.mellemskat_threshold, rules.topskat_threshold):
+        crossings += _crossings(lambda w: total_personal(w) - threshold, span)
+    return kinks + crossings
+
+
+def _build(evaluate, kinks: list[float]) -> TaxSchedule:
+    """Evaluate the engine at each kink (and one tail point) and store slopes."""
+    xs = sorted({0.0, *(k for k in kinks if k > 0)})
+    tail = xs[-1] + _TAIL
+    res = evaluate(np.array([*xs, tail]))
+    values, slopes = {}, {}
+    for field, col in res.items():
+        col = col.tolist()
+        values[field] = tuple(col[:-1])
+        slopes[field] = tuple(
+            (col[i + 1] - col[i]) / ((xs[i + 1] if i + 1 < len(xs) else tail) - xs[i])
+            for i in range(len(xs))
+        )
+    return TaxSchedule(breakpoints=tuple(xs), values=values, slopes=slopes)
+
+
+# ═══════════════════════════════════════════════════════════════════════
+#  EMPLOYEE SCHEDULE (x = gross_annual)
+# ═══════════════════════════════════════════════════════════════════════
+
+@lru_cache(maxsize=1024)
+def get_schedule(
+    kommune_pct: float,
+    kirke_pct: float,
+    is_church: bool,
+    pension_pct: float = 0.0,
+    pension_type: str = "standard",
+    employer_pension_pct: float = 0.0,
+    atp_monthly: float = 0.0,
+    is_hourly: bool = False,
+    has_employment_income: bool = True,
+    taxable_benefits_annual: float = 0.0,
+    other_pay_annual: float = 0.0,
+    pretax_deductions_annual: float = 0.0,
+    aftertax_deductions_annual: float = 0.0,
+    transport_km: float = 0.0,
+    union_fees_annual: float = 0.0,
+    rules: TaxRules = DEFAULT_RULES,
+) -> TaxSchedule:
+    """Compiled (and cached) schedule of compute_tax() over gross_annual.
+
+    Arguments are the non-gross compute_tax() arguments, in the same units.
+    ``rules`` is part of the cache key (TaxRules is hashable).
+    """
+    def evaluate(gross: np.ndarray) -> dict[str, np.ndarray]:
+        r = compute_tax_batch(
+            gross, pension_pct, kommune_pct, kirke_pct, is_church,
+            has_employment_income=has_employment_income,
+            employer_pension_pct=employer_pension_pct,
+            is_hourly=is_hourly,
+            taxable_benefits_annual=taxable_benefits_annual,
+            other_pay_annual=other_pay_annual,
+            pretax_deductions_annual=pretax_deductions_annual,
+            aftertax_deductions_annual=aftertax_deductions_annual,
+            atp_monthly=atp_monthly,
+            transport_km=transport_km,
+            union_fees_annual=union_fees_annual,
+            pension_type=pension_type,
+            rules=rules,
+        )
+        return {f: r[f] for f in SCHEDULE_FIELDS}
+
+    befordring = compute_befordringsfradrag(transport_km, rules=rules) if transport_km > 0 else 0.0
+    lignings_fradrag = befordring + min(union_fees_annual, rules.fagforening_max)
+    income = income_kinks(lignings_fradrag, has_employment_income, rules)
+
+    # income_after_am = slope · gross + intercept, with and without feriepenge
+    is_section53a = pension_type == "section53a"
+    per_gross = (1.0 + (employer_pension_pct if is_section53a else 0.0)
+                 - (0.0 if is_section53a else pension_pct))
+    intercept = (other_pay_annual - pretax_deductions_annual
+                 + taxable_benefits_annual - atp_monthly * 12)
+    am_keep = 1.0 - rules.am_rate if has_employment_income else 1.0
+    ferie_rate = rules.feriepenge_rate if is_hourly else rules.ferietillaeg_rate
+
+    kinks = []
+    for slope in (per_gross + ferie_rate, per_gross):
+        if slope != 0:
+            kinks += [(i / am_keep - intercept) / slope for i in income]
+    return _build(evaluate, kinks)
+
+
+# ═══════════════════════════════════════════════════════════════════════
+#  STUDENT SCHEDULE (x = work_gross_monthly)
+# ═══════════════════════════════════════════════════════════════════════
+
+@lru_cache(maxsize=1024)
+def get_student_schedule(
+    kommune_pct: float,
+    kirke_pct: float,
+    is_church: bool,
+    su_monthly: float,
+    pension_pct: float = 0.0,
+    pension_type: str = "standard",
+    employer_pension_pct: float = 0.0,
+    aars_fribeloeb: float | None = None,
+    atp_monthly: float = 0.0,
+    pretax_deductions_annual: float = 0.0,
+    aftertax_deductions_annual: float = 0.0,
+    other_pay_annual: float = 0.0,
+    transport_km: float = 0.0,
+    union_fees_annual: float = 0.0,
+    rules: TaxRules = DEFAULT_RULES,
+) -> TaxSchedule:
+    """Compiled (and cached) schedule of compute_student_income() over
+    work_gross_monthly. Net is not monotone here: above the fribeløb every
+    extra krone is repaid with interest until the whole SU is gone.
+    """
+    if aars_fribeloeb is None:
+        aars_fribeloeb = rules.fribeloeb_laveste_vid * 12
+
+    def evaluate(work: np.ndarray) -> dict[str, np.ndarray]:
+        r = compute_student_income_batch(
+            su_monthly, work, pension_pct, kommune_pct, kirke_pct, is_church,
+            employer_pension_pct=employer_pension_pct,
+            aars_fribeloeb=aars_fribeloeb,
+            atp_monthly=atp_monthly,
+            pretax_deductions_annual=pretax_deductions_annual,
+            aftertax_deductions_annual=aftertax_deductions_annual,
+            other_pay_annual=other_pay_annual,
+            transport_km=transport_km,
+            union_fees_annual=union_fees_annual,
+            pension_type=pension_type,
+            rules=rules,
+        )
+        return {f: r[f] for f in STUDENT_SCHEDULE_FIELDS}
+
+    befordring = compute_befordringsfradrag(transport_km, rules=rules) if transport_km > 0 else 0.0
+    lignings_fradrag = befordring + min(union_fees_annual, rules.fagforening_max)
+    income = student_income_kinks(su_monthly * 12, aars_fribeloeb, lignings_fradrag, rules)
+
+    # work_after_am = slope · work_gross_monthly + intercept
+    is_section53a = pension_type == "section53a"
+    per_gross = 12 * (1.0 + (employer_pension_pct if is_section53a else 0.0)
+                      - (0.0 if is_section53a else pension_pct))
+    intercept = other_pay_annual - pretax_deductions_annual - atp_monthly * 12
+    am_keep = 1.0 - rules.am_rate
+
+    kinks = []
+    for slope in (per_gross + 12 * rules.feriepenge_rate, per_gross):
+        if slope != 0:
+            kinks += [(i / am_keep - intercept) / slope for i in income]
+    return _build(evaluate, kinks)
@@ -0,0 +1,47 @@
+import asyncio
+import unittest
+
+from api import executor
+from api.batch import compute_chunk, run_batch
+
+
+ROSTER = [
+    ("fulltime", {"gross_annual": 540_000}),
+    ("parttime", {"hourly_rate": 180, "hours_month": 80, "kommune": "Aarhus"}),
+    ("student", {"work_gross_monthly": 9_000}),
+    ("fulltime", {"gross_annual": 540_000, "kommune": "Atlantis"}),
+    ("parttime", {"hourly_rate": 180}),
+]
+
+
+class BatchTests(unittest.TestCase):
+    def test_items_match_single_endpoints_in_order(self):
+        from api.models import FullTimeRequest, PartTimeRequest, StudentRequest
+        from api.routers.compute import compute_fulltime, compute_parttime, compute_student
+
+        results = compute_chunk(ROSTER)
+
+        self.assertEqual(results[0], compute_fulltime(FullTimeRequest(gross_annual=540_000)))
+        self.assertEqual(results[1], compute_parttime(
+            PartTimeRequest(hourly_rate=180, hours_month=80, kommune="Aarhus")))
+        self.assertEqual(results[2], compute_student(StudentRequest(work_gross_monthly=9_000)))
+
+    def test_bad_items_get_their_own_error(self):
+        results = compute_chunk(ROSTER)
+
+        self.assertEqual(results[3], {"error": "Unknown kommune: Atlantis"})
+        self.assertEqual(results[4], {"error": "hours_month: Field required"})
+
+    def test_process_pool_preserves_input_order(self):
+        workers = executor.compute_workers()
+        executor.configure_compute_pool(2)
+        self.addCleanup(executor.configure_compute_pool, workers)
+        roster = [("fulltime", {"gross_annual": 300_000 + 10_000 * i}) for i in range(9)]
+
+        pooled = asyncio.run(run_batch(roster, chunk_size=2))
+
+        self.assertEqual(pooled, compute_chunk(roster))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,550 @@
+import importlib
+import json
+import unittest
+import warnings
+
+
+class ComputeApiTestCase(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore", DeprecationWarning)
+                testclient = importlib.import_module("fastapi.testclient")
+            main = importlib.import_module("api.main")
+        except ModuleNotFoundError as exc:
+            raise unittest.SkipTest(f"backend dependency missing: {exc.name}")
+        cls.client = testclient.TestClient(main.app)
+
+    def post(self, path: str, body: dict):
+        resp = self.client.post(path, json=body)
+        self.assertEqual(resp.status_code, 200, resp.text)
+        return resp.json()
+
+
+class CurveBreakpointTests(ComputeApiTestCase):
+    def test_breakpoint_vertices_lie_on_engine_curve(self):
+        vertices = self.post("/api/compute/curve", {"mode": "breakpoints"})
+
+        self.assertEqual(vertices[0]["gross_annual"], 0)
+        self.assertEqual(vertices[-1]["gross_annual"], 1_200_000)
+        self.assertIsNone(vertices[-1]["net_slope"])
+        for row in vertices:
+            engine = self.post("/api/compute/fulltime", {"gross_annual": row["gross_annual"]})
+            self.assertAlmostEqual(row["net_monthly"], engine["net_monthly"], delta=1)
+
+    def test_segment_slopes_match_vertex_differences(self):
+        vertices = self.post("/api/compute/curve", {"mode": "breakpoints", "max_gross": 2_000_000})
+        for a, b in zip(vertices, vertices[1:]):
+            if b["gross_annual"] - a["gross_annual"] < 10_000:
+                continue
+            slope = (b["net_monthly"] - a["net_monthly"]) / (b["gross_monthly"] - a["gross_monthly"])
+            self.assertAlmostEqual(slope, a["net_slope"], places=3)
+
+
+class CurveStreamingTests(ComputeApiTestCase):
+    def test_ndjson_stream_matches_json_rows(self):
+        body = {"step_monthly": 250, "max_gross": 1_500_000, "min_gross": 120_000}
+        rows = self.post("/api/compute/curve", body)
+        resp = self.client.post("/api/compute/curve", json={**body, "format": "ndjson"})
+
+        self.assertEqual(resp.headers["content-type"], "application/x-ndjson")
+        self.assertEqual([json.loads(line) for line in resp.text.splitlines()], rows)
+
+    def test_oversized_grid_is_rejected_before_computing(self):
+        body = {"step_monthly": 1, "max_gross": 1_000_000_000}
+        self.assertIn("limit", self.post("/api/compute/curve", body)["error"])
+        self.assertIn("limit", self.post("/api/compute/hours-curve",
+                                         {"hourly_rate": 150, "max_hours": 10**9})["error"])
+
+    def test_empty_or_negative_grid_is_a_validation_error(self):
+        for points in (0, -5):
+            resp = self.client.post("/api/compute/curve", json={"points": points})
+            self.assertEqual(resp.status_code, 422)
+
+    def test_time_budget_stops_long_requests(self):
+        compute = importlib.import_module("api.routers.compute")
+        executor = importlib.import_module("api.executor")
+        # The patched budget only exists in this process
+        workers = executor.compute_workers()
+        executor.configure_compute_pool(0)
+        self.addCleanup(executor.configure_compute_pool, workers)
+        budget = compute.CURVE_TIME_BUDGET_S
+        compute.CURVE_TIME_BUDGET_S = 0.0
+        self.addCleanup(setattr, compute, "CURVE_TIME_BUDGET_S", budget)
+        compute.curve_cache.clear()
+
+        # Not a pinned default curve
+        self.assertIn("time budget", self.post("/api/compute/curve", {"points": 60})["error"])
+        resp = self.client.post("/api/compute/curve", json={"format": "ndjson"})
+        self.assertIn("error", json.loads(resp.text.splitlines()[-1]))
+
+
+class HoursCurveRangeTests(ComputeApiTestCase):
+    def test_min_hours_step_and_points(self):
+        stepped = self.post("/api/compute/hours-curve",
+                            {"hourly_rate": 180, "min_hours": 40, "max_hours": 60, "step": 10})
+        spaced = self.post("/api/compute/hours-curve",
+                           {"hourly_rate": 180, "min_hours": 10, "max_hours": 20, "points": 5})
+
+        self.assertEqual([row["hours_month"] for row in stepped], [40, 50, 60])
+        self.assertEqual([row["hours_month"] for row in spaced], [10, 12.5, 15, 17.5, 20])
+        single = self.post("/api/compute/parttime", {"hourly_rate": 180, "hours_month": 12.5})
+        self.assertEqual(spaced[1]["net_monthly"], round(single["net_monthly"]))
+
+    def test_oversized_points_are_rejected_before_building_the_grid(self):
+        from unittest import mock
+        from api.models import HoursCurveRequest
+        from api.routers import compute
+
+        req = HoursCurveRequest(hourly_rate=180, points=2_000_000)
+        with mock.patch.object(compute.np, "linspace", side_effect=AssertionError("grid built")):
+            out = compute._compute_hours_curve(req)
+        self.assertEqual(out, {"error": "Curve has 2000000 points, limit is 20000 "
+                                        "(use a larger step or format=ndjson)"})
+
+        resp = self.client.post("/api/compute/hours-curve", json={"hourly_rate": 180, "points": 20_000_000})
+        self.assertEqual(resp.status_code, 422)
+
+    def test_refine_adds_exact_slope_changes(self):
+        body = {"hourly_rate": 180, "max_hours": 220, "step": 20}
+        coarse = self.post("/api/compute/hours-curve", body)
+        refined = self.post("/api/compute/hours-curve", {**body, "refine": True})
+
+        added = [row for row in refined if row not in coarse]
+        self.assertTrue(added)
+        self.assertEqual(len(refined), len(coarse) + len(added))
+        hours = [row["hours_month"] for row in refined]
+        self.assertEqual(hours, sorted(hours))
+        for row in added:
+            single = self.post("/api/compute/parttime", {"hourly_rate": 180, "hours_month": row["hours_month"]})
+            self.assertAlmostEqual(row["net_monthly"], single["net_monthly"], delta=1)
+
+
+class CurveColumnarTests(ComputeApiTestCase):
+    def test_columnar_is_rows_transposed(self):
+        for path, body in (("/api/compute/curve", {"step_monthly": 500}),
+                           ("/api/compute/hours-curve", {"hourly_rate": 150}),
+                           ("/api/compute/student-hours-curve", {"hourly_rate": 150})):
+            rows = self.post(path, body)
+            columns = self.post(path, {**body, "format": "columnar"})
+
+            self.assertEqual(list(columns), list(rows[0]))
+            for key, values in columns.items():
+                self.assertEqual(values, [row[key] for row in rows])
+
+    def test_columnar_errors_are_not_transposed(self):
+        body = self.post("/api/compute/curve", {"format": "columnar", "kommune": "Atlantis"})
+        self.assertEqual(body, {"error": "Unknown kommune: Atlantis"})
+
+
+class CurveResponseCacheTests(ComputeApiTestCase):
+    def setUp(self):
+        importlib.import_module("api.response_cache").curve_cache.clear()
+
+    def test_repeat_request_is_served_from_cache_with_same_etag(self):
+        cache = importlib.import_module("api.response_cache").curve_cache
+        first = self.client.post("/api/compute/hours-curve", json={"hourly_rate": 150})
+        # Same validated model: int vs float and key order do not matter
+        second = self.client.post("/api/compute/hours-curve",
+                                  json={"max_hours": 220, "hourly_rate": 150.0})
+
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(first.headers["etag"], second.headers["etag"])
+        self.assertEqual(first.content, second.content)
+        self.assertEqual((cache.stats()["hits"], cache.stats()["misses"]), (1, 1))
+
+    def test_if_none_match_returns_304(self):
+        first = self.client.post("/api/compute/curve", json={"points": 20})
+        etag = first.headers["etag"]
+
+        resp = self.client.post("/api/compute/curve", json={"points": 20},
+                                headers={"If-None-Match": etag})
+        self.assertEqual(resp.status_code, 304)
+        self.assertEqual(resp.content, b"")
+
+        changed = self.client.post("/api/compute/curve", json={"points": 21},
+                                   headers={"If-None-Match": etag})
+        self.assertEqual(changed.status_code, 200)
+        self.assertNotEqual(changed.headers["etag"], etag)
+
+    def test_errors_and_streams_are_not_cached(self):
+        cache = importlib.import_module("api.response_cache").curve_cache
+        self.assertIn("error", self.post("/api/compute/curve", {"kommune": "Atlantis"}))
+        stream = self.client.post("/api/compute/curve", json={"format": "ndjson"})
+
+        self.assertNotIn("etag", stream.headers)
+        self.assertEqual(cache.stats()["entries"], 0)
+
+
+class DefaultCurveTests(ComputeApiTestCase):
+    # The chart bodies Results.tsx sends after a default Wizard run
+    WIZARD_CHART = {
+        "pension_pct": 4, "employer_pension_pct": 8, "pension_type": "standard", "is_church": False,
+        "other_pay_monthly": 0, "taxable_benefits_monthly": 0, "pretax_deductions_monthly": 0,
+        "aftertax_deductions_monthly": 0, "transport_km": 0, "union_fees_annual": 0,
+    }
+    FRONTEND_BODIES = [
+        ("/api/compute/curve", {**WIZARD_CHART, "kommune": "Aarhus", "is_hourly": False, "atp_monthly": 99,
+                                "max_gross": 1_680_000, "step_monthly": 500}),
+        ("/api/compute/curve", {**WIZARD_CHART, "kommune": "Aarhus", "is_hourly": True, "atp_monthly": 33,
+                                "max_gross": 1_680_000, "step_monthly": 500}),
+        ("/api/compute/hours-curve", {**WIZARD_CHART, "hourly_rate": 180, "kommune": "Aarhus",
+                                      "atp_monthly": 33, "max_hours": 220}),
+        ("/api/compute/curve", {"kommune": "København", "pension_pct": 4, "employer_pension_pct": 8,
+                                "is_church": True, "is_hourly": False, "atp_monthly": 99,
+                                "max_gross": 1_680_000, "step_monthly": 500}),
+    ]
+
+    def test_frontend_default_bodies_are_pinned_at_startup(self):
+        main = importlib.import_module("api.main")
+        cache = importlib.import_module("api.response_cache").curve_cache
+        kommuner = self.client.get("/api/meta").json()["kommuner"]
+        computed = [self.post(path, body) for path, body in self.FRONTEND_BODIES]
+
+        with type(self.client)(main.app) as client:     # runs the lifespan hook
+            self.assertEqual(cache.stats()["pinned"], 3 * len(kommuner) + 1)
+            cache.clear()
+            served = [client.post(path, json=body) for path, body in self.FRONTEND_BODIES]
+
+        self.assertEqual([resp.json() for resp in served], computed)
+        self.assertEqual(cache.stats()["misses"], 0)
+        self.assertEqual(cache.stats()["hits"], len(self.FRONTEND_BODIES))
+
+
+class KommuneSweepTests(ComputeApiTestCase):
+    def test_sweep_is_ranked_and_matches_single_calculations(self):
+        sweep = self.post("/api/compute/kommune-sweep", {"gross_annual": 550_000, "is_church": False})
+        kommuner = self.client.get("/api/meta").json()["kommuner"]
+
+        self.assertEqual(sorted(sweep["kommune"]), sorted(kommuner))
+        self.assertEqual(sweep["net_monthly"], sorted(sweep["net_monthly"], reverse=True))
+        self.assertEqual(sweep["behind_best_monthly"][0], 0)
+        for i in (0, 40, len(sweep["kommune"]) - 1):
+            for church, key in ((False, "net_monthly"), (True, "net_monthly_church")):
+                single = self.post("/api/compute/fulltime", {
+                    "gross_annual": 550_000, "kommune": sweep["kommune"][i], "is_church": church,
+                })
+                self.assertAlmostEqual(sweep[key][i], single["net_monthly"], places=6)
+
+    def test_church_ranking_uses_church_variant(self):
+        sweep = self.post("/api/compute/kommune-sweep", {"gross_annual": 550_000, "is_church": True})
+        self.assertEqual(sweep["net_monthly_church"],
+                         sorted(sweep["net_monthly_church"], reverse=True))
+
+
+class BatchEndpointTests(ComputeApiTestCase):
+    def test_mixed_batch_returns_results_in_order(self):
+        body = self.post("/api/compute/batch", {"items": [
+            {"type": "student", "params": {"work_gross_monthly": 9_000}},
+            {"type": "fulltime", "params": {"gross_annual": 540_000, "kommune": "Atlantis"}},
+            {"type": "fulltime", "params": {"gross_annual": 540_000}},
+        ]})
+
+        results = body["results"]
+        self.assertEqual(results[0], self.post("/api/compute/student", {"work_gross_monthly": 9_000}))
+        self.assertEqual(results[1], {"error": "Unknown kommune: Atlantis"})
+        self.assertEqual(results[2], self.post("/api/compute/fulltime", {"gross_annual": 540_000}))
+
+    def test_unknown_type_fails_only_its_item(self):
+        body = self.post("/api/compute/batch", {"items": [
+            {"type": "freelance", "params": {"gross_annual": 540_000}},
+            {"type": "fulltime", "params": {"gross_annual": 540_000}},
+        ]})
+
+        results = body["results"]
+        self.assertEqual(results[0], {"error": "Unknown type: freelance (expected one of fulltime, parttime, student)"})
+        self.assertEqual(results[1], self.post("/api/compute/fulltime", {"gross_annual": 540_000}))
+
+
+class MultiComparisonTests(ComputeApiTestCase):
+    def assertNestedAlmostEqual(self, a, b, path="result"):
+        if isinstance(a, dict):
+            self.assertEqual(set(a), set(b), path)
+            for key in a:
+                self.assertNestedAlmostEqual(a[key], b[key], f"{path}.{key}")
+        elif isinstance(a, list):
+            self.assertEqual(len(a), len(b), path)
+            for i, (x, y) in enumerate(zip(a, b)):
+                self.assertNestedAlmostEqual(x, y, f"{path}[{i}]")
+        elif isinstance(a, float) and isinstance(b, float):
+            self.assertAlmostEqual(a, b, delta=1e-6 * max(1.0, abs(b)), msg=path)
+        else:
+            self.assertEqual(a, b, path)
+
+    def test_matches_pairwise_comparisons_and_dedupes(self):
+        base = {"gross_annual": 520_000, "other_pay_monthly": 1_250.5, "pretax_deductions_monthly": 730.25}
+        offer = {"gross_annual": 600_000, "kommune": "Gentofte", "employer_pension_pct": 12,
+                 "other_pay_monthly": 333.33, "taxable_benefits_monthly": 410}
+        hourly = {"employment_type": "parttime", "hourly_rate": 210, "hours_month": 120,
+                  "pension_type": "section53a", "pretax_deductions_monthly": 512.4}
+        projection = {"years": 10, "salary_growth_pct": 3}
+        body = self.post("/api/compute/comparison/multi", {
+            "scenarios": [base, offer, hourly, offer],
+            "projection": projection,
+        })
+
+        self.assertEqual(body["unique_scenarios"], 3)
+        self.assertEqual(body["unique_projections"], 3)
+        for i, other in enumerate((base, offer, hourly, offer)):
+            pair = self.post("/api/compute/comparison", {
+                "scenario_a": base, "scenario_b": other, "projection": projection,
+            })
+            self.assertNestedAlmostEqual(body["scenarios"][i], pair["scenario_b"])
+            self.assertNestedAlmostEqual(body["deltas"][i], pair["delta"])
+            self.assertNestedAlmostEqual(body["projections"][i], pair["projection_b"])
+            self.assertNestedAlmostEqual(body["projection_deltas"][i], pair["projection_delta"])
+
+    def test_baseline_and_per_scenario_projections(self):
+        body = self.post("/api/compute/comparison/multi", {
+            "scenarios": [{"gross_annual": 480_000}, {"gross_annual": 560_000}],
+            "baseline": 1,
+            "projections": [{"years": 3}, None],
+        })
+        self.assertEqual(body["deltas"][1]["net_annual"], 0.0)
+        self.assertLess(body["deltas"][0]["net_annual"], 0)
+        self.assertEqual(len(body["projections"][0]["years"]), 3)
+        self.assertIsNone(body["projections"][1])
+        self.assertEqual(body["projection_deltas"], [None, None])
+
+    def test_errors(self):
+        scenarios = [{"gross_annual": 480_000}, {"gross_annual": 500_000, "kommune": "Atlantis"}]
+        self.assertEqual(self.post("/api/compute/comparison/multi", {"scenarios": scenarios}),
+                         {"error": "Unknown kommune: Atlantis"})
+        self.assertIn("error", self.post("/api/compute/comparison/multi",
+                                         {"scenarios": scenarios[:1], "baseline": 1}))
+        self.assertIn("error", self.post("/api/compute/comparison/multi",
+                                         {"scenarios": scenarios[:1], "projections": []}))
+
+
+class PayrollUploadTests(ComputeApiTestCase):
+    def test_csv_upload_streams_results_back(self):
+        resp = self.client.post(
+            "/api/compute/payroll",
+            content=b"employee_id,gross_annual\nA1,540000\nA2,\n",
+            headers={"content-type": "text/csv"},
+        )
+
+        self.assertEqual(resp.status_code, 200)
+        self.assertTrue(resp.headers["content-type"].startswith("text/csv"))
+        header, first, second = resp.text.splitlines()
+        self.assertTrue(header.startswith("employee_id,gross_annual,am_bidrag"))
+        single = self.post("/api/compute/fulltime", {"gross_annual": 540_000})
+        self.assertIn(f"{round(single['net_monthly'], 2)}", first)
+        self.assertTrue(second.endswith("gross_annual: Field required"))
+
+    def test_upload_spooled_to_disk(self):
+        from unittest import mock
+        from api.routers import compute
+
+        rows = "".join(f"E{i},{400_000 + i}\n" for i in range(2_000))
+        with mock.patch.object(compute, "_PAYROLL_SPOOL_BYTES", 1024):
+            resp = self.client.post("/api/compute/payroll", content=f"employee_id,gross_annual\n{rows}".encode())
+
+        lines = resp.text.splitlines()
+        self.assertEqual(len(lines), 2_001)
+        self.assertTrue(lines[-1].startswith("E1999,401999"))
+
+    def test_header_without_pay_columns_is_rejected(self):
+        body = self.client.post("/api/compute/payroll", content=b"id,kommune\n1,Aarhus\n").json()
+        self.assertIn("gross_annual", body["error"])
+
+
+class GridTests(ComputeApiTestCase):
+    def test_cells_match_single_calculations(self):
+        grid = self.post("/api/compute/grid", {
+            "x": {"field": "gross_annual", "start": 300_000, "stop": 900_000, "points": 4},
+            "y": {"field": "pension_pct", "start": 0, "stop": 10, "points": 3},
+        })
+
+        self.assertEqual(len(grid["values"]), 3)
+        self.assertEqual(len(grid["values"][0]), 4)
+        for j, pension in enumerate(grid["y"]["values"]):
+            for i, gross in enumerate(grid["x"]["values"]):
+                single = self.post("/api/compute/fulltime", {"gross_annual": gross, "pension_pct": pension})
+                self.assertAlmostEqual(grid["values"][j][i], single["net_monthly"], delta=0.01)
+
+    def test_student_hours_grid(self):
+        grid = self.post("/api/compute/grid", {
+            "base": "student",
+            "x": {"field": "hourly_rate", "start": 150, "stop": 200, "points": 2},
+            "y": {"field": "hours_month", "start": 40, "stop": 120, "points": 3},
+        })
+        single = self.post("/api/compute/student", {"work_gross_monthly": 200 * 120})
+        self.assertAlmostEqual(grid["values"][2][1], single["net_monthly"], delta=0.01)
+
+    def test_invalid_grids_are_reported(self):
+        axis = {"field": "gross_annual", "start": 0, "stop": 1_000_000, "points": 1_000}
+        too_big = self.post("/api/compute/grid", {"x": axis, "y": {**axis, "field": "pension_pct"}})
+        self.assertIn("limit", too_big["error"])
+
+        same = self.post("/api/compute/grid", {"x": axis, "y": axis})
+        self.assertEqual(same, {"error": "x and y must vary different fields"})
+
+        bad = self.post("/api/compute/grid", {"x": {**axis, "field": "kommune"}, "y": axis})
+        self.assertEqual(bad, {"error": "Unsupported employee grid axis: kommune"})
+
+    def test_conflicting_pay_axes_are_rejected(self):
+        axis = {"start": 100, "stop": 200, "points": 3}
+        for base, x, y in (
+            ("employee", "gross_annual", "gross_monthly"),
+            ("employee", "gross_annual", "hours_month"),
+            ("employee", "gross_annual", "hourly_rate"),
+            ("employee", "gross_monthly", "hours_month"),
+            ("employee", "gross_monthly", "hourly_rate"),
+            ("student", "work_gross_monthly", "hours_month"),
+            ("student", "work_gross_monthly", "hourly_rate"),
+        ):
+            out = self.post("/api/compute/grid", {
+                "base": base, "x": {**axis, "field": x}, "y": {**axis, "field": y},
+                "hourly_rate": 180, "hours_month": 100,
+            })
+            self.assertEqual(out, {"error": f"{x} and {y} both set the pay; vary only one of them"})
+
+
+class InverseTests(ComputeApiTestCase):
+    def test_gross_for_fulltime_target(self):
+        out = self.post("/api/compute/inverse", {"target_net_monthly": 30_000})
+        self.assertFalse(out["already_met"])
+        net = self.post("/api/compute/fulltime", {"gross_annual": out["gross_annual"]})
+        self.assertAlmostEqual(net["net_monthly"], 30_000, places=4)
+
+    def test_hours_month_uses_parttime_defaults(self):
+        out = self.post("/api/compute/inverse", {
+            "target_net_monthly": 12_000, "service_type": "parttime",
+            "solve_for": "hours_month", "hourly_rate": 180,
+        })
+        net = self.post("/api/compute/parttime", {"hourly_rate": 180, "hours_month": out["hours_month"]})
+        self.assertAlmostEqual(net["net_monthly"], 12_000, places=4)
+
+    def test_student_work_income_uses_student_defaults(self):
+        out = self.post("/api/compute/inverse", {"target_net_monthly": 10_000, "service_type": "student"})
+        net = self.post("/api/compute/student", {"work_gross_monthly": out["gross_monthly"]})
+        self.assertAlmostEqual(net["net_monthly"], 10_000, places=4)
+
+    def test_student_target_already_met_by_su(self):
+        out = self.post("/api/compute/inverse", {"target_net_monthly": 3_000, "service_type": "student"})
+        self.assertTrue(out["already_met"])
+        self.assertEqual(out["gross_monthly"], 0.0)
+        self.assertGreaterEqual(out["net_monthly"], 3_000)
+
+    def test_unreachable_target(self):
+        # Contributions above 100 % make net income fall as gross rises
+        out = self.post("/api/compute/inverse", {"target_net_monthly": 10_000, "pension_pct": 120})
+        self.assertEqual(out, {"error": "Target net income is not reachable with these settings"})
+
+
+class PayslipEndpointTests(ComputeApiTestCase):
+    def test_month_totals_settle_to_annual_net_for_every_payout(self):
+        scenario = {"gross_annual": 620_000, "transport_km": 40}
+        annual = self.post("/api/compute/fulltime", scenario)
+        for payout in ("may", "may_august", "monthly"):
+            out = self.post("/api/compute/payslip", {"scenario": scenario, "ferie_payout": payout})
+            self.assertEqual(out["ferie_payout"], payout)
+            self.assertEqual(len(out["months"]), 12)
+            net_pay = sum(month["net_pay"] for month in out["months"])
+            self.assertAlmostEqual(net_pay, out["totals"]["net_pay"], places=6)
+            self.assertAlmostEqual(net_pay + out["year_end_settlement"], out["annual_net"], places=6)
+            self.assertAlmostEqual(out["annual_net"], annual["net_annual"], places=6)
+            if payout == "monthly":
+                self.assertAlmostEqual(out["year_end_settlement"], 0.0, places=6)
+
+    def test_rejects_unknown_payout(self):
+        resp = self.client.post("/api/compute/payslip",
+                                json={"scenario": {"gross_annual": 500_000}, "ferie_payout": "june"})
+        self.assertEqual(resp.status_code, 422)
+
+
+class MonteCarloEndpointTests(ComputeApiTestCase):
+    body = {
+        "scenario": {"gross_annual": 540_000},
+        "settings": {"years": 8},
+        "monte_carlo": {"paths": 500, "seed": 7},
+    }
+
+    def test_response_shape_and_bands(self):
+        out = self.post("/api/compute/projection/monte-carlo", self.body)
+
+        self.assertEqual(out["percentiles"], [5, 50, 95])
+        self.assertEqual(out["monte_carlo"]["paths"], 500)
+        self.assertEqual([row["year"] for row in out["years"]], list(range(1, 9)))
+        for row in out["years"]:
+            for field in ("gross_annual", "net_annual", "net_monthly", "tax",
+                          "total_pension", "projected_pension_balance"):
+                band = row[field]
+                self.assertLessEqual(band["p5"], band["p50"])
+                self.assertLessEqual(band["p50"], band["p95"])
+        self.assertEqual(out["final_balance"], out["years"][-1]["projected_pension_balance"])
+
+    def test_seed_makes_results_reproducible(self):
+        first = self.post("/api/compute/projection/monte-carlo", self.body)
+        again = self.post("/api/compute/projection/monte-carlo", self.body)
+        other = self.post("/api/compute/projection/monte-carlo",
+                          {**self.body, "monte_carlo": {"paths": 500, "seed": 8}})
+
+        self.assertEqual(first, again)
+        self.assertNotEqual(first["final_balance"], other["final_balance"])
+
+    def test_validation(self):
+        for monte_carlo in ({"paths": 0}, {"paths": 20_001}, {"seed": -1}, {"return_volatility_pct": -1}):
+            resp = self.client.post("/api/compute/projection/monte-carlo",
+                                    json={**self.body, "monte_carlo": monte_carlo})
+            self.assertEqual(resp.status_code, 422, monte_carlo)
+        resp = self.client.post("/api/compute/projection/monte-carlo", json={**self.body, "settings": {"years": 0}})
+        self.assertEqual(resp.status_code, 422)
+
+        unknown = self.post("/api/compute/projection/monte-carlo",
+                            {**self.body, "scenario": {"gross_annual": 540_000, "kommune": "Atlantis"}})
+        self.assertEqual(unknown, {"error": "Unknown kommune: Atlantis"})
+
+
+class OptimizeEndpointTests(ComputeApiTestCase):
+    scenario = {"gross_annual": 650_000, "kommune": "Aarhus"}
+
+    def test_response_shape_and_breakdown(self):
+        out = self.post("/api/compute/optimize", {"scenario": self.scenario,
+                                                   "settings": {"min_net_monthly": 29_000}})
+
+        optimum = out["optimum"]
+        self.assertEqual(set(optimum), {"pension_type", "pension_pct", "benefit_monthly",
+                                        "objective_value", "net_monthly"})
+        self.assertEqual(out["binding_constraints"], ["min_net_monthly"])
+        self.assertEqual(set(out["by_pension_type"]), {"standard", "section53a"})
+        self.assertAlmostEqual(out["gain_annual"],
+                               optimum["objective_value"] - out["current"]["objective_value"], places=6)
+        single = self.post("/api/compute/fulltime", {
+            **self.scenario, "pension_pct": optimum["pension_pct"], "pension_type": optimum["pension_type"],
+        })
+        self.assertAlmostEqual(single["net_monthly"], 29_000, places=4)
+        self.assertAlmostEqual(out["result"]["net_monthly"], single["net_monthly"], places=6)
+
+    def test_unreachable_minimum_net(self):
+        out = self.post("/api/compute/optimize", {"scenario": self.scenario,
+                                                   "settings": {"min_net_monthly": 80_000}})
+        self.assertEqual(out, {"error": "Minimum net income is not reachable with these settings"})
+
+    def test_validation(self):
+        for settings in ({"max_pension_pct": 150}, {"pension_types": []}, {"pension_types": ["roth"]},
+                         {"objective": "net"}, {"min_net_monthly": -1}):
+            resp = self.client.post("/api/compute/optimize", json={"scenario": self.scenario, "settings": settings})
+            self.assertEqual(resp.status_code, 422, settings)
+
+        swapped = self.post("/api/compute/optimize", {
+            "scenario": self.scenario, "settings": {"min_pension_pct": 10, "max_pension_pct": 5}})
+        self.assertEqual(swapped, {"error": "min_pension_pct must not exceed max_pension_pct"})
+
+
+class TaxYearTests(ComputeApiTestCase):
+    def test_unsupported_tax_year_is_reported(self):
+        body = self.post("/api/compute/fulltime", {"gross_annual": 500_000, "tax_year": 1999})
+        self.assertEqual(body, {"error": "Unsupported tax year: 1999"})
+
+    def test_explicit_current_year_matches_default(self):
+        year = self.client.get("/api/meta").json()["tax_year"]
+        default = self.post("/api/compute/fulltime", {"gross_annual": 500_000})
+        explicit = self.post("/api/compute/fulltime", {"gross_annual": 500_000, "tax_year": year})
+        self.assertEqual(default, explicit)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+import unittest
+
+from api.engine_cache import EngineCache
+from api.models import ComparisonRequest, EmployeeScenarioRequest
+from api.tax_engine import compute_tax, compute_student_income
+
+
+class EngineCacheTests(unittest.TestCase):
+    def test_disabled_cache_passes_through_without_counting(self):
+        cache = EngineCache(compute_tax)
+        result = cache(gross_annual=500_000, pension_pct=0.04, kommune_pct=23.39,
+                       kirke_pct=0.8, is_church=True)
+
+        self.assertEqual(result.net_annual, compute_tax(500_000, 0.04, 23.39, 0.8, True).net_annual)
+        self.assertEqual(cache.stats()["hits"] + cache.stats()["misses"], 0)
+
+    def test_equivalent_inputs_share_one_entry(self):
+        cache = EngineCache(compute_tax, maxsize=8)
+        base = dict(pension_pct=0.04, kommune_pct=23.39, kirke_pct=0.8, is_church=True)
+
+        first = cache(gross_annual=500_000, atp_monthly=94.65, **base)
+        # int vs float, float noise from ×12 / ÷100 conversions, explicit defaults
+        second = cache(gross_annual=500_000.0, atp_monthly=1135.8000000000002 / 12,
+                       employer_pension_pct=0.0, pension_type="standard", **base)
+
+        self.assertIs(first, second)
+        self.assertEqual(cache.stats()["hits"], 1)
+        self.assertEqual(cache.stats()["misses"], 1)
+        self.assertAlmostEqual(
+            first.net_annual, compute_tax(500_000, atp_monthly=94.65, **base).net_annual, places=6)
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = EngineCache(compute_student_income, maxsize=2)
+        args = dict(pension_pct=0.0, kommune_pct=25.0, kirke_pct=0.9, is_church=True)
+
+        cache(su_monthly=7_426, work_gross_monthly=10_000, **args)
+        cache(su_monthly=7_426, work_gross_monthly=12_000, **args)
+        cache(su_monthly=7_426, work_gross_monthly=10_000, **args)    # refresh 10k
+        cache(su_monthly=7_426, work_gross_monthly=14_000, **args)    # evicts 12k
+        cache(su_monthly=7_426, work_gross_monthly=10_000, **args)
+
+        stats = cache.stats()
+        self.assertEqual(stats["size"], 2)
+        self.assertEqual((stats["hits"], stats["misses"]), (2, 3))
+
+    def test_missing_argument_still_raises(self):
+        cache = EngineCache(compute_tax, maxsize=8)
+        with self.assertRaises(TypeError):
+            cache(gross_annual=500_000)
+
+
+class ComparisonCacheTests(unittest.TestCase):
+    def test_unchanged_scenario_is_served_from_cache(self):
+        from api import engine_cache
+        from api.routers.compute import compute_comparison
+
+        engine_cache.configure_engine_cache(64)
+        self.addCleanup(engine_cache.configure_engine_cache, 0)
+        scenario_a = EmployeeScenarioRequest(gross_annual=540_000)
+
+        for gross in (600_000, 650_000):
+            compute_comparison(ComparisonRequest(
+                scenario_a=scenario_a,
+                scenario_b=EmployeeScenarioRequest(gross_annual=gross),
+            ))
+
+        stats = engine_cache.engine_cache_stats()["compute_tax"]
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 3))
+
+    def test_stats_endpoint_states_its_scope(self):
+        from api.executor import compute_workers
+        from api.routers.meta import get_engine_cache_stats
+
+        stats = get_engine_cache_stats()
+        self.assertEqual(stats["scope"], "main process")
+        self.assertEqual(stats["compute_workers"], compute_workers())
+        self.assertIn("hits", stats["compute_tax"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,37 @@
+import asyncio
+import os
+import unittest
+
+from api import executor
+
+
+class ComputePoolTests(unittest.TestCase):
+    def setUp(self):
+        workers = executor.compute_workers()
+        self.addCleanup(executor.configure_compute_pool, workers)
+
+    def test_pool_runs_tasks_in_worker_processes(self):
+        executor.configure_compute_pool(2)
+
+        pids = asyncio.run(executor.map_cpu_bound(os.getpid, []))
+        self.assertEqual(pids, [])
+        pid = asyncio.run(executor.run_cpu_bound(os.getpid))
+
+        self.assertNotEqual(pid, os.getpid())
+        self.assertTrue(executor.pool_stats()["started"])
+
+    def test_disabled_pool_runs_in_this_process(self):
+        executor.configure_compute_pool(0)
+
+        self.assertIsNone(executor.get_pool())
+        self.assertEqual(asyncio.run(executor.run_cpu_bound(os.getpid)), os.getpid())
+
+    def test_map_keeps_input_order(self):
+        executor.configure_compute_pool(2)
+        values = [9, 1, 8, 2, 7]
+
+        self.assertEqual(asyncio.run(executor.map_cpu_bound(abs, [-v for v in values])), values)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+import csv
+import io
+import os
+import tempfile
+import unittest
+
+from api import executor
+from api.payroll import iter_payroll_csv, payroll_header_error, process_file
+
+PAYROLL_CSV = """\
+employee_id,gross_annual,hourly_rate,hours_month,kommune,pension_pct,is_church
+1,540000,,,København,,true
+2,,180,80,Aarhus,,false
+3,abc,,,,,
+4,540000,,,Atlantis,,
+"""
+
+
+def _rows(text: str) -> list[dict]:
+    return list(csv.DictReader(io.StringIO(text)))
+
+
+class PayrollTests(unittest.TestCase):
+    def setUp(self):
+        workers = executor.compute_workers()
+        executor.configure_compute_pool(0)
+        self.addCleanup(executor.configure_compute_pool, workers)
+
+    def test_rows_match_single_endpoints(self):
+        from api.models import FullTimeRequest, PartTimeRequest
+        from api.routers.compute import compute_fulltime, compute_parttime
+
+        out = _rows("".join(iter_payroll_csv(csv.DictReader(io.StringIO(PAYROLL_CSV)))))
+        fulltime = compute_fulltime(FullTimeRequest(gross_annual=540_000))
+        parttime = compute_parttime(PartTimeRequest(
+            hourly_rate=180, hours_month=80, kommune="Aarhus", is_church=False))
+
+        self.assertEqual([row["employee_id"] for row in out], ["1", "2", "3", "4"])
+        for row, single in ((out[0], fulltime), (out[1], parttime)):
+            self.assertEqual(row["error"], "")
+            for key in ("gross_annual", "am_bidrag", "total_income_tax", "net_monthly"):
+                self.assertAlmostEqual(float(row[key]), single[key], places=2)
+
+    def test_bad_rows_get_their_own_error(self):
+        out = _rows("".join(iter_payroll_csv(csv.DictReader(io.StringIO(PAYROLL_CSV)))))
+
+        self.assertIn("gross_annual", out[2]["error"])
+        self.assertEqual(out[2]["net_monthly"], "")
+        self.assertEqual(out[3]["error"], "Unknown kommune: Atlantis")
+
+    def test_pooled_blocks_are_written_in_input_order(self):
+        lines = ["employee_id,gross_annual"] + [f"{i},{300_000 + 10_000 * i}" for i in range(11)]
+        with tempfile.TemporaryDirectory() as tmp:
+            src, dst = os.path.join(tmp, "in.csv"), os.path.join(tmp, "out.csv")
+            with open(src, "w", newline="") as f:
+                f.write("\n".join(lines) + "\n")
+
+            executor.configure_compute_pool(2)
+            self.assertEqual(process_file(src, dst, block_size=2), 11)
+            executor.configure_compute_pool(0)
+            with open(dst, newline="") as f:
+                pooled = list(csv.DictReader(f))
+
+        serial = _rows("".join(iter_payroll_csv(
+            csv.DictReader(io.StringIO("\n".join(lines) + "\n")))))
+        self.assertEqual(pooled, serial)
+
+    def test_header_must_identify_the_pay(self):
+        self.assertIsNone(payroll_header_error(["gross_annual"]))
+        self.assertIsNone(payroll_header_error(["hourly_rate", "hours_month"]))
+        self.assertIsNotNone(payroll_header_error(["hourly_rate"]))
+        self.assertIsNotNone(payroll_header_error(None))
+
+
+if __name__ == "__main__":
+    unittest.main()
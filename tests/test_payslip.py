@@ -0,0 +1,62 @@
+import unittest
+
+import numpy as np
+
+from api.models import EmployeeScenarioRequest
+from api.payslip import simulate_employee_payslips, simulate_payslips
+from api.tax_engine import compute_tax
+
+
+class PayslipSimulationTests(unittest.TestCase):
+    args = dict(
+        pension_pct=0.04,
+        kommune_pct=23.39,
+        kirke_pct=0.8,
+        is_church=True,
+        employer_pension_pct=0.08,
+        atp_monthly=94.65,
+        transport_km=50,
+    )
+
+    def test_monthly_payout_reproduces_annual_engine(self):
+        for gross in (150_000, 600_000, 1_500_000):
+            slips = simulate_payslips(gross, ferie_payout="monthly", **self.args)
+            annual = compute_tax(gross, **self.args)
+
+            np.testing.assert_allclose(slips["net_pay"], annual.net_monthly)
+            self.assertAlmostEqual(slips["am_bidrag"].sum(), annual.am_bidrag, places=6)
+            self.assertAlmostEqual(slips["income_tax"].sum(), annual.total_income_tax, places=6)
+
+    def test_ferietillaeg_is_paid_in_may_or_split_with_august(self):
+        may = simulate_payslips(600_000, ferie_payout="may", **self.args)
+        split = simulate_payslips(600_000, ferie_payout="may_august", **self.args)
+
+        self.assertEqual(may["feriepenge"][4], 6_000)
+        self.assertEqual(may["feriepenge"].sum(), 6_000)
+        self.assertEqual(split["feriepenge"][4], 3_000)
+        self.assertEqual(split["feriepenge"][7], 3_000)
+        self.assertGreater(may["net_pay"][4], may["net_pay"][0])
+        self.assertEqual(may["net_pay"][0], may["net_pay"][11])
+
+    def test_scenarios_broadcast_in_front_of_month_axis(self):
+        gross = np.array([300_000.0, 600_000.0, 900_000.0])
+        slips = simulate_payslips(gross, ferie_payout="may", **self.args)
+
+        self.assertEqual(slips["net_pay"].shape, (3, 12))
+        for i, g in enumerate(gross):
+            single = simulate_payslips(float(g), ferie_payout="may", **self.args)
+            np.testing.assert_allclose(slips["net_pay"][i], single["net_pay"])
+
+    def test_year_end_settlement_closes_the_gap_to_annual_net(self):
+        scenario = EmployeeScenarioRequest(employment_type="parttime", hourly_rate=200, hours_month=100)
+        result = simulate_employee_payslips(scenario, "may")
+
+        self.assertEqual(len(result["months"]), 12)
+        self.assertAlmostEqual(
+            result["totals"]["net_pay"] + result["year_end_settlement"], result["annual_net"], places=6)
+        # A single large May payslip crosses monthly fradrag/bracket limits
+        self.assertNotAlmostEqual(result["year_end_settlement"], 0.0, places=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
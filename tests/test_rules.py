@@ -0,0 +1,60 @@
+import dataclasses
+import unittest
+
+from api import data
+from api.rules import DEFAULT_RULES, TAX_RULES, get_rules
+from api.tax_engine import compute_tax, compute_tax_batch, compute_student_income
+from api.tax_schedule import get_schedule
+
+
+class TaxRulesTests(unittest.TestCase):
+    def test_default_rules_mirror_data_constants(self):
+        self.assertIs(get_rules(), DEFAULT_RULES)
+        self.assertIs(get_rules(data.TAX_YEAR), DEFAULT_RULES)
+        self.assertIsNone(get_rules(1999))
+        self.assertEqual(DEFAULT_RULES.personfradrag, data.PERSONFRADRAG)
+        self.assertEqual(DEFAULT_RULES.kommuner["København"]["kommuneskat"],
+                         data.KOMMUNER["København"]["kommuneskat"])
+        self.assertEqual(sorted(TAX_RULES), [data.TAX_YEAR])
+
+    def test_rules_are_frozen_and_hashable(self):
+        with self.assertRaises(dataclasses.FrozenInstanceError):
+            DEFAULT_RULES.am_rate = 0.1
+        with self.assertRaises(TypeError):
+            DEFAULT_RULES.kommuner["København"] = {}
+
+        copy = DEFAULT_RULES.replace()
+        self.assertEqual(copy, DEFAULT_RULES)
+        self.assertEqual(hash(copy), hash(DEFAULT_RULES))
+        self.assertNotEqual(DEFAULT_RULES.replace(personfradrag=60_000), DEFAULT_RULES)
+
+    def test_engine_uses_the_rules_it_is_given(self):
+        args = (500_000, 0.04, 23.39, 0.8, True)
+        indexed = DEFAULT_RULES.replace(
+            year=DEFAULT_RULES.year + 1,
+            personfradrag=DEFAULT_RULES.personfradrag + 1_000,
+        )
+        base = compute_tax(*args)
+        shifted = compute_tax(*args, rules=indexed)
+        batch = compute_tax_batch(*args, rules=indexed)
+
+        # 1,000 kr more personfradrag saves bundskat + kommuneskat + kirkeskat on it
+        saving = 1_000 * (DEFAULT_RULES.bundskat_rate + 0.2339 + 0.008)
+        self.assertAlmostEqual(shifted.net_annual - base.net_annual, saving, places=6)
+        self.assertAlmostEqual(float(batch["net_annual"]), shifted.net_annual, places=6)
+
+        student = compute_student_income(7_426, 25_000, 0.0, 25.0, 0.9, True,
+                                         rules=DEFAULT_RULES.replace(fribeloeb_laveste_vid=30_000))
+        self.assertEqual(student.fribeloeb_limit, 30_000)
+        self.assertFalse(student.over_fribeloeb)
+
+    def test_schedules_are_cached_per_ruleset(self):
+        indexed = DEFAULT_RULES.replace(topskat_threshold=800_000)
+        current = get_schedule(23.39, 0.8, True, rules=DEFAULT_RULES)
+
+        self.assertIs(current, get_schedule(23.39, 0.8, True, rules=DEFAULT_RULES.replace()))
+        self.assertIsNot(current, get_schedule(23.39, 0.8, True, rules=indexed))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,12 +1,23 @@
 import unittest
 import importlib
+import math
+import warnings
 
-from api.tax_engine import compute_tax
-from api.models import EmployeeScenarioRequest, ProjectionSettings
+import numpy as np
+
+from api.tax_engine import (
+    compute_tax,
+    compute_tax_batch,
+    compute_student_income,
+    compute_student_income_batch,
+)
+from api.models import EmployeeScenarioRequest, MonteCarloSettings, OptimizerSettings, ProjectionSettings
 from api.salary_scenarios import (
     comparison_delta,
     compute_employee_scenario,
+    optimize_employee_scenario,
     project_employee_scenario,
+    simulate_employee_projection,
 )
 
 
@@ -152,6 +163,270 @@ class PensionTreatmentTests(unittest.TestCase):
             projection["totals"]["total_pension"],
         )
 
+    def test_batched_projection_matches_year_by_year_scenarios(self):
+        scenario = EmployeeScenarioRequest(
+            employment_type="parttime", hourly_rate=180, hours_month=120,
+            kommune="Aarhus", pension_pct=5, employer_pension_pct=10,
+        )
+        settings = ProjectionSettings(years=12, annual_return_pct=6, salary_growth_pct=3)
+
+        projection = project_employee_scenario(scenario, settings)
+
+        balance = 0.0
+        for row in projection["years"]:
+            grown = scenario.model_copy(update={"hourly_rate": 180 * 1.03 ** (row["year"] - 1)})
+            single = compute_employee_scenario(grown)
+            balance = balance * 1.06 + single["total_pension"]
+            self.assertEqual(row["net_annual"], single["net_annual"])
+            self.assertEqual(row["tax"], single["am_bidrag"] + single["total_income_tax"])
+            self.assertAlmostEqual(row["projected_pension_balance"], balance, places=6)
+        self.assertAlmostEqual(projection["totals"]["projected_pension_balance"], balance, places=6)
+
+    def test_projection_balance_at_and_near_total_loss(self):
+        scenario = EmployeeScenarioRequest(gross_annual=540_000)
+        for annual_return_pct in (-100, -99.9999999):
+            settings = ProjectionSettings(years=50, annual_return_pct=annual_return_pct)
+            with warnings.catch_warnings():
+                warnings.simplefilter("error", RuntimeWarning)
+                projection = project_employee_scenario(scenario, settings)
+
+            balances = [row["projected_pension_balance"] for row in projection["years"]]
+            self.assertTrue(all(math.isfinite(b) for b in balances))
+            for row, balance in zip(projection["years"], balances):
+                self.assertAlmostEqual(balance, row["total_pension"], delta=row["total_pension"] * 1e-6)
+        self.assertEqual(projection["totals"]["projected_pension_balance"], balances[-1])
+
+        wiped = project_employee_scenario(scenario, ProjectionSettings(years=10, annual_return_pct=-100))
+        self.assertEqual(wiped["totals"]["projected_pension_balance"], wiped["years"][-1]["total_pension"])
+
+    def test_indexed_projection_matches_scalar_engine_with_indexed_rules(self):
+        from api.rules import RULES_2026
+
+        scenario = EmployeeScenarioRequest(gross_annual=600_000, kommune="Aarhus")
+        settings = ProjectionSettings(years=15, salary_growth_pct=3, threshold_indexation_pct=2.5)
+        rates = RULES_2026.kommuner["Aarhus"]
+
+        indexed = project_employee_scenario(scenario, settings)
+        fixed = project_employee_scenario(scenario, settings.model_copy(update={"threshold_indexation_pct": 0}))
+
+        for row in indexed["years"]:
+            year = row["year"] - 1
+            single = compute_tax(
+                600_000 * 1.03 ** year, 0.04, rates["kommuneskat"], rates["kirkeskat"], True,
+                employer_pension_pct=0.08, atp_monthly=94.65,
+                rules=RULES_2026.indexed(1.025 ** year),
+            )
+            self.assertEqual(row["net_annual"], single.net_annual)
+        self.assertEqual(indexed["years"][0], fixed["years"][0])
+        self.assertGreater(indexed["years"][-1]["net_annual"], fixed["years"][-1]["net_annual"])
+
+    def test_monte_carlo_without_volatility_is_the_deterministic_projection(self):
+        scenario = EmployeeScenarioRequest(gross_annual=540_000)
+        settings = ProjectionSettings(years=20, annual_return_pct=5, salary_growth_pct=2)
+
+        fixed = simulate_employee_projection(scenario, settings, MonteCarloSettings(
+            paths=4, return_volatility_pct=0, salary_growth_volatility_pct=0))
+        projection = project_employee_scenario(scenario, settings)
+
+        for band, row in zip(fixed["years"], projection["years"]):
+            self.assertAlmostEqual(band["net_annual"]["p5"], row["net_annual"], places=6)
+            self.assertAlmostEqual(band["net_annual"]["p95"], row["net_annual"], places=6)
+            self.assertAlmostEqual(band["projected_pension_balance"]["p50"],
+                                   row["projected_pension_balance"], places=4)
+
+    def test_monte_carlo_bands_are_seeded_and_ordered(self):
+        scenario = EmployeeScenarioRequest(gross_annual=540_000)
+        settings = ProjectionSettings(years=30)
+        mc = MonteCarloSettings(paths=2_000, seed=7)
+
+        first = simulate_employee_projection(scenario, settings, mc)
+
+        self.assertEqual(first, simulate_employee_projection(scenario, settings, mc))
+        self.assertNotEqual(first, simulate_employee_projection(
+            scenario, settings, mc.model_copy(update={"seed": 8})))
+        self.assertEqual(first["years"][0]["gross_annual"]["p5"], 540_000)
+        for row in first["years"][1:]:
+            for key in ("net_annual", "projected_pension_balance"):
+                self.assertLess(row[key]["p5"], row[key]["p50"])
+                self.assertLess(row[key]["p50"], row[key]["p95"])
+        single_year = simulate_employee_projection(scenario, ProjectionSettings(years=1), mc)
+        self.assertEqual(len(single_year["years"]), 1)
+
+    def test_monte_carlo_chunking_does_not_change_the_bands(self):
+        salary_scenarios = importlib.import_module("api.salary_scenarios")
+        scenario = EmployeeScenarioRequest(gross_annual=540_000)
+        settings = ProjectionSettings(years=10, threshold_indexation_pct=2)
+        mc = MonteCarloSettings(paths=250, seed=3)
+
+        whole = simulate_employee_projection(scenario, settings, mc)
+        chunk = salary_scenarios.MONTE_CARLO_CHUNK_PATHS
+        salary_scenarios.MONTE_CARLO_CHUNK_PATHS = 64
+        self.addCleanup(setattr, salary_scenarios, "MONTE_CARLO_CHUNK_PATHS", chunk)
+
+        self.assertEqual(simulate_employee_projection(scenario, settings, mc), whole)
+
+
+class OptimizerTests(unittest.TestCase):
+    scenario = EmployeeScenarioRequest(gross_annual=650_000, transport_km=40, union_fees_annual=6_000)
+
+    def brute_force(self, settings: OptimizerSettings) -> float:
+        pct, benefit = np.meshgrid(np.linspace(settings.min_pension_pct, settings.max_pension_pct, 201),
+                                   np.linspace(0, settings.max_benefit_monthly, 31))
+        best = -np.inf
+        for pension_type in settings.pension_types:
+            r = compute_tax_batch(
+                650_000, pct.ravel() / 100, 23.39, 0.80, True,
+                employer_pension_pct=0.08, atp_monthly=94.65, transport_km=40, union_fees_annual=6_000,
+                pretax_deductions_annual=benefit.ravel() * 12, pension_type=pension_type,
+            )
+            value = r["net_annual"] + r["total_pension"] + benefit.ravel() * 12
+            feasible = r["net_annual"] >= settings.min_net_monthly * 12
+            if feasible.any():
+                best = max(best, value[feasible].max())
+        return best
+
+    def test_unconstrained_optimum_is_the_pension_cap(self):
+        out = optimize_employee_scenario(self.scenario, OptimizerSettings())
+        self.assertEqual(out["optimum"]["pension_type"], "standard")
+        self.assertEqual(out["optimum"]["pension_pct"], 20.0)
+        self.assertEqual(out["binding_constraints"], ["max_pension_pct"])
+        self.assertGreater(out["gain_annual"], 0)
+
+    def test_minimum_net_binds_and_beats_grid_search(self):
+        for settings in (
+            OptimizerSettings(min_net_monthly=30_000),
+            OptimizerSettings(min_net_monthly=28_000, max_benefit_monthly=3_000),
+        ):
+            out = optimize_employee_scenario(self.scenario, settings)
+            self.assertIn("min_net_monthly", out["binding_constraints"])
+            self.assertAlmostEqual(out["result"]["net_monthly"], settings.min_net_monthly, places=6)
+            self.assertGreaterEqual(out["optimum"]["objective_value"], self.brute_force(settings) - 1e-6)
+
+    def test_unreachable_minimum_net(self):
+        out = optimize_employee_scenario(self.scenario, OptimizerSettings(min_net_monthly=60_000))
+        self.assertEqual(out, {"error": "Minimum net income is not reachable with these settings"})
+
+
+class FerieNetTests(unittest.TestCase):
+    def test_net_ferie_matches_difference_against_run_without_ferie(self):
+        for is_hourly in (False, True):
+            args = dict(
+                gross_annual=450_000,
+                pension_pct=0.04,
+                kommune_pct=25.0,
+                kirke_pct=0.9,
+                is_church=True,
+                employer_pension_pct=0.08,
+                is_hourly=is_hourly,
+                atp_monthly=94.65,
+                transport_km=60,
+            )
+            with_ferie = compute_tax(**args)
+            without_ferie = compute_tax(**args, _skip_ferie=True)
+
+            self.assertEqual(without_ferie["net_ferie"], 0.0)
+            self.assertEqual(
+                with_ferie["net_ferie"],
+                with_ferie["net_annual"] - without_ferie["net_annual"],
+            )
+
+    def test_student_net_ferie_matches_difference_across_fribeloeb(self):
+        for work in (5_000, 19_000, 40_000):
+            args = dict(
+                su_monthly=7_426,
+                work_gross_monthly=work,
+                pension_pct=0.0,
+                kommune_pct=25.0,
+                kirke_pct=0.9,
+                is_church=True,
+            )
+            with_ferie = compute_student_income(**args)
+            without_ferie = compute_student_income(**args, _skip_ferie=True)
+
+            self.assertEqual(
+                with_ferie["net_ferie"],
+                with_ferie["net_annual"] - without_ferie["net_annual"],
+            )
+
+
+class ResultObjectTests(unittest.TestCase):
+    def test_result_reads_like_the_breakdown_dict(self):
+        res = compute_tax(600_000, 0.04, 23.39, 0.8, True, atp_monthly=94.65)
+        full = res.as_dict()
+
+        self.assertEqual(list(full), list(res))
+        self.assertEqual(res["net_monthly"], res.net_monthly)
+        self.assertEqual(full["net_monthly"], full["net_annual"] / 12)
+        self.assertEqual(full["pension"], full["employee_pension"])
+        self.assertEqual({**res}, full)
+        with self.assertRaises(KeyError):
+            res["not_a_field"]
+
+    def test_as_dict_can_select_fields(self):
+        res = compute_student_income(7_426, 25_000, 0.0, 23.39, 0.8, True)
+        picked = res.as_dict(("net_monthly", "over_fribeloeb"))
+
+        self.assertEqual(picked, {"net_monthly": res.net_monthly, "over_fribeloeb": True})
+
+
+class BatchEngineTests(unittest.TestCase):
+    def test_batch_matches_scalar_engine_for_every_key(self):
+        gross = np.linspace(0, 3_000_000, 121)
+        for pension_type in ("standard", "section53a"):
+            for is_hourly in (False, True):
+                args = dict(
+                    pension_pct=0.04,
+                    kommune_pct=26.3,
+                    kirke_pct=0.8,
+                    is_church=True,
+                    employer_pension_pct=0.08,
+                    is_hourly=is_hourly,
+                    other_pay_annual=1_200,
+                    atp_monthly=94.65,
+                    transport_km=140,
+                    union_fees_annual=8_000,
+                    pension_type=pension_type,
+                )
+                batch = compute_tax_batch(gross, **args)
+                for i in range(0, len(gross), 10):
+                    scalar = compute_tax(float(gross[i]), **args)
+                    for key, value in scalar.items():
+                        if key == "pension_type":
+                            continue
+                        self.assertAlmostEqual(batch[key][i], value, places=6, msg=key)
+
+    def test_batch_broadcasts_kommune_rates(self):
+        rates = np.array([23.39, 26.3])
+        batch = compute_tax_batch(600_000, 0.04, rates, 0.8, False, atp_monthly=94.65)
+
+        self.assertEqual(batch["net_annual"].shape, (2,))
+        for i, rate in enumerate(rates):
+            scalar = compute_tax(600_000, 0.04, float(rate), 0.8, False, atp_monthly=94.65)
+            self.assertAlmostEqual(batch["net_annual"][i], scalar["net_annual"])
+
+    def test_student_batch_matches_scalar_across_fribeloeb_and_su_levels(self):
+        work = np.arange(0, 60_001, 250.0)
+        su = np.array([[0.0], [3_797.0], [7_426.0]])
+        args = dict(
+            pension_pct=0.02,
+            kommune_pct=25.0,
+            kirke_pct=0.9,
+            is_church=True,
+            employer_pension_pct=0.04,
+            atp_monthly=33,
+            transport_km=40,
+        )
+        batch = compute_student_income_batch(su, work, **args)
+
+        self.assertEqual(batch["net_annual"].shape, (3, len(work)))
+        for row, su_monthly in enumerate(su[:, 0]):
+            for col in range(0, len(work), 12):
+                scalar = compute_student_income(float(su_monthly), float(work[col]), **args)
+                for key, value in scalar.items():
+                    if key == "pension_type":
+                        continue
+                    self.assertAlmostEqual(batch[key][row, col], value, places=6, msg=key)
+
 
 if __name__ == "__main__":
     unittest.main()
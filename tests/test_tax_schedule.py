@@ -0,0 +1,83 @@
+import unittest
+
+import numpy as np
+
+from api.data import AM_RATE, MELLEMSKAT_THRESHOLD, TOPSKAT_THRESHOLD, TOPTOPSKAT_THRESHOLD
+from api.tax_engine import compute_tax, compute_student_income
+from api.tax_schedule import get_schedule, get_student_schedule
+
+
+class TaxScheduleTests(unittest.TestCase):
+    def test_schedule_matches_engine_between_and_at_breakpoints(self):
+        for pension_type in ("standard", "section53a"):
+            for is_hourly in (False, True):
+                args = dict(
+                    kommune_pct=25.6,
+                    kirke_pct=0.95,
+                    is_church=True,
+                    pension_pct=0.04,
+                    pension_type=pension_type,
+                    employer_pension_pct=0.08,
+                    atp_monthly=94.65,
+                    is_hourly=is_hourly,
+                    transport_km=60,
+                )
+                schedule = get_schedule(**args)
+                grid = list(np.linspace(0, 3_000_000, 301)) + list(schedule.breakpoints)
+                for gross in grid:
+                    engine = compute_tax(gross_annual=float(gross), **args)
+                    for field in ("net_annual", "net_ferie", "total_deductions"):
+                        self.assertAlmostEqual(
+                            schedule.value(field, float(gross)), engine[field], places=5,
+                            msg=f"{field} at {gross}",
+                        )
+
+    def test_breakpoints_include_bracket_thresholds(self):
+        schedule = get_schedule(23.39, 0.8, False, pension_pct=0.04, employer_pension_pct=0.08)
+        # income_after_am = gross × (1 + 1 % ferietillæg − 4 % pension) × (1 − AM)
+        per_gross = (1 + 0.01 - 0.04) * (1 - AM_RATE)
+        for threshold in (MELLEMSKAT_THRESHOLD, TOPSKAT_THRESHOLD, TOPTOPSKAT_THRESHOLD):
+            nearest = min(schedule.breakpoints, key=lambda g: abs(g - threshold / per_gross))
+            self.assertAlmostEqual(nearest, threshold / per_gross, places=3)
+
+    def test_schedule_is_cached_per_settings(self):
+        a = get_schedule(23.39, 0.8, True, pension_type="standard")
+        b = get_schedule(23.39, 0.8, True, pension_type="standard")
+        c = get_schedule(23.39, 0.8, True, pension_type="section53a")
+
+        self.assertIs(a, b)
+        self.assertIsNot(a, c)
+
+
+class InverseSolveTests(unittest.TestCase):
+    def test_solve_returns_gross_that_engine_maps_back_to_target(self):
+        args = dict(
+            kommune_pct=23.39,
+            kirke_pct=0.8,
+            is_church=True,
+            pension_pct=0.04,
+            employer_pension_pct=0.08,
+            atp_monthly=94.65,
+        )
+        schedule = get_schedule(**args)
+        for target_monthly in (5_000, 20_000, 45_000, 150_000):
+            gross = schedule.solve("net_annual", target_monthly * 12)
+            engine = compute_tax(gross_annual=gross, **args)
+            self.assertAlmostEqual(engine["net_monthly"], target_monthly, places=4)
+
+    def test_student_solve_returns_first_work_income_reaching_target(self):
+        schedule = get_student_schedule(25.0, 0.9, True, 7_426)
+        peak = max(schedule.values["net_annual"][:4])
+        work = schedule.solve("net_annual", peak - 1_000)
+        engine = compute_student_income(7_426, work, 0.0, 25.0, 0.9, True)
+
+        self.assertAlmostEqual(engine["net_annual"], peak - 1_000, places=4)
+        self.assertFalse(engine["over_fribeloeb"])
+
+    def test_solve_returns_none_below_reachable_range(self):
+        schedule = get_schedule(23.39, 0.8, True, atp_monthly=94.65)
+        self.assertIsNone(schedule.solve("net_annual", -1_000_000))
+
+
+if __name__ == "__main__":
+    unittest.main()